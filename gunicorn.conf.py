@@ -11,7 +11,7 @@ asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 bind = "0.0.0.0:8000"
 workers = multiprocessing.cpu_count() * 2 + 1
 workers = 1  # TODO Deni: remove for production
-worker_class = "uvicorn_worker.UvicornWorker"
+worker_class = "src.core.http.uvicorn_worker.AppUvicornWorker"
 accesslog = "-"
 errorlog = "-"
 loglevel = "info"
@@ -28,6 +28,6 @@ if __name__ == "__main__":
     options = {
         "bind": "0.0.0.0:8000",
         "workers": 3,  # multiprocessing.cpu_count() * 2 + 1,
-        "worker_class": "uvicorn_worker.UvicornWorker",
+        "worker_class": "src.core.http.uvicorn_worker.AppUvicornWorker",
     }
     StandaloneApplication(application=app, option=options).run()
@@ -29,6 +29,10 @@ from src.core.settings.setting import app_config
 async def lifespan(api: FastAPI) -> AsyncGenerator[None]:
     container = Container()
     await container.rmq_producer().initialize()
+    container.view_service().precompile()
+    container.ws_manager().start()
+    if container.app_config().ws_backplane_enabled:
+        await container.ws_backplane().start()
     AuthController(app=api, container=container)
     UserController(app=api, container=container)
     UserNotificationController(app=api, container=container)
@@ -44,10 +48,14 @@ async def lifespan(api: FastAPI) -> AsyncGenerator[None]:
     #         print(f"UNKNOWN  {'-':<10} {route.path}")
 
     yield
+    await container.ws_notification_service().close()
     await container.db_config().close()
     await container.rmq_producer().close()
     await container.rmq_consumer().close()
+    if container.app_config().ws_backplane_enabled:
+        await container.ws_backplane().stop()
     await container.ws_manager().close_all()
+    container.view_service().close()
     container.unwire()
 
 
@@ -11,6 +11,7 @@ from src.core.dto.dto import Message
 from src.core.exception.error_no import ErrorNo
 from src.core.exception.exceptions import UnauthorizedException
 from src.core.http.controller import BaseController
+from src.core.http.response.json_api_serializer import JsonApiBytesResponse
 from src.core.http.response.response import JsonApiResponse
 
 
@@ -18,26 +19,33 @@ class AuthController(BaseController):
     def __init__(self, app: FastAPI, container: Container) -> None:
         super().__init__(container=container)
         router = APIRouter(prefix="/auth", tags=["auth"])
-        router.add_api_route(path="/login", endpoint=self.login, methods=["POST"])
-        router.add_api_route(path="/signup", endpoint=self.signup, methods=["POST"])
-        router.add_api_route(path="/re-send-confirm-email", endpoint=self.re_send_confirm_email, methods=["POST"])
-        router.add_api_route(path="/confirm-email", endpoint=self.confirm_user, methods=["GET"])
-        router.add_api_route(path="/refresh", endpoint=self.refresh, methods=["POST"])
+        router.add_api_route(path="/login", endpoint=self.login, methods=["POST"], response_model=JsonApiResponse)
+        router.add_api_route(path="/signup", endpoint=self.signup, methods=["POST"], response_model=JsonApiResponse)
+        router.add_api_route(
+            path="/re-send-confirm-email",
+            endpoint=self.re_send_confirm_email,
+            methods=["POST"],
+            response_model=JsonApiResponse,
+        )
+        router.add_api_route(
+            path="/confirm-email", endpoint=self.confirm_user, methods=["GET"], response_model=JsonApiResponse
+        )
+        router.add_api_route(path="/refresh", endpoint=self.refresh, methods=["POST"], response_model=JsonApiResponse)
         app.include_router(router=router)
 
-    async def login(self, req: LoginRequest) -> JsonApiResponse:
+    async def login(self, req: LoginRequest) -> JsonApiBytesResponse:
         token = await self.container.auth_service().login(email=req.email, password=req.password)
 
         return await self.response(data=Bearer.from_token(token))
 
-    async def signup(self, req: SignupRequest) -> JsonApiResponse:
+    async def signup(self, req: SignupRequest) -> JsonApiBytesResponse:
         user = await self.container.auth_service().signup(
             first_name=req.first_name, second_name=req.second_name, email=req.email, password=req.password
         )
 
         return await self.response(data=user)
 
-    async def re_send_confirm_email(self, req: ReSendConfirmEmailRequest) -> JsonApiResponse:
+    async def re_send_confirm_email(self, req: ReSendConfirmEmailRequest) -> JsonApiBytesResponse:
         res = Message(message="Email successfully sent")
         user = await self.container.user_service().one(
             filters=[
@@ -49,12 +57,12 @@ class AuthController(BaseController):
 
         return await self.response(data=res)
 
-    async def confirm_user(self, req: ConfirmUserRequest = Depends()) -> JsonApiResponse:
+    async def confirm_user(self, req: ConfirmUserRequest = Depends()) -> JsonApiBytesResponse:
         await self.container.auth_service().confirm_user(jwt=req.token)
 
         return await self.response(data=Message(message="Email successfully confirmed"))
 
-    async def refresh(self, authorization: str = Header(None)) -> JsonApiResponse:
+    async def refresh(self, authorization: str = Header(None)) -> JsonApiBytesResponse:
         if authorization is None:
             raise UnauthorizedException(error_no=ErrorNo.AUTHORIZATION_REFRESH_TOKEN_EMPTY, message="Unauthorized!")
         try:
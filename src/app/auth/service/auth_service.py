@@ -2,6 +2,7 @@ from src.app.user.data.role import Role
 from src.app.user.data.user_status import UserStatus
 from src.app.user.model.user import User
 from src.app.user.service.user_service import UserService
+from src.core.db.asmysql import MyDatabaseConfig
 from src.core.db.repository import Filter, Oper
 from src.core.exception.error_no import ErrorNo
 from src.core.exception.exceptions import UnauthorizedException, UnprocessableEntityException
@@ -16,10 +17,12 @@ class AuthService:
         user_service: UserService,
         hash_service: HashService,
         app_email_service: AppMailService,
+        db_config: MyDatabaseConfig,
     ) -> None:
         self.user_service = user_service
         self.hash_service = hash_service
         self.app_email_service = app_email_service
+        self.db_config = db_config
 
     async def login(self, email: str, password: str) -> TokenBearer:
         user = await self.user_service.one(
@@ -64,8 +67,10 @@ class AuthService:
             status=UserStatus.PENDING,
             roles=[Role.USER],
         )
-        user = await self.user_service.create(data=user)
-        await self.send_confirm_email(user)
+        # the confirm email goes to the outbox in the same transaction, so it is sent only for committed users
+        async with self.db_config.transaction():
+            user = await self.user_service.create(data=user)
+            await self.send_confirm_email(user)
         return user
 
     async def send_confirm_email(self, user: User) -> None:
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class OutboxStatus(int, Enum):
+    NEW = 1
+    PUBLISHED = 2
+    FAILED = 3
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, BigInteger, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from src.app.outbox.data.outbox_status import OutboxStatus
+from src.core.db.decorator.int_enum import IntEnum
+from src.core.db.entity import Entity
+
+
+class Outbox(Entity):
+    __tablename__ = "outbox"
+    __table_args__ = (Index("ix_outbox_status_id", "status", "id"),)
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+    )
+    exchange: Mapped[str] = mapped_column(String(255), nullable=False)
+    routing_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    headers: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    status: Mapped[OutboxStatus] = mapped_column(IntEnum(OutboxStatus), nullable=False, default=OutboxStatus.NEW)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
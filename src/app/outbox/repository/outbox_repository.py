@@ -0,0 +1,49 @@
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import select
+
+from src.app.outbox.data.outbox_status import OutboxStatus
+from src.app.outbox.model.outbox import Outbox
+from src.core.db.asmysql import MyDatabaseConfig
+from src.core.db.repository import BaseRepository, Filter, Oper
+
+
+class OutboxRepository(BaseRepository[Outbox]):
+    def __init__(self, db_config: MyDatabaseConfig):
+        super().__init__(db_config, Outbox, "id")
+
+    async def claim_pending(self, limit: int) -> Sequence[Outbox]:
+        # rows stay locked until the surrounding transaction ends, concurrent relays skip them
+        query = (
+            select(Outbox)
+            .where(Outbox.status == OutboxStatus.NEW)
+            .order_by(Outbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.get_session() as session:
+            result = await session.execute(query)
+            return list(result.scalars().all())
+
+    async def mark_published(self, ids: list[int], published_at: datetime) -> int:
+        if not ids:
+            return 0
+        return await self.update_many(
+            filters=[Filter("id", Oper.IN, ids)],
+            update_data={"status": OutboxStatus.PUBLISHED, "published_at": published_at},
+        )
+
+    async def mark_failed(self, ids: list[int], max_attempts: int) -> int:
+        if not ids:
+            return 0
+        await self.update_many(filters=[Filter("id", Oper.IN, ids)], update_data={"attempts": Outbox.attempts + 1})
+        return await self.update_many(
+            filters=[Filter("id", Oper.IN, ids), Filter("attempts", Oper.GTE, max_attempts)],
+            update_data={"status": OutboxStatus.FAILED},
+        )
+
+    async def purge_published(self, before: datetime) -> int:
+        return await self.delete_many(
+            filters=[Filter("status", Oper.EQ, OutboxStatus.PUBLISHED), Filter("published_at", Oper.LT, before)]
+        )
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from src.app.outbox.repository.outbox_repository import OutboxRepository
+from src.core.db.asmysql import MyDatabaseConfig
+from src.core.log.log import Log
+from src.core.rabbit_mq.config import ExchangeConfig, QueueConfig
+from src.core.rabbit_mq.producer import AsyncRabbitMQProducer
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        db_config: MyDatabaseConfig,
+        outbox_repository: OutboxRepository,
+        producer: AsyncRabbitMQProducer,
+        topologies: list[tuple[QueueConfig, ExchangeConfig]],
+        log: Log,
+        batch_size: int = 100,
+        poll_interval: float = 0.5,
+        max_attempts: int = 10,
+        retention: timedelta = timedelta(days=1),
+    ) -> None:
+        self.db_config = db_config
+        self.outbox_repository = outbox_repository
+        self.producer = producer
+        self.topologies = topologies
+        self.log = log
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retention = retention
+        self._last_purge = 0.0
+        self._stop_event = asyncio.Event()
+
+    async def initialize(self) -> None:
+        await self.producer.initialize()
+        # the relay publishes by exchange name, so the queues must exist before the first batch
+        for queue, exchange in self.topologies:
+            await self.producer.declare(queue=queue, exchange=exchange)
+        self.log.info("🚀 Outbox relay initialized successfully")
+
+    async def run(self) -> None:
+        self._stop_event.clear()
+        while not self._stop_event.is_set():
+            try:
+                published = await self.relay_batch()
+                await self._purge()
+            except Exception as e:
+                self.log.error(f"🛑 Outbox relay batch failed: {e}")
+                published = 0
+            if published < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=self.poll_interval)
+                except TimeoutError:
+                    pass
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    async def relay_batch(self) -> int:
+        async with self.db_config.transaction():
+            messages = await self.outbox_repository.claim_pending(limit=self.batch_size)
+            if not messages:
+                return 0
+
+            results = await self.producer.publish_batch(
+                [
+                    (
+                        message.exchange,
+                        message.routing_key,
+                        self.producer.build_message(dict(message.payload), headers=message.headers),
+                    )
+                    for message in messages
+                ]
+            )
+            published = [message.id for message, ok in zip(messages, results, strict=True) if ok]
+            failed = [message.id for message, ok in zip(messages, results, strict=True) if not ok]
+            await self.outbox_repository.mark_published(ids=published, published_at=datetime.now())
+            dead = await self.outbox_repository.mark_failed(ids=failed, max_attempts=self.max_attempts)
+
+        if failed:
+            self.log.warning(f"🌶️ Outbox relay failed to publish {len(failed)} messages, {dead} gave up")
+        self.log.info(f"📤 Outbox relay published {len(published)}/{len(messages)} messages")
+        return len(published)
+
+    async def _purge(self) -> None:
+        if time.monotonic() - self._last_purge < 3600:
+            return
+        self._last_purge = time.monotonic()
+        purged = await self.outbox_repository.purge_published(before=datetime.now() - self.retention)
+        if purged:
+            self.log.info(f"🧹 Outbox relay purged {purged} published messages")
@@ -0,0 +1,32 @@
+from typing import Any
+
+from src.app.outbox.data.outbox_status import OutboxStatus
+from src.app.outbox.model.outbox import Outbox
+from src.app.outbox.repository.outbox_repository import OutboxRepository
+from src.core.rabbit_mq.config import ExchangeConfig, QueueConfig
+
+
+class OutboxService:
+    def __init__(self, outbox_repository: OutboxRepository) -> None:
+        self.outbox_repository = outbox_repository
+
+    async def add(
+        self,
+        queue: QueueConfig,
+        exchange: ExchangeConfig,
+        message: dict[str, Any],
+        action: str | None = None,
+        headers: dict[str, Any] | None = None,
+    ) -> Outbox:
+        # joins the caller's db_config.transaction(), so the message commits or rolls back with the entity
+        payload = {**message, "action": action} if action is not None else message
+        return await self.outbox_repository.create(
+            data=Outbox(
+                exchange=exchange.name,
+                routing_key=queue.binding_key,
+                payload=payload,
+                headers=headers,
+                status=OutboxStatus.NEW,
+                attempts=0,
+            )
+        )
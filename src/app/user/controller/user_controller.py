@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, FastAPI, Request
 
 from src.app.user.dto.user import UserCreateRequest, UserListRequest
+from src.app.user.model.user import User
 from src.core.db.repository import Filter, Oper, Pagination
 from src.core.di.container import Container
+from src.core.dto.dto import SparseFields, get_sparse_fields
 from src.core.exception.error_no import ErrorNo
 from src.core.exception.exceptions import UnprocessableEntityException
 from src.core.http.controller import BaseController
+from src.core.http.response.json_api_serializer import JsonApiBytesResponse
 from src.core.http.response.response import JsonApiResponse
 
 
@@ -13,12 +16,16 @@ class UserController(BaseController):
     def __init__(self, app: FastAPI, container: Container) -> None:
         super().__init__(container=container)
         router = APIRouter(prefix="/users", tags=["users"])
-        router.add_api_route(path="", endpoint=self.list, methods=["GET"])
-        router.add_api_route(path="", endpoint=self.create, methods=["POST"])
-        router.add_api_route(path="/{user_id}", endpoint=self.view, methods=["GET"])
+        router.add_api_route(path="", endpoint=self.list, methods=["GET"], response_model=JsonApiResponse)
+        router.add_api_route(path="", endpoint=self.create, methods=["POST"], response_model=JsonApiResponse)
+        router.add_api_route(path="/{user_id}", endpoint=self.view, methods=["GET"], response_model=JsonApiResponse)
         app.include_router(router=router)
 
-    async def list(self, req: UserListRequest = Depends()) -> JsonApiResponse:
+    async def list(
+        self,
+        req: UserListRequest = Depends(),
+        fields: SparseFields | None = Depends(get_sparse_fields),
+    ) -> JsonApiBytesResponse:
         users = await self.container.user_service().all(
             filters=[
                 Filter("email", Oper.EQ, req.email),
@@ -27,18 +34,24 @@ class UserController(BaseController):
                 per_page=req.per_page or 10,
                 page=req.page or 1,
             ),
+            fields=self.select_fields(User.__name__, fields),
         )
 
-        return await self.response(data=users, include=req.include)
+        return await self.response(data=users, include=req.include, fields=fields)
 
-    async def view(self, user_id: int, req: Request) -> JsonApiResponse:
-        user = await self.container.user_service().get_by_id(user_id)
-        return await self.response(data=user, include=req.query_params.get("include", None))
+    async def view(
+        self,
+        user_id: int,
+        req: Request,
+        fields: SparseFields | None = Depends(get_sparse_fields),
+    ) -> JsonApiBytesResponse:
+        user = await self.container.user_service().get_by_id(user_id, fields=self.select_fields(User.__name__, fields))
+        return await self.response(data=user, include=req.query_params.get("include", None), fields=fields)
 
     async def create(
         self,
         req: UserCreateRequest,
-    ) -> JsonApiResponse:
+    ) -> JsonApiBytesResponse:
         user = await self.container.user_service().one(
             filters=[
                 Filter("email", Oper.EQ, req.email),
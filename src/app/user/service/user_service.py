@@ -1,4 +1,4 @@
-from collections.abc import Sequence
+from collections.abc import Collection, Sequence
 from typing import Any
 
 from src.app.user.model.user import User
@@ -10,8 +10,8 @@ class UserService:
     def __init__(self, user_repository: UserRepository) -> None:
         self.user_repository = user_repository
 
-    async def get_by_id(self, uid: int) -> User:
-        return await self.user_repository.get_by_id(uid=uid)
+    async def get_by_id(self, uid: int, fields: Collection[str] | None = None) -> User:
+        return await self.user_repository.get_by_id(uid=uid, fields=fields)
 
     async def find_by_id(self, uid: int) -> User | None:
         return await self.user_repository.find_by_id(uid=uid)
@@ -35,7 +35,8 @@ class UserService:
         order_by: list[OrderBy] | None = None,
         pagination: Pagination | None = None,
         pager: Pager | None = None,
+        fields: Collection[str] | None = None,
     ) -> Sequence[User] | Paginator[User]:
         return await self.user_repository.find_all(
-            filters=filters, order_by=order_by, pagination=pagination, pager=pager
+            filters=filters, order_by=order_by, pagination=pagination, pager=pager, fields=fields
         )
@@ -2,10 +2,13 @@ from fastapi import APIRouter, Depends, FastAPI
 
 from src.app.user_notification.data.user_notification_status import UserNotificationStatus
 from src.app.user_notification.dto.user_notification import UserNotificationCreateRequest, UserNotificationListRequest
+from src.app.user_notification.model.user_notification import UserNotification
 from src.core.db.repository import Filter, Oper, Pagination
 from src.core.di.container import Container
+from src.core.dto.dto import SparseFields, get_sparse_fields
 from src.core.http.controller import BaseController
 from src.core.http.request.state import AuthState, get_auth_state
+from src.core.http.response.json_api_serializer import JsonApiBytesResponse
 from src.core.http.response.response import JsonApiResponse
 
 
@@ -13,15 +16,16 @@ class UserNotificationController(BaseController):
     def __init__(self, app: FastAPI, container: Container) -> None:
         super().__init__(container=container)
         router = APIRouter(prefix="/user-notifications", tags=["user-notifications"])
-        router.add_api_route(path="", endpoint=self.user_list, methods=["GET"])
-        router.add_api_route(path="", endpoint=self.create, methods=["POST"])
+        router.add_api_route(path="", endpoint=self.user_list, methods=["GET"], response_model=JsonApiResponse)
+        router.add_api_route(path="", endpoint=self.create, methods=["POST"], response_model=JsonApiResponse)
         app.include_router(router=router)
 
     async def user_list(
         self,
         state: AuthState = Depends(get_auth_state),
         req: UserNotificationListRequest = Depends(),
-    ) -> JsonApiResponse:
+        fields: SparseFields | None = Depends(get_sparse_fields),
+    ) -> JsonApiBytesResponse:
         notifications = await self.container.user_notification_service().all(
             filters=[
                 Filter("user_id", Oper.EQ, state.user.id),
@@ -31,14 +35,15 @@ class UserNotificationController(BaseController):
                 per_page=req.per_page or 10,
                 page=req.page or 1,
             ),
+            fields=self.select_fields(UserNotification.__name__, fields),
         )
 
-        return await self.response(data=notifications, include=req.include)
+        return await self.response(data=notifications, include=req.include, fields=fields)
 
     async def create(
         self,
         req: UserNotificationCreateRequest,
-    ) -> JsonApiResponse:
+    ) -> JsonApiBytesResponse:
         notification = req.to_model()
         notification.user_id = 1
         notification.status = UserNotificationStatus.NEW
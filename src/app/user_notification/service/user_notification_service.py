@@ -1,4 +1,5 @@
-from collections.abc import Sequence
+from collections.abc import Collection, Sequence
+from datetime import datetime
 from typing import Any
 
 from src.app.user_notification.data.user_notification_status import UserNotificationStatus
@@ -11,8 +12,8 @@ class UserNotificationService:
     def __init__(self, user_notification_repository: UserNotificationRepository) -> None:
         self.user_notification_repository = user_notification_repository
 
-    async def get_by_id(self, uid: int) -> UserNotification:
-        return await self.user_notification_repository.get_by_id(uid=uid)
+    async def get_by_id(self, uid: int, fields: Collection[str] | None = None) -> UserNotification:
+        return await self.user_notification_repository.get_by_id(uid=uid, fields=fields)
 
     async def find_by_id(self, uid: int) -> UserNotification | None:
         return await self.user_notification_repository.find_by_id(uid=uid)
@@ -36,9 +37,10 @@ class UserNotificationService:
         order_by: list[OrderBy] | None = None,
         pagination: Pagination | None = None,
         pager: Pager | None = None,
+        fields: Collection[str] | None = None,
     ) -> Sequence[UserNotification] | Paginator[UserNotification]:
         return await self.user_notification_repository.find_all(
-            filters=filters, order_by=order_by, pagination=pagination, pager=pager
+            filters=filters, order_by=order_by, pagination=pagination, pager=pager, fields=fields
         )
 
     async def new_by_user_id(self, uid: int | list[int]) -> Sequence[UserNotification]:
@@ -48,3 +50,40 @@ class UserNotificationService:
                 Filter("status", Oper.EQ, UserNotificationStatus.NEW),
             ],
         )
+
+    async def new_by_user_id_after(self, uid: int, after_id: int, limit: int) -> Sequence[UserNotification]:
+        return await self.all(  # type: ignore
+            filters=[
+                Filter("user_id", Oper.EQ, uid),
+                Filter("status", Oper.EQ, UserNotificationStatus.NEW),
+                Filter("id", Oper.GT, after_id),
+            ],
+            order_by=[OrderBy("id")],
+            pager=Pager(limit=limit),
+        )
+
+    async def mark_read(self, uid: int, ids: list[int]) -> int:
+        if not ids:
+            return 0
+        return await self.user_notification_repository.update_many(
+            filters=[
+                Filter("user_id", Oper.EQ, uid),
+                Filter("id", Oper.IN, ids),
+                Filter("status", Oper.EQ, UserNotificationStatus.NEW),
+            ],
+            update_data={"status": UserNotificationStatus.READ},
+        )
+
+    async def mark_read_up_to(self, uid: int, up_to_id: int | None = None, before: datetime | None = None) -> int:
+        filters = [
+            Filter("user_id", Oper.EQ, uid),
+            Filter("status", Oper.EQ, UserNotificationStatus.NEW),
+        ]
+        if up_to_id is not None:
+            filters.append(Filter("id", Oper.LTE, up_to_id))
+        if before is not None:
+            filters.append(Filter("created_at", Oper.LTE, before))
+        return await self.user_notification_repository.update_many(
+            filters=filters,
+            update_data={"status": UserNotificationStatus.READ},
+        )
@@ -1,9 +1,11 @@
+import asyncio
 from datetime import datetime
 from typing import Any
 
 from fastapi import WebSocket
 
 from src.app.user_notification.data.user_notification_status import UserNotificationStatus
+from src.app.user_notification.model.user_notification import UserNotification
 from src.app.user_notification.service.user_notification_service import UserNotificationService
 from src.app.ws.service.ws_handler import WSHandler
 from src.core.log.log import Log
@@ -17,32 +19,66 @@ class WSNotificationService(WSHandler):
         user_notification_service: UserNotificationService,
         ws_manager: WSManager,
         log: Log,
+        sync_batch_size: int = 50,
+        read_window: float = 0.25,
+        read_batch_size: int = 500,
     ) -> None:
         self.user_notification_service = user_notification_service
         self.ws_manager = ws_manager
         self.log = log
+        self.sync_batch_size = sync_batch_size
+        self.read_window = read_window
+        self.read_batch_size = read_batch_size
+        # read acks waiting for the per-user flush
+        self._reads: dict[str, set[int]] = {}
+        self._flushes: dict[str, asyncio.Task[None]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
 
     async def add_connection(self, user_id: str, websocket: WebSocket) -> None:
-        notifications = await self.user_notification_service.new_by_user_id(uid=int(user_id))
-        for notification in notifications:
-            await self.ws_manager.send_to_user(
-                user_id=user_id,
-                data={
-                    "type": WSType.USER_NOTIFICATION.value,
-                    "data": {
-                        "message": notification.data.get("message"),
-                        "status": notification.status.value,
-                        "createdAt": notification.created_at.isoformat()
-                        if isinstance(notification.created_at, datetime)
-                        else str(notification.created_at),
-                    },
+        sent = await self._sync(user_id=user_id, websocket=websocket, cursor=0)
+        self.log.info(f"WS connect: user {user_id}, {sent} notifications sent")
+
+    async def _sync(self, user_id: str, websocket: WebSocket, cursor: int) -> int:
+        # one frame per page, the client asks for the next page with the returned cursor
+        notifications = await self.user_notification_service.new_by_user_id_after(
+            uid=int(user_id), after_id=cursor, limit=self.sync_batch_size + 1
+        )
+        page = notifications[: self.sync_batch_size]
+        has_more = len(notifications) > self.sync_batch_size
+        await self.ws_manager.send_to_user(
+            user_id=user_id,
+            data={
+                "type": WSType.USER_NOTIFICATION_SYNC.value,
+                "data": {
+                    "items": [self._notification_data(notification) for notification in page],
+                    "cursor": page[-1].id if has_more else None,
+                    "hasMore": has_more,
                 },
-                websocket=websocket,
-            )
-        self.log.info(f"WS connect: user {user_id}, {len(notifications)} notifications sent")
+            },
+            websocket=websocket,
+        )
+        return len(page)
+
+    @staticmethod
+    def _notification_data(notification: UserNotification) -> dict[str, Any]:
+        return {
+            "id": notification.id,
+            "message": notification.data.get("message"),
+            "status": notification.status.value,
+            "createdAt": notification.created_at.isoformat()
+            if isinstance(notification.created_at, datetime)
+            else str(notification.created_at),
+        }
 
     async def process_message(self, user_id: str, message: dict[str, Any], websocket: WebSocket) -> None:
         message_type = WSType(message.get("type", WSType.UNKNOWN.value))
+        if message_type == WSType.USER_NOTIFICATION_SYNC:
+            cursor = message.get("cursor")
+            if not isinstance(cursor, int):
+                self.log.warning(f"WS message: user {user_id}, sync message without cursor: {message}")
+                return
+            await self._sync(user_id=user_id, websocket=websocket, cursor=cursor)
+            return
         if message_type == WSType.USER_NOTIFICATION:
             await self.user_notification_service.create(
                 data={
@@ -53,34 +89,86 @@ class WSNotificationService(WSHandler):
             )
             return
         if message_type == WSType.MESSAGE_READ:
-            uid = message.get("id")
-            if uid is None:
+            ids = message.get("ids", [message.get("id")])
+            if not isinstance(ids, list) or not ids or not all(isinstance(uid, int) for uid in ids):
                 self.log.warning(f"WS message: user {user_id}, message_read message without id: {message}")
                 return
-            notification = await self.user_notification_service.update(
-                uid=int(uid),
-                data={
-                    "status": UserNotificationStatus.READ,
-                },
-            )
-            await self.ws_manager.send_to_user(
-                user_id=user_id,
-                data={
-                    "type": WSType.USER_NOTIFICATION.value,
-                    "data": {
-                        "message": notification.data.get("message"),
-                        "status": notification.status.value,
-                        "createdAt": notification.created_at.isoformat()
-                        if isinstance(notification.created_at, datetime)
-                        else str(notification.created_at),
-                    },
-                },
-            )
+            self._queue_reads(user_id, ids)
+            return
+        if message_type == WSType.MESSAGE_READ_UP_TO:
+            await self._read_up_to(user_id, message)
             return
 
     async def remove_connection(self, user_id: str, websocket: WebSocket) -> None:
         pass
 
+    async def close(self) -> None:
+        # the acks still inside their window are written at most read_window later
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _queue_reads(self, user_id: str, ids: list[int]) -> None:
+        pending = self._reads.setdefault(user_id, set())
+        pending.update(ids)
+        if len(pending) >= self.read_batch_size:
+            # the scheduled flush finds nothing left and returns
+            self._spawn_flush(user_id, delay=0)
+        elif user_id not in self._flushes:
+            self._spawn_flush(user_id, delay=self.read_window)
+
+    def _spawn_flush(self, user_id: str, delay: float) -> None:
+        async def flush() -> None:
+            if delay:
+                await asyncio.sleep(delay)
+            if self._flushes.get(user_id) is asyncio.current_task():
+                del self._flushes[user_id]
+            await self._flush_reads(user_id)
+
+        task = self._flushes[user_id] = asyncio.create_task(flush(), name=f"ws-read-flush-{user_id}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_reads(self, user_id: str) -> None:
+        ids = sorted(self._reads.pop(user_id, ()))
+        if not ids:
+            return
+        try:
+            updated = await self.user_notification_service.mark_read(uid=int(user_id), ids=ids)
+        except Exception as e:
+            self.log.error(f"WS message: user {user_id}, failed to mark {len(ids)} notifications read: {e}")
+            return
+        self.log.debug(f"WS message: user {user_id}, {updated}/{len(ids)} notifications marked read")
+        # one frame for the whole batch, so the other tabs of the user update too
+        await self.ws_manager.send_to_user(
+            user_id=user_id,
+            data={"type": WSType.MESSAGE_READ.value, "data": {"ids": ids}},
+        )
+
+    async def _read_up_to(self, user_id: str, message: dict[str, Any]) -> None:
+        up_to_id = message.get("id")
+        before = message.get("before")
+        try:
+            if up_to_id is not None and not isinstance(up_to_id, int):
+                raise ValueError("id must be an integer")
+            created_before = datetime.fromisoformat(before) if isinstance(before, str) else None
+        except ValueError as e:
+            self.log.warning(f"WS message: user {user_id}, invalid message_read_up_to message: {message}: {e}")
+            return
+        if up_to_id is None and created_before is None:
+            self.log.warning(f"WS message: user {user_id}, message_read_up_to message without id or before: {message}")
+            return
+        updated = await self.user_notification_service.mark_read_up_to(
+            uid=int(user_id), up_to_id=up_to_id, before=created_before
+        )
+        self.log.debug(f"WS message: user {user_id}, {updated} notifications marked read")
+        await self.ws_manager.send_to_user(
+            user_id=user_id,
+            data={
+                "type": WSType.MESSAGE_READ_UP_TO.value,
+                "data": {"id": up_to_id, "before": before, "updated": updated},
+            },
+        )
+
     @staticmethod
     def can(ws_type: WSType) -> bool:
-        return ws_type == WSType.USER_NOTIFICATION
+        return ws_type in (WSType.USER_NOTIFICATION, WSType.USER_NOTIFICATION_SYNC)
@@ -1,10 +1,9 @@
-import json
-
 from fastapi import FastAPI
-from starlette.websockets import WebSocket, WebSocketDisconnect
+from starlette.websockets import WebSocket, WebSocketDisconnect, WebSocketState
 
 from src.core.di.container import Container
 from src.core.http.controller import BaseController
+from src.core.web_socket.ws_frame import decode_frame
 
 
 class WSController(BaseController):
@@ -20,16 +19,27 @@ class WSController(BaseController):
         ws_service = self.container.ws_service()
         try:
             await ws_service.add_connection(user_id, websocket)
-            async for data in websocket.iter_text():
+            if websocket.application_state == WebSocketState.DISCONNECTED:
+                # rejected by add_connection
+                return
+            while True:
+                event = await websocket.receive()
+                if event["type"] == "websocket.disconnect":
+                    break
+                try:
+                    # clients connected with ?encoding=msgpack may send binary frames
+                    data = event.get("bytes")
+                    message = decode_frame(data if data is not None else event.get("text") or "")
+                except ValueError:
+                    message = None
+                if not isinstance(message, dict):
+                    self.logger.warning(f"Invalid message received from user {user_id}")
+                    continue
                 try:
-                    message = json.loads(data)
-
                     await ws_service.process_message(user_id=user_id, message=message, websocket=websocket)
 
                 except WebSocketDisconnect:
                     break
-                except json.JSONDecodeError:
-                    self.logger.warning(f"Invalid JSON received from user {user_id}")
                 except Exception as e:
                     self.logger.error(f"Error handling WebSocket message from user {user_id}: {e}")
                     break
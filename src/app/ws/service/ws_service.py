@@ -1,4 +1,3 @@
-import json
 from typing import Any
 
 from fastapi import WebSocket, status
@@ -25,6 +24,10 @@ class WSService(WSHandler):
         self.services = services
 
     async def add_connection(self, user_id: str, websocket: WebSocket) -> None:
+        rejection = self.ws_manager.admission.check_ip(websocket.client.host if websocket.client else None)
+        if rejection is not None:
+            await self.ws_manager.reject(user_id, websocket, rejection)
+            return
         token = websocket.query_params.get("token")
         if token is None:
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
@@ -41,21 +44,32 @@ class WSService(WSHandler):
             self.log.error(f"WS connect: user {user_id}, invalid token: {e}")
             return
 
-        await self.ws_manager.connect(user_id, websocket)
+        rejection = await self.ws_manager.connect(user_id, websocket, encoding=websocket.query_params.get("encoding"))
+        if rejection is not None:
+            # rejected before the notification sync, so a reconnect storm does not reach the database
+            return
         for service in self.services:
             await service.add_connection(user_id, websocket)
 
     async def process_message(self, user_id: str, message: dict[str, Any], websocket: WebSocket) -> None:
+        # any frame from the client proves the connection is alive
+        self.ws_manager.touch(user_id, websocket)
         tp = message.get("type", WSType.UNKNOWN.value)
         if not is_enum_value(enum_class=WSType, value=tp):
             self.log.warning(f"WS message: user {user_id}, unknown message type: {message}")
             return
         message_type = WSType(tp)
         if message_type == WSType.PING:
-            await websocket.send_text(json.dumps({"type": "pong"}))
+            await self.ws_manager.send_to_user(user_id=user_id, data={"type": WSType.PONG.value}, websocket=websocket)
+            return
+        if message_type == WSType.PONG:
             return
 
-        if message_type == WSType.MESSAGE_READ:
+        if message_type in (WSType.SUBSCRIBE, WSType.UNSUBSCRIBE):
+            await self._subscribe(user_id=user_id, message=message, websocket=websocket, ws_type=message_type)
+            return
+
+        if message_type in (WSType.MESSAGE_READ, WSType.MESSAGE_READ_UP_TO):
             message_type = WSType(message.get("type_read", WSType.UNKNOWN.value))
 
         if message_type == WSType.UNKNOWN:
@@ -68,6 +82,19 @@ class WSService(WSHandler):
                 return
         self.log.error(f"WS message: user {user_id}, {message_type} message type without handler: {message}")
 
+    async def _subscribe(self, user_id: str, message: dict[str, Any], websocket: WebSocket, ws_type: WSType) -> None:
+        topics = message.get("topics", [message.get("topic")])
+        if not isinstance(topics, list) or not all(isinstance(topic, str) for topic in topics):
+            self.log.warning(f"WS message: user {user_id}, invalid topics: {message}")
+            return
+        action = self.ws_manager.subscribe if ws_type == WSType.SUBSCRIBE else self.ws_manager.unsubscribe
+        done = [topic for topic in topics if await action(user_id, websocket, topic)]
+        await self.ws_manager.send_to_user(
+            user_id=user_id,
+            data={"type": ws_type.value, "data": {"topics": done}},
+            websocket=websocket,
+        )
+
     async def remove_connection(self, user_id: str, websocket: WebSocket) -> None:
         for service in self.services:
             await service.remove_connection(user_id=user_id, websocket=websocket)
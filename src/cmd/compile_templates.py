@@ -0,0 +1,26 @@
+import asyncio
+import sys
+from pathlib import Path
+
+
+def setup_path() -> None:
+    script_dir = Path(__file__).parent.absolute()
+    project_root = script_dir.parent.parent
+    sys.path.insert(0, str(project_root))
+
+
+setup_path()
+
+from src.cmd.cli_command_base import AsyncCLICommandBase  # noqa: E402
+
+
+# run once per deploy, before the API and email workers start, they only load TEMPLATE_COMPILED_DIR
+class CompileTemplates(AsyncCLICommandBase):
+    async def execute(self, loop: asyncio.AbstractEventLoop) -> int:
+        target = self.container.view_service().compile()
+        self.log.info(f"🧱 Templates compiled to {target}")
+        return 0
+
+
+if __name__ == "__main__":
+    CompileTemplates.start()
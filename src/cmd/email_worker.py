@@ -17,14 +17,23 @@ from src.cmd.cli_command_base import AsyncCLICommandBase  # noqa: E402
 class EmailWorker(AsyncCLICommandBase):
     async def execute(self, loop: asyncio.AbstractEventLoop) -> int:
         try:
+            from src.cmd.worker.email.email_queue import EMAIL_EXCHANGE, EMAIL_QUEUE
+            from src.cmd.worker.email.send_batch_email import SendBatchEmailHandler
             from src.cmd.worker.email.send_email import SendEmailHandler
             from src.core.rabbit_mq.worker import RMWorker
 
             worker = RMWorker(
-                consumer=self.container.rmq_consumer(), queue="p_email", exchange="p_email_exchange", log=self.log
+                consumer=self.container.rmq_consumer(), queue=EMAIL_QUEUE, exchange=EMAIL_EXCHANGE, log=self.log
             )
 
-            await worker.initialize(loop=loop, handlers=[SendEmailHandler(container=self.container)])
+            self.container.view_service().precompile()
+            await worker.initialize(
+                loop=loop,
+                handlers=[
+                    SendEmailHandler(container=self.container),
+                    SendBatchEmailHandler(container=self.container),
+                ],
+            )
 
             try:
                 self.log.info("🚀 Starting email worker...")
@@ -37,6 +46,10 @@ class EmailWorker(AsyncCLICommandBase):
                 return 1
             finally:
                 await worker.stop()
+                self.log.info("📊 Email send throttling", metrics=self.container.email_service().scheduler.metrics())
+                await self.container.email_service().close()
+                self.container.view_service().close()
+                await self.container.rmq_producer().close()
                 self.log.info("🛑 Email worker stopped")
 
             return 0
@@ -0,0 +1,39 @@
+import asyncio
+import sys
+from pathlib import Path
+
+
+def setup_path() -> None:
+    script_dir = Path(__file__).parent.absolute()
+    project_root = script_dir.parent.parent
+    sys.path.insert(0, str(project_root))
+
+
+setup_path()
+
+from src.cmd.cli_command_base import AsyncCLICommandBase  # noqa: E402
+
+
+class OutboxRelayWorker(AsyncCLICommandBase):
+    async def execute(self, loop: asyncio.AbstractEventLoop) -> int:
+        relay = self.container.outbox_relay()
+        try:
+            await relay.initialize()
+            self.log.info("🚀 Starting outbox relay...")
+            await relay.run()
+            return 0
+        except asyncio.CancelledError:
+            self.log.info("🚦 Outbox relay cancelled, shutting down gracefully...")
+            return 0
+        except Exception as e:
+            self.log.error(f"Outbox relay execution failed: {e}")
+            return 1
+        finally:
+            relay.stop()
+            await self.container.rmq_producer().close()
+            await self.container.db_config().close()
+            self.log.info("🛑 Outbox relay stopped")
+
+
+if __name__ == "__main__":
+    OutboxRelayWorker.start()
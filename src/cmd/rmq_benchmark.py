@@ -0,0 +1,73 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+
+def setup_path() -> None:
+    script_dir = Path(__file__).parent.absolute()
+    project_root = script_dir.parent.parent
+    sys.path.insert(0, str(project_root))
+
+
+setup_path()
+
+from src.cmd.cli_command_base import AsyncCLICommandBase  # noqa: E402
+from src.core.rabbit_mq.config import ExchangeConfig, QueueConfig  # noqa: E402
+from src.core.rabbit_mq.data import MessageContext, ProcessingResult  # noqa: E402
+from src.core.rabbit_mq.message_handler import MessageHandler  # noqa: E402
+
+BENCHMARK_EXCHANGE = ExchangeConfig(name="p_benchmark_exchange", durable=False, auto_delete=True)
+BENCHMARK_QUEUE = QueueConfig(name="p_benchmark", durable=False, auto_delete=True)
+
+
+class BenchmarkHandler(MessageHandler):
+    actions = ("benchmark",)
+    expected = 0
+    received = 0
+    done: asyncio.Event
+
+    async def handle(self, context: MessageContext) -> ProcessingResult:
+        self.received += 1
+        if self.received >= self.expected:
+            self.done.set()
+        return ProcessingResult.SUCCESS
+
+
+class RMQBenchmark(AsyncCLICommandBase):
+    async def execute(self, loop: asyncio.AbstractEventLoop) -> int:
+        messages = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+        producer = self.container.rmq_producer()
+        consumer = self.container.rmq_consumer()
+        handler = BenchmarkHandler(container=self.container)
+        handler.expected = messages
+        handler.done = asyncio.Event()
+
+        await producer.initialize()
+        await consumer.initialize(loop=loop)
+        consumer.register_handler(handler)
+        consume_task = loop.create_task(consumer.consume(queue=BENCHMARK_QUEUE, exchange=BENCHMARK_EXCHANGE))
+        try:
+            start = time.perf_counter()
+            for i in range(messages):
+                await producer.send_message(
+                    queue=BENCHMARK_QUEUE, exchange=BENCHMARK_EXCHANGE, action="benchmark", message={"n": i}
+                )
+            published = time.perf_counter() - start
+            await handler.done.wait()
+            consumed = time.perf_counter() - start
+
+            self.log.info(
+                f"🏁 RabbitMQ benchmark: {messages} messages, "
+                f"publish {messages / published:.0f} msg/s, end-to-end {messages / consumed:.0f} msg/s",
+                metrics=consumer.metrics(),
+            )
+            return 0
+        finally:
+            await consumer.close()
+            await producer.close()
+            consume_task.cancel()
+
+
+if __name__ == "__main__":
+    RMQBenchmark.start()
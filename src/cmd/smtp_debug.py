@@ -0,0 +1,48 @@
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any
+
+
+def setup_path() -> None:
+    script_dir = Path(__file__).parent.absolute()
+    project_root = script_dir.parent.parent
+    sys.path.insert(0, str(project_root))
+
+
+setup_path()
+
+from src.cmd.cli_command_base import AsyncCLICommandBase  # noqa: E402
+
+
+# local SMTP stand-in that accepts and logs every message, for running the email worker without a relay
+class SMTPDebugServer(AsyncCLICommandBase):
+    async def execute(self, loop: asyncio.AbstractEventLoop) -> int:
+        from aiosmtpd.smtp import SMTP
+
+        host = sys.argv[1] if len(sys.argv) > 1 else "localhost"
+        port = int(sys.argv[2]) if len(sys.argv) > 2 else 8025
+        log = self.log
+
+        class LogHandler:
+            async def handle_DATA(self, server: Any, session: Any, envelope: Any) -> str:
+                log.info(
+                    f"📨 Received email from {envelope.mail_from} to {', '.join(envelope.rcpt_tos)}"
+                    f" ({len(envelope.content)} bytes)"
+                )
+                return "250 Message accepted for delivery"
+
+        server = await loop.create_server(lambda: SMTP(LogHandler()), host=host, port=port)
+        self.log.info(f"🚀 SMTP debug server listening on {host}:{port}")
+        try:
+            await server.serve_forever()
+        except asyncio.CancelledError:
+            self.log.info("🚦 SMTP debug server cancelled, shutting down gracefully...")
+        finally:
+            server.close()
+            self.log.info("🛑 SMTP debug server stopped")
+        return 0
+
+
+if __name__ == "__main__":
+    SMTPDebugServer.start()
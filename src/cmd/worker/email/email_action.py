@@ -3,3 +3,5 @@ from enum import Enum
 
 class EmailAction(Enum):
     send_email = "send_email"
+    send_batch = "send_batch"
+    send_batch_result = "send_batch_result"
@@ -0,0 +1,10 @@
+from src.core.rabbit_mq.config import ExchangeConfig, QueueConfig, RetryPolicy
+
+EMAIL_EXCHANGE = ExchangeConfig(name="p_email_exchange")
+EMAIL_QUEUE = QueueConfig(
+    name="p_email",
+    retry=RetryPolicy(max_attempts=5, initial_delay_ms=5_000, multiplier=3.0),
+    dead_letter=True,
+    # keeps the SMTP connection pool busy while messages for throttled domains wait their turn
+    prefetch_count=32,
+)
@@ -0,0 +1,110 @@
+import asyncio
+import traceback
+from typing import Any
+
+import aiosmtplib
+
+from src.cmd.worker.email.email_action import EmailAction
+from src.cmd.worker.email.email_queue import EMAIL_QUEUE
+from src.core.rabbit_mq.data import MessageContext, ProcessingResult
+from src.core.rabbit_mq.message_handler import MessageHandler
+from src.core.service.email.email import EBatchRecipient, EBatchResult, EMessage
+from src.core.service.email.send_scheduler import SendThrottledError
+
+
+class SendBatchEmailHandler(MessageHandler):
+    actions = (EmailAction.send_batch.value,)
+
+    async def handle(self, context: MessageContext) -> ProcessingResult:
+        try:
+            template = context.payload.get("template")
+            subject = context.payload.get("subject")
+            recipients = context.payload.get("recipients")
+            if not template or subject is None or not isinstance(recipients, list):
+                raise ValueError("🛑 Missing required fields in batch message")
+
+            shared = context.payload.get("context") or {}
+            attachments = context.payload.get("attachments") or []
+            body_type = context.payload.get("body_type") or "html"
+            email_service = self.container.email_service()
+            view_service = self.container.view_service()
+            # render lazily, so at most a few bodies are in memory while the pool is sending
+            slots = asyncio.Semaphore(email_service.pool.config.pool_size * 2)
+            waits: list[float] = []
+
+            async def send(recipient: EBatchRecipient) -> EBatchResult:
+                async with slots:
+                    try:
+                        body = await view_service.render_template(str(template), {**shared, **recipient.context})
+                        await email_service.send_email(
+                            message=EMessage(
+                                to=recipient.to,
+                                subject=str(subject),
+                                body=body,
+                                body_type=body_type,
+                                attachments=[str(attachment) for attachment in attachments],
+                            )
+                        )
+                        return EBatchResult(to=recipient.to, sent=True)
+                    except aiosmtplib.SMTPRecipientsRefused as e:
+                        return EBatchResult(to=recipient.to, sent=False, code=e.recipients[0].code, error=str(e))
+                    except aiosmtplib.SMTPResponseException as e:
+                        return EBatchResult(to=recipient.to, sent=False, code=e.code, error=e.message)
+                    except SendThrottledError as e:
+                        waits.append(e.wait)
+                        return EBatchResult(to=recipient.to, sent=False, error=str(e), throttled=True)
+                    except (aiosmtplib.SMTPServerDisconnected, OSError) as e:
+                        return EBatchResult(to=recipient.to, sent=False, error=str(e))
+                    except Exception as e:
+                        # a render error or missing attachment fails this recipient only, a retry would fail again
+                        self.logger.error(f"🛑 Failed to send batch email to {recipient.to}: {e}")
+                        return EBatchResult(to=recipient.to, sent=False, error=str(e), permanent=True)
+
+            # parsed up front, so a malformed recipient rejects the batch before any send starts
+            batch = [self._recipient(recipient) for recipient in recipients]
+            results = await asyncio.gather(*[send(recipient) for recipient in batch])
+        except Exception as e:
+            self.logger.error(f"🛑 Failed to send batch email: {e}", error=traceback.extract_tb(e.__traceback__)[-1])
+            return ProcessingResult.REJECT
+
+        batch_id = context.payload.get("batch_id")
+        policy = self.retry_policy or EMAIL_QUEUE.retry
+        can_retry = policy is not None and context.attempt + 1 < policy.max_attempts
+        failed = can_retry and any(result.transient for result in results)
+        # throttled recipients always go back, transiently failed ones while attempts remain; delivered are never resent
+        pending = [result.throttled or (can_retry and result.transient) for result in results]
+        retry = [recipient for recipient, is_pending in zip(batch, pending, strict=True) if is_pending]
+        results = [result for result, is_pending in zip(results, pending, strict=True) if not is_pending]
+        if retry:
+            context.retry_payload = {**context.payload, "recipients": [recipient.to_dict() for recipient in retry]}
+            context.retry_delay_ms = int(max(waits) * 1000) if waits else None
+            self.logger.warning(f"⏳ Batch email {batch_id}: {len(retry)} recipients will retry")
+
+        sent = sum(1 for result in results if result.sent)
+        self.logger.info(f"📧 Batch email {batch_id} sent to {sent}/{len(results)} recipients")
+        reply_to = context.payload.get("reply_to")
+        if reply_to and results:
+            await self._report(str(reply_to), batch_id, results, pending=len(retry))
+        if not retry:
+            return ProcessingResult.SUCCESS
+        # a retry spends an attempt for the whole narrowed batch, a throttled-only batch is deferred for free
+        return ProcessingResult.RETRY if failed else ProcessingResult.DEFER
+
+    @staticmethod
+    def _recipient(recipient: Any) -> EBatchRecipient:
+        if isinstance(recipient, dict):
+            return EBatchRecipient(to=str(recipient["to"]), context=recipient.get("context") or {})
+        return EBatchRecipient(to=str(recipient))
+
+    async def _report(self, reply_to: str, batch_id: Any, results: list[EBatchResult], pending: int = 0) -> None:
+        # a batch with retried recipients is reported once per attempt, pending counts the ones still to come
+        producer = self.container.rmq_producer()
+        await producer.initialize()
+        message = producer.build_message(
+            {"batch_id": batch_id, "results": [result.to_dict() for result in results], "pending": pending},
+            action=EmailAction.send_batch_result.value,
+        )
+        # published through the default exchange, which routes by queue name
+        (published,) = await producer.publish_batch([("", reply_to, message)])
+        if not published:
+            self.logger.error(f"🛑 Failed to report batch email {batch_id} results to {reply_to}")
@@ -1,14 +1,16 @@
 import traceback
 
+import aiosmtplib
+
 from src.cmd.worker.email.email_action import EmailAction
 from src.core.rabbit_mq.data import MessageContext, ProcessingResult
 from src.core.rabbit_mq.message_handler import MessageHandler
 from src.core.service.email.email import EMessage
+from src.core.service.email.send_scheduler import SendThrottledError
 
 
 class SendEmailHandler(MessageHandler):
-    def can_handle(self, action: str) -> bool:
-        return action in [EmailAction.send_email.value]
+    actions = (EmailAction.send_email.value,)
 
     async def handle(self, context: MessageContext) -> ProcessingResult:
         try:
@@ -19,9 +21,14 @@ class SendEmailHandler(MessageHandler):
             bcc = context.payload.get("bcc")
             body_type = context.payload.get("body_type")
             attachments = context.payload.get("attachments")
-            if to is None or subject is None or body is None:
+            template = context.payload.get("template")
+            if to is None or subject is None or (body is None and template is None):
                 raise ValueError("🛑 Missing required fields in message")
-            self.container.email_service().send_email(
+            if template is not None:
+                body = await self.container.view_service().render_template(
+                    str(template), context.payload.get("context") or {}
+                )
+            await self.container.email_service().send_email(
                 message=EMessage(
                     to=[str(email) for email in to] if isinstance(to, list) else str(to),
                     cc=[str(email) for email in cc] if isinstance(cc, list) else ([str(cc)] if cc else []),
@@ -35,6 +42,28 @@ class SendEmailHandler(MessageHandler):
                 )
             )
             return ProcessingResult.SUCCESS
+        except SendThrottledError as e:
+            # nothing failed, the message waits in a delay queue without spending an attempt
+            self.logger.warning(f"⏳ {e}, deferred")
+            context.retry_delay_ms = int(e.wait * 1000)
+            return ProcessingResult.DEFER
+        except aiosmtplib.SMTPRecipientsRefused as e:
+            # every recipient was refused, retry only if some refusal was transient
+            if any(400 <= refused.code < 500 for refused in e.recipients):
+                self.logger.warning(f"⏳ Failed to send email, will retry: {e}")
+                return ProcessingResult.RETRY
+            self.logger.error(f"🛑 Failed to send email: {e}", error=traceback.extract_tb(e.__traceback__)[-1])
+            return ProcessingResult.REJECT
+        except aiosmtplib.SMTPResponseException as e:
+            # 4xx replies are transient (greylisting, throttling), 5xx are permanent
+            if 400 <= e.code < 500:
+                self.logger.warning(f"⏳ Failed to send email, will retry: {e}")
+                return ProcessingResult.RETRY
+            self.logger.error(f"🛑 Failed to send email: {e}", error=traceback.extract_tb(e.__traceback__)[-1])
+            return ProcessingResult.REJECT
+        except (aiosmtplib.SMTPServerDisconnected, OSError) as e:
+            self.logger.warning(f"⏳ Failed to send email, will retry: {e}")
+            return ProcessingResult.RETRY
         except Exception as e:
             self.logger.error(f"🛑 Failed to send email: {e}", error=traceback.extract_tb(e.__traceback__)[-1])
             return ProcessingResult.REJECT
@@ -1,9 +1,11 @@
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 
 import aiomysql  # type: ignore
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import StaticPool
+
+_current_session: ContextVar[AsyncSession | None] = ContextVar("current_session", default=None)
 
 
 class MyDatabaseConfig:
@@ -12,15 +14,24 @@ class MyDatabaseConfig:
     def __init__(
         self,
         dsn: str,
+        pool_size: int = 10,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = 3600,
     ):
         self.dsn = dsn
         self.database_url = f"{self.dsn}"
 
+        # a queue pool, not a single shared connection: a transaction() holds its connection across awaits,
+        # so concurrent requests each need their own
         self.engine = create_async_engine(
             self.database_url,
             echo=False,
             pool_pre_ping=True,
-            poolclass=StaticPool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
             connect_args={"charset": "utf8mb4", "cursorclass": aiomysql.SSCursor},
         )
 
@@ -32,6 +43,12 @@ class MyDatabaseConfig:
 
     @asynccontextmanager
     async def session(self) -> AsyncGenerator[AsyncSession]:
+        current = _current_session.get()
+        if current is not None:
+            # inside transaction(): join it, commit/rollback is done by the outermost block
+            yield current
+            return
+
         async with self.async_session_factory() as session:
             try:
                 yield session
@@ -42,6 +59,20 @@ class MyDatabaseConfig:
             finally:
                 await session.close()
 
+    @asynccontextmanager
+    async def transaction(self) -> AsyncGenerator[AsyncSession]:
+        current = _current_session.get()
+        if current is not None:
+            yield current
+            return
+
+        async with self.session() as session:
+            token = _current_session.set(session)
+            try:
+                yield session
+            finally:
+                _current_session.reset(token)
+
     async def close(self) -> None:
         if self.engine is not None:
             await self.engine.dispose()
@@ -1,9 +1,54 @@
-from typing import Any
+from collections.abc import Collection
+from operator import attrgetter
+from typing import Any, ClassVar
 
 from pydantic.alias_generators import to_camel
 from sqlalchemy.orm import DeclarativeBase
 
 
+class EntityColumns:
+    def __init__(self, names: tuple[str, ...]) -> None:
+        self.names = names
+        self.camel = tuple(to_camel(name) for name in names)
+        # attrgetter with several names returns a tuple, with one a bare value
+        getter = attrgetter(*names)
+        self.values = getter if len(names) > 1 else lambda entity: (getter(entity),)
+
+
 class Entity(DeclarativeBase):
-    def to_dict(self, camel: bool = False) -> dict[str, Any]:
-        return {to_camel(col.name) if camel else col.name: getattr(self, col.name) for col in self.__table__.columns}
+    _entity_columns: ClassVar[EntityColumns | None] = None
+
+    @classmethod
+    def __declare_last__(cls) -> None:
+        # runs once the mappers are configured, so to_dict never converts names per row
+        cls.entity_columns()
+
+    @classmethod
+    def entity_columns(cls) -> EntityColumns:
+        columns = cls.__dict__.get("_entity_columns")
+        if columns is None:
+            columns = EntityColumns(tuple(col.name for col in cls.__table__.columns))
+            cls._entity_columns = columns
+        return columns
+
+    @classmethod
+    def column_names(cls, fields: Collection[str]) -> list[str]:
+        # column names for field names given as column or camelCase names, unknown names are skipped
+        columns = cls.entity_columns()
+        return [
+            name
+            for name, camel_name in zip(columns.names, columns.camel, strict=True)
+            if name in fields or camel_name in fields
+        ]
+
+    def to_dict(self, camel: bool = False, fields: Collection[str] | None = None) -> dict[str, Any]:
+        # fields may use column or camelCase names, e.g. a JSON:API sparse fieldset
+        columns = self.entity_columns()
+        keys = columns.camel if camel else columns.names
+        if fields is None:
+            return dict(zip(keys, columns.values(self), strict=True))
+        return {
+            key: getattr(self, name)
+            for name, camel_name, key in zip(columns.names, columns.camel, keys, strict=True)
+            if name in fields or camel_name in fields
+        }
@@ -1,11 +1,12 @@
 from abc import ABC
-from collections.abc import Sequence
+from collections.abc import Collection, Sequence
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Generic, TypeVar
 
 from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.orm import load_only
 from sqlalchemy.sql import Delete, Select, Update
 
 from src.core.db.asmysql import MyDatabaseConfig
@@ -120,8 +121,9 @@ class BaseRepository(ABC, Generic[T]):
     async def get_by_id(
         self,
         uid: Any,
+        fields: Collection[str] | None = None,
     ) -> T:
-        obj = await self.find_by_id(uid)
+        obj = await self.find_by_id(uid, fields=fields)
         if obj is None:
             raise DomainException(
                 error_no=ErrorNo.REPOSITORY_DATA_BY_ID_NOT_FOUND,
@@ -132,8 +134,9 @@ class BaseRepository(ABC, Generic[T]):
     async def find_by_id(
         self,
         uid: Any,
+        fields: Collection[str] | None = None,
     ) -> T | None:
-        query = select(self._model).where(getattr(self._model, self._id_field) == uid)
+        query = self._select(fields).where(getattr(self._model, self._id_field) == uid)
         async with self.get_session() as session:
             result = await session.execute(query)
             return result.scalar_one_or_none()
@@ -202,8 +205,9 @@ class BaseRepository(ABC, Generic[T]):
         order_by: list[OrderBy] | None = None,
         pagination: Pagination | None = None,
         pager: Pager | None = None,
+        fields: Collection[str] | None = None,
     ) -> Sequence[T] | Paginator[T]:
-        query = select(self._model)
+        query = self._select(fields)
 
         if filters:
             query = self._apply_filters(query, filters)
@@ -277,6 +281,14 @@ class BaseRepository(ABC, Generic[T]):
             result = await session.execute(query)
             return result.first() is not None
 
+    def _select(self, fields: Collection[str] | None = None) -> Select:
+        query = select(self._model)
+        if fields is not None:
+            # sparse fieldset, the other columns are not fetched and must not be read from the entities
+            names = {self._id_field, *self._model.column_names(fields)}
+            query = query.options(load_only(*[getattr(self._model, name) for name in names]))
+        return query
+
     def _apply_filters(self, query: Select | Update | Delete, filters: list[Filter]) -> Select | Update | Delete:
         conditions = []
 
@@ -1,14 +1,19 @@
 from dependency_injector import containers, providers
 
 from src.app.auth.service.auth_service import AuthService
+from src.app.outbox.repository.outbox_repository import OutboxRepository
+from src.app.outbox.service.outbox_relay import OutboxRelay
+from src.app.outbox.service.outbox_service import OutboxService
 from src.app.user.repository.user_repository import UserRepository
 from src.app.user.service.user_service import UserService
 from src.app.user_notification.repository.user_notification_repository import UserNotificationRepository
 from src.app.user_notification.service.user_notification_service import UserNotificationService
 from src.app.user_notification.service.ws_notification_service import WSNotificationService
 from src.app.ws.service.ws_service import WSService
+from src.cmd.worker.email.email_queue import EMAIL_EXCHANGE, EMAIL_QUEUE
 from src.core.db.asmysql import MyDatabaseConfig
 from src.core.log.log import Log
+from src.core.rabbit_mq.codec import CodecRegistry
 from src.core.rabbit_mq.config import RabbitMQConfig
 from src.core.rabbit_mq.consumer import AsyncRabbitMQConsumer
 from src.core.rabbit_mq.producer import AsyncRabbitMQProducer
@@ -18,13 +23,22 @@ from src.core.service.email.email_service import EmailService
 from src.core.service.email.view_service import ViewService
 from src.core.service.hash_service import HashService
 from src.core.settings.setting import Settings
+from src.core.web_socket.ws_admission import WSAdmission
+from src.core.web_socket.ws_backplane import WSBackplane
 from src.core.web_socket.ws_manager import WSManager
 
 
 class Container(containers.DeclarativeContainer):
     config = providers.Configuration()
     app_config = providers.Singleton(Settings)
-    db_config = providers.Singleton(MyDatabaseConfig, dsn=app_config.provided.sqlalchemy_database_uri)
+    db_config = providers.Singleton(
+        MyDatabaseConfig,
+        dsn=app_config.provided.sqlalchemy_database_uri,
+        pool_size=app_config.provided.db_pool_size,
+        max_overflow=app_config.provided.db_max_overflow,
+        pool_timeout=app_config.provided.db_pool_timeout,
+        pool_recycle=app_config.provided.db_pool_recycle,
+    )
 
     log = providers.Singleton(
         Log,
@@ -59,15 +73,32 @@ class Container(containers.DeclarativeContainer):
         smtp_port=app_config.provided.smtp_port,
         app_password=app_config.provided.app_password,
         from_email=app_config.provided.from_email,
+        pool_size=app_config.provided.smtp_pool_size,
+        max_messages_per_connection=app_config.provided.smtp_max_messages_per_connection,
+        attachment_cache_bytes=app_config.provided.email_attachment_cache_bytes,
+        account_rate=app_config.provided.email_account_rate,
+        account_burst=app_config.provided.email_account_burst,
+        domain_rate=app_config.provided.email_domain_rate,
+        domain_burst=app_config.provided.email_domain_burst,
+        domain_limits=app_config.provided.email_domain_limits,
+        max_throttle_wait=app_config.provided.email_max_throttle_wait,
     )
 
     rmq_config = providers.Singleton(
         RabbitMQConfig,
         url=app_config.provided.rabbitmq_url,
+        content_type=app_config.provided.rabbitmq_content_type,
+        compression=app_config.provided.rabbitmq_compression,
+        compression_threshold=app_config.provided.rabbitmq_compression_threshold,
+    )
+    rmq_codecs = providers.Singleton(
+        CodecRegistry,
+        content_type=app_config.provided.rabbitmq_content_type,
+        compression=app_config.provided.rabbitmq_compression,
     )
 
-    rmq_producer = providers.Singleton(AsyncRabbitMQProducer, config=rmq_config, log=log_rm)
-    rmq_consumer = providers.Singleton(AsyncRabbitMQConsumer, config=rmq_config, log=log_rm)
+    rmq_producer = providers.Singleton(AsyncRabbitMQProducer, config=rmq_config, codecs=rmq_codecs, log=log_rm)
+    rmq_consumer = providers.Singleton(AsyncRabbitMQConsumer, config=rmq_config, codecs=rmq_codecs, log=log_rm)
     rmq_service = providers.Singleton(
         RMQService,
         producer=rmq_producer,
@@ -77,14 +108,33 @@ class Container(containers.DeclarativeContainer):
         ViewService,
         template_dirs="src/core/service/email/templates",
         app_url=app_config.provided.app_url,
+        compiled_dir=app_config.provided.template_compiled_dir,
+        cache_size=app_config.provided.template_cache_size,
+        render_workers=app_config.provided.template_render_workers,
     )
 
     hash_service = providers.Singleton(HashService, cfg=app_config)
 
+    outbox_repository = providers.Singleton(
+        OutboxRepository,
+        db_config=db_config,
+    )
+    outbox_service = providers.Singleton(
+        OutboxService,
+        outbox_repository=outbox_repository,
+    )
+    outbox_relay = providers.Singleton(
+        OutboxRelay,
+        db_config=db_config,
+        outbox_repository=outbox_repository,
+        producer=rmq_producer,
+        topologies=[(EMAIL_QUEUE, EMAIL_EXCHANGE)],
+        log=log_rm,
+    )
+
     app_email_service = providers.Singleton(
         AppMailService,
-        rmq_service=rmq_service,
-        view_service=view_service,
+        outbox_service=outbox_service,
     )
     user_repository = providers.Singleton(
         UserRepository,
@@ -104,9 +154,29 @@ class Container(containers.DeclarativeContainer):
         user_notification_repository=user_notification_repository,
     )
 
+    ws_admission = providers.Singleton(
+        WSAdmission,
+        max_per_user=app_config.provided.ws_max_connections_per_user,
+        max_connections=app_config.provided.ws_max_connections,
+        ip_rate=app_config.provided.ws_connect_rate_per_ip,
+        ip_burst=app_config.provided.ws_connect_burst_per_ip,
+    )
     ws_manager = providers.Singleton(
         WSManager,
         log=log,
+        max_queue=app_config.provided.ws_send_queue_size,
+        overflow_policy=app_config.provided.ws_overflow_policy,
+        shards=app_config.provided.ws_registry_shards,
+        max_topics=app_config.provided.ws_max_topics,
+        heartbeat_interval=app_config.provided.ws_heartbeat_interval,
+        heartbeat_timeout=app_config.provided.ws_heartbeat_timeout,
+        admission=ws_admission,
+    )
+    ws_backplane = providers.Singleton(
+        WSBackplane,
+        config=rmq_config,
+        ws_manager=ws_manager,
+        log=log,
     )
 
     ws_notification_service = providers.Singleton(
@@ -114,6 +184,9 @@ class Container(containers.DeclarativeContainer):
         user_notification_service=user_notification_service,
         ws_manager=ws_manager,
         log=log,
+        sync_batch_size=app_config.provided.ws_sync_batch_size,
+        read_window=app_config.provided.ws_read_window,
+        read_batch_size=app_config.provided.ws_read_batch_size,
     )
 
     ws_service = providers.Singleton(
@@ -129,4 +202,5 @@ class Container(containers.DeclarativeContainer):
         user_service=user_service,
         hash_service=hash_service,
         app_email_service=app_email_service,
+        db_config=db_config,
     )
@@ -1,6 +1,14 @@
+import re
+
+from fastapi import Request
 from pydantic import AliasGenerator, BaseModel, ConfigDict
 from pydantic.alias_generators import to_camel
 
+# JSON:API sparse fieldsets, ?fields[User]=email,firstName
+FIELDS_PARAM = re.compile(r"^fields\[(\w+)\]$")
+
+SparseFields = dict[str, set[str]]
+
 
 class DTO(BaseModel):
     model_config = ConfigDict(
@@ -24,3 +32,13 @@ class Paginated(DTO):
     per_page: int | None = None
     order_field: str | None = None
     order_by: str | None = None
+
+
+def get_sparse_fields(request: Request) -> SparseFields | None:
+    # bracketed query keys cannot be declared on a DTO, so the fieldsets come from a dependency next to it
+    fields: SparseFields = {}
+    for key, value in request.query_params.items():
+        match = FIELDS_PARAM.match(key)
+        if match:
+            fields[match.group(1)] = {field.strip() for field in value.split(",") if field.strip()}
+    return fields or None
@@ -3,8 +3,9 @@ from abc import ABC
 from typing import Any
 
 from src.core.di.container import Container
+from src.core.dto.dto import SparseFields
 from src.core.http.response.api_response_service import ApiResponseService
-from src.core.http.response.response import JsonApiResponse
+from src.core.http.response.json_api_serializer import JsonApiBytesResponse
 from src.core.log.log import Log
 from src.core.settings.setting import Settings
 
@@ -24,13 +25,22 @@ class BaseController(ABC):
     def log(self) -> Log:
         return self.container.log()
 
+    def select_fields(self, resource_type: str, fields: SparseFields | None) -> set[str] | None:
+        # columns to load for a sparse fieldset, plus the keys the relationships are linked by
+        if not fields or resource_type not in fields:
+            return None
+        model_response = self.api_response_service.get_model_response(resource_type)
+        keys = {config.local_key for config in model_response.relationships.values()} if model_response else set()
+        return fields[resource_type] | keys
+
     async def response(
         self,
         data: Any | None = None,
         meta: dict[str, Any] | None = None,
         resource_type: str | None = None,
         include: str | None = None,
-    ) -> JsonApiResponse:
+        fields: SparseFields | None = None,
+    ) -> JsonApiBytesResponse:
         return await self.api_response_service.response(
-            data=data, meta=meta, resource_type=resource_type, include=include
+            data=data, meta=meta, resource_type=resource_type, include=include, fields=fields
         )
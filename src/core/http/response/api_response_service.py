@@ -6,9 +6,11 @@ from src.app.user.dto.user import UserResponse
 from src.app.user_notification.dto.user_notification import UserNotificationResponse
 from src.core.db.repository import Paginator
 from src.core.di.container import Container
+from src.core.dto.dto import SparseFields
 from src.core.exception.error_no import ErrorNo
 from src.core.http.response.json_api import JsonAPIService
-from src.core.http.response.response import JsonApiError, JsonApiResource, JsonApiResponse, ResponseBaseModel
+from src.core.http.response.json_api_serializer import JsonApiBytesResponse, json_api_document
+from src.core.http.response.response import IncludedIndex, JsonApiError, JsonApiResponse, ResponseBaseModel
 from src.core.service.functions import to_invert_case
 
 
@@ -46,12 +48,26 @@ class ApiResponseService:
         meta: dict[str, Any] | None = None,
         resource_type: str | None = None,
         include: str | None = None,
-    ) -> JsonApiResponse:
+        fields: SparseFields | None = None,
+    ) -> JsonApiBytesResponse:
+        # the document is built from plain dicts and serialised once, FastAPI returns the bytes as they are
+        return JsonApiBytesResponse(await self.document(data, errors, meta, resource_type, include, fields))
+
+    async def document(
+        self,
+        data: Any | None = None,
+        errors: list[JsonApiError | dict[str, Any]] | None = None,
+        meta: dict[str, Any] | None = None,
+        resource_type: str | None = None,
+        include: str | None = None,
+        fields: SparseFields | None = None,
+    ) -> dict[str, Any]:
+        # fields is a JSON:API sparse fieldset, resource type -> attribute names
         if data is None and errors is None:
-            return JsonApiResponse(meta=meta)
+            return json_api_document(meta=meta)
 
         if errors:
-            return JsonApiResponse(
+            return json_api_document(
                 errors=[error.model_dump() if hasattr(error, "model_dump") else error for error in errors],
                 meta=meta,
             )
@@ -69,9 +85,9 @@ class ApiResponseService:
         if model_response:
             if include is not None:
                 include_params = {inc.strip(): True for inc in include.split(",")}
-            return await self._response_with_model_handler(data, model_response, meta, include_params)
+            return await self._response_with_model_handler(data, model_response, meta, include_params, fields)
         else:
-            return self._response_without_model_handler(data, resource_type, meta)
+            return self._response_without_model_handler(data, resource_type, meta, (fields or {}).get(resource_type))
 
     async def _response_with_model_handler(
         self,
@@ -79,13 +95,19 @@ class ApiResponseService:
         model_response: ResponseBaseModel,
         meta: dict[str, Any] | None = None,
         include_params: dict[str, bool] | None = None,
-    ) -> JsonApiResponse:
-        resources: list[JsonApiResource] | list[dict[str, Any]] | JsonApiResource = []  # noqa
-        included_resources: list[JsonApiResource] | list[dict[str, Any]] = []  # noqa
+        fields: SparseFields | None = None,
+    ) -> dict[str, Any]:
+        resources: list[dict[str, Any]] | dict[str, Any] = []  # noqa
+        type_fields = (fields or {}).get(model_response.get_resource_type())
+
+        # includes are loaded once and indexed, every resource is then linked with dict lookups
+        items = data.items if isinstance(data, Paginator) else data
+        included = await model_response.process_includes(items, include_params or {})
+        included_index = model_response.index_included(included)
+        included_resources = [resource for resources in included.values() for resource in resources]
 
         if isinstance(data, Paginator):
-            resources = await self._map_items_with_model_response(data.items, model_response, include_params)
-            included_resources = await self._process_includes_for_list(data.items, model_response, include_params)
+            resources = self._map_items_with_model_response(data.items, model_response, included_index, type_fields)
             meta = {
                 "total": data.total,
                 "page": data.page,
@@ -94,26 +116,28 @@ class ApiResponseService:
                 **(meta or {}),
             }
         elif isinstance(data, list):
-            resources = await self._map_items_with_model_response(data, model_response, include_params)
-            included_resources = await self._process_includes_for_list(data, model_response, include_params)
+            resources = self._map_items_with_model_response(data, model_response, included_index, type_fields)
         else:
-            resources = await self._data_to_resource_with_model_response(data, model_response, include_params)
-            included_resources = await self._process_includes_for_item(data, model_response, include_params)
+            resources = self._data_to_resource_with_model_response(data, model_response, included_index, type_fields)
 
-        response_data = {"data": resources, "meta": meta}
+        if fields:
+            # included resources are trimmed after linking, the foreign keys may not be in the fieldset
+            for resource in included_resources:
+                included_fields = fields.get(resource["type"])
+                if included_fields is not None and isinstance(resource["attributes"], dict):
+                    resource["attributes"] = {
+                        key: value for key, value in resource["attributes"].items() if key in included_fields
+                    }
 
-        if included_resources:
-            response_data["included"] = included_resources
-
-        return JsonApiResponse(data=resources, included=included_resources if included_resources else None, meta=meta)
+        return json_api_document(data=resources, included=included_resources if included_resources else None, meta=meta)
 
     def _response_without_model_handler(
-        self, data: Any, resource_type: str, meta: dict[str, Any] | None = None
-    ) -> JsonApiResponse:
-        resources: list[JsonApiResource] | list[dict[str, Any]] | JsonApiResource = []  # noqa
+        self, data: Any, resource_type: str, meta: dict[str, Any] | None = None, fields: set[str] | None = None
+    ) -> dict[str, Any]:
+        resources: list[dict[str, Any]] | dict[str, Any] = []  # noqa
 
         if isinstance(data, Paginator):
-            resources = self.map_items(data.items)
+            resources = self.map_items(data.items, fields)
             meta = {
                 "total": data.total,
                 "page": data.page,
@@ -122,80 +146,48 @@ class ApiResponseService:
                 **(meta or {}),
             }
         elif isinstance(data, list):
-            resources = self.map_items(data)
+            resources = self.map_items(data, fields)
         else:
-            resources = ResponseBaseModel.data_to_resource(data, resource_type)
+            resources = ResponseBaseModel.to_resource(data, resource_type, fields)
 
-        return JsonApiResponse(data=resources, meta=meta)
+        return json_api_document(data=resources, meta=meta)
 
     @staticmethod
-    async def _map_items_with_model_response(
+    def _map_items_with_model_response(
         data: list[Any] | Sequence[Any],
         model_response: ResponseBaseModel,
-        include_params: dict[str, bool] | None = None,
-    ) -> list[JsonApiResource]:
-        if not data:
-            return []
-
+        included: IncludedIndex,
+        fields: set[str] | None = None,
+    ) -> list[dict[str, Any]]:
         resources = []
-        included = await model_response.process_includes(data, include_params or {})
+        resource_type = model_response.get_resource_type()
 
         for item in data:
-            resource = ResponseBaseModel.data_to_resource(item, model_response.get_resource_type())
+            resource = ResponseBaseModel.to_resource(item, resource_type, fields)
             resource = model_response.add_relationships_to_resource(resource, item, included)
             resources.append(resource)
 
         return resources
 
     @staticmethod
-    async def _data_to_resource_with_model_response(
-        data: Any, model_response: ResponseBaseModel, include_params: dict[str, bool] | None = None
-    ) -> JsonApiResource:
-        included = await model_response.process_includes(data, include_params or {})
-        resource = model_response.data_to_resource(data, model_response.get_resource_type())
+    def _data_to_resource_with_model_response(
+        data: Any,
+        model_response: ResponseBaseModel,
+        included: IncludedIndex,
+        fields: set[str] | None = None,
+    ) -> dict[str, Any]:
+        resource = model_response.to_resource(data, model_response.get_resource_type(), fields)
         resource = model_response.add_relationships_to_resource(resource, data, included)
         return resource
 
     @staticmethod
-    async def _process_includes_for_list(
-        data: list[Any] | Sequence[Any],
-        model_response: ResponseBaseModel,
-        include_params: dict[str, bool] | None = None,
-    ) -> list[JsonApiResource]:
-        if not include_params:
-            return []
-
-        included = await model_response.process_includes(data, include_params)
-        all_included = []
-
-        for resources in included.values():
-            all_included.extend(resources)
-
-        return all_included
-
-    @staticmethod
-    async def _process_includes_for_item(
-        data: Any, model_response: ResponseBaseModel, include_params: dict[str, bool] | None = None
-    ) -> list[JsonApiResource]:
-        if not include_params:
-            return []
-
-        included = await model_response.process_includes(data, include_params)
-        all_included = []
-
-        for resources in included.values():
-            all_included.extend(resources)
-
-        return all_included
-
-    @staticmethod
-    def map_items(data: list[Any] | Sequence[Any]) -> list[JsonApiResource]:
+    def map_items(data: list[Any] | Sequence[Any], fields: set[str] | None = None) -> list[dict[str, Any]]:
         resources = []
         resource_type = ""
         if len(data) > 0:
             resource_type = data[0].__class__.__name__
         for item in data:
-            resources.append(ResponseBaseModel.data_to_resource(item, resource_type))
+            resources.append(ResponseBaseModel.to_resource(item, resource_type, fields))
         return resources
 
     @staticmethod
@@ -0,0 +1,59 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+JSON_API_MEDIA_TYPE = "application/json"
+
+
+def _default(value: Any) -> Any:
+    # the types FastAPI would convert in response_model serialisation, with the same output
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, Decimal | UUID):
+        return str(value)
+    if isinstance(value, set | frozenset | tuple):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime | date | time):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+def dumps(document: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(document, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(document, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_api_document(
+    data: Any = None,
+    errors: list[dict[str, Any]] | None = None,
+    meta: dict[str, Any] | None = None,
+    included: list[dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    # same keys and order as JsonApiResponse.model_dump()
+    return {"data": data, "errors": errors, "meta": meta, "included": included}
+
+
+class JsonApiBytesResponse(Response):
+    media_type = JSON_API_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
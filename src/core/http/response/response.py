@@ -10,6 +10,8 @@ from pydantic.alias_generators import to_camel
 
 from src.core.db.repository import Filter, Oper
 
+_MISSING = object()
+
 
 class JsonApiResource(BaseModel):
     type: str
@@ -51,6 +53,10 @@ class RelationshipConfig:
     include_in_response: bool = True
 
 
+# relationship name -> stitch key (str of the id or foreign key) -> related resources
+IncludedIndex = dict[str, dict[str, list[dict[str, Any]]]]
+
+
 @dataclass
 class IncludeConfig:
     relationship_name: str
@@ -78,8 +84,8 @@ class ResponseBaseModel(ABC):
     def get_service(self, service_name: str) -> Any:
         return getattr(self.container, service_name)()
 
-    async def process_includes(self, data: Any, include_params: dict[str, bool]) -> dict[str, list[JsonApiResource]]:
-        included: dict[str, list[JsonApiResource]] = {}
+    async def process_includes(self, data: Any, include_params: dict[str, bool]) -> dict[str, list[dict[str, Any]]]:
+        included: dict[str, list[dict[str, Any]]] = {}
         if not include_params:
             return included
 
@@ -107,7 +113,7 @@ class ResponseBaseModel(ABC):
 
     async def _process_relationship_for_list(
         self, data_list: list[Any] | Sequence[Any], config: RelationshipConfig
-    ) -> list[JsonApiResource]:
+    ) -> list[dict[str, Any]]:
         if not data_list:
             return []
 
@@ -139,11 +145,11 @@ class ResponseBaseModel(ABC):
 
         resources = []
         for item in related_data:
-            resources.append(self.data_to_resource(item))
+            resources.append(self.to_resource(item))
 
         return resources
 
-    async def _process_relationship_for_item(self, data: Any, config: RelationshipConfig) -> list[JsonApiResource]:
+    async def _process_relationship_for_item(self, data: Any, config: RelationshipConfig) -> list[dict[str, Any]]:
         if not hasattr(data, config.local_key):
             return []
 
@@ -165,78 +171,78 @@ class ResponseBaseModel(ABC):
             return []
 
         if isinstance(related_data, list):
-            return [self.data_to_resource(item) for item in related_data]
+            return [self.to_resource(item) for item in related_data]
         else:
-            return [self.data_to_resource(related_data)]
+            return [self.to_resource(related_data)]
+
+    def index_included(self, included: dict[str, list[dict[str, Any]]]) -> IncludedIndex:
+        # relationship -> stitch key -> related resources, built once per response so linking is O(n + m)
+        indexes: IncludedIndex = {}
+        for relationship_name, related_resources in included.items():
+            config = self.relationships.get(relationship_name)
+            if config is None:
+                continue
+
+            index: dict[str, list[dict[str, Any]]] = {}
+            if config.relationship_type == RelationshipType.HAS_MANY:
+                foreign_key = to_camel(config.foreign_key)
+                for res in related_resources:
+                    attributes = res.get("attributes")
+                    if isinstance(attributes, dict) and foreign_key in attributes:
+                        index.setdefault(str(attributes[foreign_key]), []).append(res)
+            else:
+                for res in related_resources:
+                    index.setdefault(res["id"], []).append(res)
+            indexes[relationship_name] = index
+
+        return indexes
 
     def add_relationships_to_resource(
-        self, resource: JsonApiResource, data: Any, included: dict[str, list[JsonApiResource]]
-    ) -> JsonApiResource:
+        self, resource: dict[str, Any], data: Any, included: IncludedIndex
+    ) -> dict[str, Any]:
         if not included:
             return resource
 
         relationships: dict[str, dict[str, Any]] = {}
 
-        for relationship_name, related_resources in included.items():
-            if relationship_name not in self.relationships:
-                continue
-
+        for relationship_name, index in included.items():
             config = self.relationships[relationship_name]
+            local_value = getattr(data, config.local_key, _MISSING)
+            related_resources = index.get(str(local_value), []) if local_value is not _MISSING else []
 
             if config.relationship_type == RelationshipType.HAS_MANY:
                 relationships[relationship_name] = {
-                    "data": [
-                        {"type": res.type, "id": res.id}
-                        for res in related_resources
-                        if self._is_related_to_resource(data, res, config)
-                    ]
+                    "data": [{"type": res["type"], "id": res["id"]} for res in related_resources]
                 }
-            else:
-                related_res = self._find_related_resource(data, related_resources, config)
-                if related_res:
-                    relationships[relationship_name] = {"data": {"type": related_res.type, "id": related_res.id}}
+            elif related_resources:
+                related_res = related_resources[0]
+                relationships[relationship_name] = {"data": {"type": related_res["type"], "id": related_res["id"]}}
 
         if relationships:
-            resource.relationships = relationships
+            resource["relationships"] = relationships
 
         return resource
 
     @staticmethod
-    def _is_related_to_resource(data: Any, resource: JsonApiResource, config: RelationshipConfig) -> bool:
-        if not hasattr(data, config.local_key):
-            return False
-
-        local_value = getattr(data, config.local_key)
-        foreign_key_value = to_camel(config.foreign_key)
-        if hasattr(resource, "attributes") and foreign_key_value in resource.attributes:
-            return str(resource.attributes[foreign_key_value]) == str(local_value)
-
-        return False
-
-    @staticmethod
-    def _find_related_resource(
-        data: Any, resources: list[JsonApiResource], config: RelationshipConfig
-    ) -> JsonApiResource | None:
-        if not hasattr(data, config.local_key):
-            return None
-
-        local_value = str(getattr(data, config.local_key))
-        for resource in resources:
-            if resource.id == local_value:
-                return resource
-
-        return None
+    def data_to_resource(data: Any, resource_type: str | None = None) -> JsonApiResource:
+        return JsonApiResource(**ResponseBaseModel.to_resource(data, resource_type))
 
     @staticmethod
-    def data_to_resource(data: Any, resource_type: str | None = None) -> JsonApiResource:
+    def to_resource(data: Any, resource_type: str | None = None, fields: set[str] | None = None) -> dict[str, Any]:
+        # plain dict with the shape of JsonApiResource, serialised without building the model
         if resource_type is None:
             resource_type = data.__class__.__name__
-        return JsonApiResource(
-            type=resource_type,
-            id=str(data.id if hasattr(data, "id") else ""),
-            attributes=data.to_dict(camel=True)
-            if hasattr(data, "to_dict")
-            else data.model_dump(by_alias=True)
-            if hasattr(data, "model_dump")
-            else data,
-        )
+        if hasattr(data, "to_dict"):
+            attributes = data.to_dict(camel=True, fields=fields)
+        elif hasattr(data, "model_dump"):
+            attributes = data.model_dump(by_alias=True)
+            if fields is not None:
+                attributes = {key: value for key, value in attributes.items() if key in fields}
+        else:
+            attributes = data
+        return {
+            "type": resource_type,
+            "id": str(data.id if hasattr(data, "id") else ""),
+            "attributes": attributes,
+            "relationships": None,
+        }
@@ -0,0 +1,16 @@
+from typing import Any
+
+from uvicorn_worker import UvicornWorker  # type: ignore
+
+from src.core.settings.setting import app_config
+
+
+class AppUvicornWorker(UvicornWorker):
+    # gunicorn builds the uvicorn config, so the WebSocket protocol options are passed through the worker class
+    CONFIG_KWARGS: dict[str, Any] = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "ws_per_message_deflate": app_config.ws_per_message_deflate,
+        # protocol level pings, answered by every client library, close dead peers without app frames
+        "ws_ping_interval": app_config.ws_ping_interval or None,
+        "ws_ping_timeout": app_config.ws_ping_timeout or None,
+    }
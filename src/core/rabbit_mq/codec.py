@@ -0,0 +1,128 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, ClassVar
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+try:
+    import msgpack  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None  # type: ignore
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+ZSTD_ENCODING = "zstd"
+
+
+class MessageCodec(ABC):
+    content_type: ClassVar[str]
+
+    @abstractmethod
+    def encode(self, payload: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, body: bytes) -> Any:
+        pass
+
+
+class JsonCodec(MessageCodec):
+    content_type = JSON_CONTENT_TYPE
+
+    def encode(self, payload: Any) -> bytes:
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+    def decode(self, body: bytes) -> Any:
+        return json.loads(body)
+
+
+class OrjsonCodec(MessageCodec):
+    content_type = JSON_CONTENT_TYPE
+
+    def encode(self, payload: Any) -> bytes:
+        return orjson.dumps(payload)
+
+    def decode(self, body: bytes) -> Any:
+        return orjson.loads(body)
+
+
+class MsgpackCodec(MessageCodec):
+    content_type = MSGPACK_CONTENT_TYPE
+
+    def encode(self, payload: Any) -> bytes:
+        return msgpack.packb(payload, use_bin_type=True)  # type: ignore
+
+    def decode(self, body: bytes) -> Any:
+        return msgpack.unpackb(body, raw=False)
+
+
+class ZstdCompressor:
+    encoding = ZSTD_ENCODING
+
+    def __init__(self, level: int = 3) -> None:
+        if zstandard is None:
+            raise RuntimeError("🛑 zstd compression requires the 'zstandard' package")
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, body: bytes) -> bytes:
+        return self._compressor.compress(body)
+
+    def decompress(self, body: bytes) -> bytes:
+        return self._decompressor.decompress(body)
+
+
+class CodecRegistry:
+    def __init__(self, content_type: str | None = None, compression: str | None = None) -> None:
+        self._codecs: dict[str, MessageCodec] = {}
+        self._compressors: dict[str, ZstdCompressor] = {}
+        self.register(OrjsonCodec() if orjson is not None else JsonCodec())
+        if msgpack is not None:
+            self.register(MsgpackCodec())
+        if zstandard is not None:
+            self.register_compressor(ZstdCompressor())
+        # the configured codec and compressor are resolved here, so a missing package fails at startup, not per send
+        self.codec(content_type)
+        if compression:
+            self.compressor(compression)
+
+    def register(self, codec: MessageCodec) -> None:
+        self._codecs[codec.content_type] = codec
+
+    def register_compressor(self, compressor: ZstdCompressor) -> None:
+        self._compressors[compressor.encoding] = compressor
+
+    def codec(self, content_type: str | None) -> MessageCodec:
+        # content type parameters such as "; charset=utf-8" do not change the codec
+        key = (content_type or JSON_CONTENT_TYPE).split(";", 1)[0].strip().lower()
+        codec = self._codecs.get(key)
+        if codec is None:
+            raise ValueError(f"🛑 Unsupported message content type: {content_type}")
+        return codec
+
+    def compressor(self, encoding: str) -> ZstdCompressor:
+        compressor = self._compressors.get(encoding)
+        if compressor is None:
+            raise ValueError(f"🛑 Unsupported message content encoding: {encoding}")
+        return compressor
+
+    def encode(
+        self, payload: Any, content_type: str, compression: str | None = None, threshold: int = 0
+    ) -> tuple[bytes, str | None]:
+        body = self.codec(content_type).encode(payload)
+        if compression and len(body) >= threshold:
+            return self.compressor(compression).compress(body), compression
+        return body, None
+
+    def decode(self, body: bytes, content_type: str | None, content_encoding: str | None = None) -> Any:
+        if content_encoding and content_encoding != "identity":
+            body = self.compressor(content_encoding).decompress(body)
+        return self.codec(content_type).decode(body)
@@ -9,6 +9,23 @@ class RabbitMQConfig:
     url: str
     heartbeat: int = 600
     connection_timeout: int = 30
+    content_type: str = "application/json"
+    compression: str | None = None
+    compression_threshold: int = 4096
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 5
+    initial_delay_ms: int = 1000
+    multiplier: float = 2.0
+    max_delay_ms: int = 300_000
+
+    def delay_ms(self, attempt: int) -> int:
+        return min(int(self.initial_delay_ms * self.multiplier ** max(attempt - 1, 0)), self.max_delay_ms)
+
+    def delays_ms(self) -> list[int]:
+        return sorted({self.delay_ms(attempt) for attempt in range(1, self.max_attempts)})
 
 
 @dataclass
@@ -20,6 +37,12 @@ class ExchangeConfig:
     internal: bool = False
     arguments: dict[str, Any] | None = None
 
+    def retry_exchange(self) -> "ExchangeConfig":
+        return ExchangeConfig(name=f"{self.name}.retry", durable=self.durable, auto_delete=self.auto_delete)
+
+    def dead_letter_exchange(self) -> "ExchangeConfig":
+        return ExchangeConfig(name=f"{self.name}.dlx", durable=self.durable, auto_delete=self.auto_delete)
+
 
 @dataclass
 class QueueConfig:
@@ -28,3 +51,38 @@ class QueueConfig:
     exclusive: bool = False
     auto_delete: bool = False
     arguments: dict[str, Any] | None = None
+    routing_key: str | None = None
+    retry: RetryPolicy | None = None
+    dead_letter: bool = False
+    # unacked deliveries per consumer, handlers run concurrently up to this limit
+    prefetch_count: int = 1
+
+    @property
+    def binding_key(self) -> str:
+        return self.routing_key or self.name
+
+    def declare_arguments(self, exchange: ExchangeConfig) -> dict[str, Any] | None:
+        arguments = dict(self.arguments or {})
+        if self.dead_letter:
+            arguments["x-dead-letter-exchange"] = exchange.dead_letter_exchange().name
+            arguments["x-dead-letter-routing-key"] = self.binding_key
+        return arguments or None
+
+    def retry_queue_name(self, delay_ms: int) -> str:
+        return f"{self.name}.retry.{delay_ms}"
+
+    def retry_queue(self, exchange: ExchangeConfig, delay_ms: int) -> "QueueConfig":
+        # expired messages are dead-lettered back to the work exchange, which gives a delayed redelivery
+        return QueueConfig(
+            name=self.retry_queue_name(delay_ms),
+            durable=self.durable,
+            auto_delete=self.auto_delete,
+            arguments={
+                "x-message-ttl": delay_ms,
+                "x-dead-letter-exchange": exchange.name,
+                "x-dead-letter-routing-key": self.binding_key,
+            },
+        )
+
+    def dead_letter_queue(self) -> "QueueConfig":
+        return QueueConfig(name=f"{self.name}.dlq", durable=self.durable, auto_delete=self.auto_delete)
@@ -0,0 +1,28 @@
+import asyncio
+from typing import cast
+from urllib.parse import urlparse
+
+import aio_pika
+from aio_pika.abc import AbstractConnection
+
+from src.core.rabbit_mq.config import RabbitMQConfig
+from src.core.rabbit_mq.memory import MemoryBroker, MemoryConnection
+
+MEMORY_SCHEME = "memory"
+
+
+def is_memory_url(url: str) -> bool:
+    return urlparse(url).scheme == MEMORY_SCHEME
+
+
+async def connect(config: RabbitMQConfig, loop: asyncio.AbstractEventLoop | None = None) -> AbstractConnection:
+    # memory://<name> keeps exchanges and queues inside the process, shared by every connection with the same name
+    if is_memory_url(config.url):
+        return cast(AbstractConnection, MemoryConnection(MemoryBroker.get(config.url)))
+
+    return await aio_pika.connect_robust(
+        url=config.url,
+        heartbeat=config.heartbeat,
+        connection_timeout=config.connection_timeout,
+        loop=loop,
+    )
@@ -1,26 +1,34 @@
 import asyncio
-import json
 import time
 import traceback
+from typing import Any
 
-import aio_pika
-from aio_pika import ExchangeType
-from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractIncomingMessage
+from aio_pika import DeliveryMode, Message
+from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractExchange, AbstractIncomingMessage
 
 from src.core.log.log import Log
-from src.core.rabbit_mq.config import RabbitMQConfig
-from src.core.rabbit_mq.data import MessageContext, ProcessingResult
+from src.core.rabbit_mq.codec import JSON_CONTENT_TYPE, CodecRegistry
+from src.core.rabbit_mq.config import ExchangeConfig, QueueConfig, RabbitMQConfig
+from src.core.rabbit_mq.connection import connect
+from src.core.rabbit_mq.data import ATTEMPT_HEADER, MessageContext, ProcessingResult
 from src.core.rabbit_mq.message_handler import MessageHandler
+from src.core.rabbit_mq.metrics import ActionMetrics
+from src.core.rabbit_mq.topology import declare_dead_letter, declare_retry_queues, declare_work_queue
 from src.core.service.statistics import render_statistics
 
 
 class AsyncRabbitMQConsumer:
-    def __init__(self, config: RabbitMQConfig, log: Log) -> None:
+    def __init__(self, config: RabbitMQConfig, codecs: CodecRegistry, log: Log) -> None:
         self.config = config
+        self.codecs = codecs
         self.logger = log
         self._conn: AbstractConnection | None = None
         self._channel: dict[str, AbstractChannel] = {}
         self._handlers: dict[str, MessageHandler] = {}
+        self._dispatch: dict[str, MessageHandler] = {}
+        self._metrics: dict[str, ActionMetrics] = {}
+        self._queues: dict[str, QueueConfig] = {}
+        self._retry_exchanges: dict[str, AbstractExchange] = {}
         self._is_initialized = False
         self._running = False
         self._shutdown_event = asyncio.Event()
@@ -33,12 +41,7 @@ class AsyncRabbitMQConsumer:
             return
 
         try:
-            self._conn = await aio_pika.connect_robust(
-                url=self.config.url,
-                heartbeat=self.config.heartbeat,
-                connection_timeout=self.config.connection_timeout,
-                loop=loop,
-            )
+            self._conn = await connect(self.config, loop=loop)
             self._is_initialized = True
             self.logger.info("🚀 RabbitMQ consumer initialized successfully")
         except Exception as e:
@@ -58,18 +61,35 @@ class AsyncRabbitMQConsumer:
 
         self._is_initialized = False
         self._channel.clear()
+        self._retry_exchanges.clear()
         self.logger.info("🚦 RabbitMQ consumer closed")
 
     def register_handler(self, handler: MessageHandler) -> None:
         handler_name = handler.__class__.__name__
+        if not handler.actions:
+            raise ValueError(f"🛑 RabbitMQ handler {handler_name} does not declare any actions")
+        for action in handler.actions:
+            registered = self._dispatch.get(action)
+            if registered is not None and registered is not handler:
+                raise ValueError(
+                    f"🛑 RabbitMQ action '{action}' of {handler_name} is already handled by {registered.__class__.__name__}"
+                )
+
         self._handlers[handler_name] = handler
-        self.logger.info(f"📨 RabbitMQ consumer registered handler: {handler_name}")
+        for action in handler.actions:
+            self._dispatch[action] = handler
+            self._metrics.setdefault(action, ActionMetrics())
+        self.logger.info(f"📨 RabbitMQ consumer registered handler: {handler_name}, actions: {list(handler.actions)}")
 
     def get_handler(self, action: str) -> MessageHandler | None:
-        for handler in self._handlers.values():
-            if handler.can_handle(action):
-                return handler
-        return None
+        return self._dispatch.get(action)
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        return {action: metrics.to_dict() for action, metrics in self._metrics.items()}
+
+    def _retry_delays(self, queue: QueueConfig) -> list[int]:
+        policies = [queue.retry] + [handler.retry_policy for handler in self._handlers.values()]
+        return sorted({delay for policy in policies if policy is not None for delay in policy.delays_ms()})
 
     async def _create_channel(self, queue_name: str) -> AbstractChannel:
         if not self._conn:
@@ -82,21 +102,24 @@ class AsyncRabbitMQConsumer:
 
     async def _parse_message(self, message: AbstractIncomingMessage, queue_name: str) -> MessageContext:
         try:
-            body = message.body.decode("utf-8")
-            payload = json.loads(body)
+            payload = self.codecs.decode(
+                message.body, content_type=message.content_type, content_encoding=message.content_encoding
+            )
             action = payload.get("action")
             if not action:
                 raise ValueError("🛑 Action not found in message")
 
+            headers = dict(message.headers) if message.headers else {}
             return MessageContext(
                 action=action,
                 payload=payload,
-                headers=dict(message.headers) if message.headers else {},
+                headers=headers,
                 routing_key=message.routing_key or "",
                 queue_name=queue_name,
                 delivery_tag=message.delivery_tag or 0,
                 redelivered=message.redelivered or False,
                 timestamp=message.timestamp or None,
+                attempt=int(headers.get(ATTEMPT_HEADER, 0)),  # type: ignore
             )
         except Exception as e:
             self.logger.error(f"🛑 Failed to parse message: {e}")
@@ -114,18 +137,34 @@ class AsyncRabbitMQConsumer:
                 return
 
             self.logger.info(f"🪢🐇 Consumer start process message: {context.to_str()}")
-            result = await handler.handle(context)
+            metrics = self._metrics[context.action]
+            if context.timestamp is not None:
+                metrics.observe_wait(max(0.0, time.time() - context.timestamp.timestamp()))
+            handle_start = time.perf_counter()
+            try:
+                result = await handler.handle(context)
+            except Exception:
+                metrics.failed += 1
+                raise
+            finally:
+                metrics.observe(time.perf_counter() - handle_start)
+
             if result == ProcessingResult.SUCCESS:
+                metrics.processed += 1
                 await message.ack()
                 self.logger.info(
                     f"🧩🐇 Consumer processed message successfully: {context.to_str()}, {render_statistics(start_time=start_time)}"
                 )
             elif result == ProcessingResult.RETRY:
-                self.logger.info(
-                    f"♻️🐇 Consumer message requeued for retry: {context.to_str()}, {render_statistics(start_time=start_time)}"
-                )
-                await message.reject(requeue=True)
+                if await self._retry(message=message, context=context, handler=handler, start_time=start_time):
+                    metrics.retried += 1
+                else:
+                    metrics.dead_lettered += 1
+            elif result == ProcessingResult.DEFER:
+                metrics.deferred += 1
+                await self._retry(message=message, context=context, handler=handler, start_time=start_time, defer=True)
             else:
+                metrics.failed += 1
                 self.logger.info(
                     f"🚫🐇 Consumer message rejected: {context.to_str()}, {render_statistics(start_time=start_time)}"
                 )
@@ -137,39 +176,101 @@ class AsyncRabbitMQConsumer:
             )
             await message.reject(requeue=False)
 
-    async def consume(
+    async def _retry(
         self,
-        queue_name: str,
-        exchange_name: str,
-        durable: bool = True,
-        exclusive: bool = False,
-        auto_delete: bool = False,
-    ) -> None:
+        message: AbstractIncomingMessage,
+        context: MessageContext,
+        handler: MessageHandler,
+        start_time: float,
+        defer: bool = False,
+    ) -> bool:
+        # False when the message ran out of attempts and was dead-lettered instead
+        queue = self._queues.get(context.queue_name)
+        policy = handler.retry_policy or (queue.retry if queue else None)
+        retry_exchange = self._retry_exchanges.get(context.queue_name)
+        if queue is None or policy is None or retry_exchange is None:
+            self.logger.info(
+                f"♻️🐇 Consumer message requeued for retry: {context.to_str()}, {render_statistics(start_time=start_time)}"
+            )
+            channel = self._channel.get(context.queue_name)
+            if context.retry_payload is None or channel is None:
+                await message.reject(requeue=True)
+                return True
+            # a narrowed payload cannot be requeued as is, it goes back to the queue as a new message
+            await channel.default_exchange.publish(
+                self._retry_message(message, context, context.attempt), routing_key=context.queue_name
+            )
+            await message.ack()
+            return True
+
+        if defer:
+            # a deferred message keeps its attempt count, so waiting alone never dead-letters it
+            attempt = context.attempt
+            delay_ms = self._defer_delay_ms(queue, context.retry_delay_ms)
+        else:
+            attempt = context.attempt + 1
+            if attempt >= policy.max_attempts:
+                self.logger.info(
+                    f"🪦🐇 Consumer message exhausted {policy.max_attempts} attempts, dead-lettered: {context.to_str()}, {render_statistics(start_time=start_time)}"
+                )
+                await message.reject(requeue=False)
+                return False
+            delay_ms = policy.delay_ms(attempt)
+
+        await retry_exchange.publish(
+            self._retry_message(message, context, attempt), routing_key=queue.retry_queue_name(delay_ms)
+        )
+        await message.ack()
+        self.logger.info(
+            f"♻️🐇 Consumer message {'deferred' if defer else 'scheduled for retry'} for {delay_ms} ms: {context.to_str()}, {render_statistics(start_time=start_time)}"
+        )
+        return True
+
+    def _defer_delay_ms(self, queue: QueueConfig, wait_ms: int | None) -> int:
+        # only the declared delay queues exist, take the shortest one that covers the wait
+        delays_ms = self._retry_delays(queue)
+        if wait_ms is None:
+            return delays_ms[0]
+        return next((delay_ms for delay_ms in delays_ms if delay_ms >= wait_ms), delays_ms[-1])
+
+    def _retry_message(self, message: AbstractIncomingMessage, context: MessageContext, attempt: int) -> Message:
+        body, content_encoding = message.body, message.content_encoding
+        if context.retry_payload is not None:
+            body, content_encoding = self.codecs.encode(
+                context.retry_payload,
+                content_type=message.content_type or JSON_CONTENT_TYPE,
+                compression=self.config.compression,
+                threshold=self.config.compression_threshold,
+            )
+        return Message(
+            body,
+            headers={**context.headers, ATTEMPT_HEADER: attempt},
+            content_type=message.content_type,
+            content_encoding=content_encoding,
+            delivery_mode=message.delivery_mode or DeliveryMode.PERSISTENT,
+            priority=message.priority,
+            timestamp=message.timestamp,
+        )
+
+    async def consume(self, queue: QueueConfig, exchange: ExchangeConfig) -> None:
         if not self._is_initialized or not self._conn:
             raise RuntimeError("🛑 RabbitMQ consumer is not initialized")
+        queue_name = queue.name
         try:
             async with self._conn:
                 channel = await self._conn.channel()  # type: ignore
-                await channel.set_qos(prefetch_count=1)
-
-                exchange = await channel.declare_exchange(
-                    name=exchange_name,
-                    type=ExchangeType.DIRECT,
-                    durable=durable,
-                    auto_delete=auto_delete,
-                    internal=False,
-                )
-
-                queue = await channel.declare_queue(
-                    queue_name,
-                    durable=durable,
-                    exclusive=exclusive,
-                    auto_delete=auto_delete,
-                )
+                await channel.set_qos(prefetch_count=queue.prefetch_count)
+                self._channel[queue_name] = channel
+                self._queues[queue_name] = queue
 
-                await queue.bind(exchange, queue_name)
+                _, work_queue = await declare_work_queue(channel, queue, exchange)
+                if queue.dead_letter:
+                    await declare_dead_letter(channel, queue, exchange)
+                delays_ms = self._retry_delays(queue)
+                if delays_ms:
+                    self._retry_exchanges[queue_name] = await declare_retry_queues(channel, queue, exchange, delays_ms)
 
-                await queue.consume(lambda message: self._process_message(message, queue_name), no_ack=False)
+                await work_queue.consume(lambda message: self._process_message(message, queue_name), no_ack=False)
 
                 self._running = True
                 self.logger.info(f"🚀 RabbitMQ consumer started consuming messages from queue: {queue_name}")
@@ -3,11 +3,15 @@ from datetime import datetime
 from enum import Enum
 from typing import Any
 
+ATTEMPT_HEADER = "x-attempt"
+
 
 class ProcessingResult(Enum):
     SUCCESS = "success"
     RETRY = "retry"
     REJECT = "reject"
+    # redelivered after a delay without spending an attempt, e.g. a rate limited send that never failed
+    DEFER = "defer"
 
 
 @dataclass
@@ -20,6 +24,11 @@ class MessageContext:
     delivery_tag: int
     redelivered: bool
     timestamp: datetime | None = None
+    attempt: int = 0
+    # set by a handler before it returns RETRY to retry a narrower payload, e.g. only the undelivered recipients
+    retry_payload: dict[str, Any] | None = None
+    # set with DEFER to pick the shortest delay queue that covers it, e.g. the throttle wait
+    retry_delay_ms: int | None = None
 
     def to_str(self) -> str:
-        return f"Action: {self.action}, Payload: {self.payload}"
+        return f"Action: {self.action}, Payload: {self.payload}, Attempt: {self.attempt}"
@@ -0,0 +1,412 @@
+import asyncio
+import itertools
+import uuid
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, ClassVar
+from urllib.parse import urlparse
+
+from aio_pika import ExchangeType
+from aio_pika.abc import AbstractMessage
+
+
+class MemoryBrokerError(Exception):
+    pass
+
+
+@dataclass(eq=False)
+class MemoryEnvelope:
+    body: bytes
+    routing_key: str
+    exchange: str
+    headers: dict[str, Any] = field(default_factory=dict)
+    content_type: str | None = None
+    content_encoding: str | None = None
+    delivery_mode: int | None = None
+    priority: int | None = None
+    expiration: float | None = None
+    message_id: str | None = None
+    timestamp: datetime | None = None
+    redelivered: bool = False
+
+    @staticmethod
+    def from_message(message: AbstractMessage, exchange: str, routing_key: str) -> "MemoryEnvelope":
+        expiration = message.expiration
+        return MemoryEnvelope(
+            body=message.body,
+            routing_key=routing_key,
+            exchange=exchange,
+            headers=dict(message.headers or {}),
+            content_type=message.content_type,
+            content_encoding=message.content_encoding,
+            delivery_mode=int(message.delivery_mode) if message.delivery_mode is not None else None,
+            priority=message.priority,
+            expiration=float(expiration) if isinstance(expiration, int | float) else None,
+            message_id=message.message_id,
+            timestamp=message.timestamp,
+        )
+
+
+class MemoryIncomingMessage:
+    def __init__(
+        self, envelope: MemoryEnvelope, queue: "MemoryQueue", channel: "MemoryChannel", delivery_tag: int
+    ) -> None:
+        self.envelope = envelope
+        self.queue = queue
+        self.channel = channel
+        self.delivery_tag = delivery_tag
+        self.processed = False
+        self.body = envelope.body
+        self.headers = envelope.headers
+        self.content_type = envelope.content_type
+        self.content_encoding = envelope.content_encoding
+        self.delivery_mode = envelope.delivery_mode
+        self.priority = envelope.priority
+        self.expiration = envelope.expiration
+        self.message_id = envelope.message_id
+        self.timestamp = envelope.timestamp
+        self.routing_key = envelope.routing_key
+        self.exchange = envelope.exchange
+        self.redelivered = envelope.redelivered
+
+    def _settle(self) -> None:
+        if self.processed:
+            raise MemoryBrokerError(f"Message {self.delivery_tag} was already acknowledged")
+        self.processed = True
+        self.channel.settle(self)
+
+    async def ack(self, multiple: bool = False) -> None:
+        self._settle()
+        self.queue.dispatch()
+
+    async def reject(self, requeue: bool = False) -> None:
+        self._settle()
+        if requeue:
+            self.queue.requeue(self.envelope)
+        else:
+            self.queue.dead_letter(self.envelope, reason="rejected")
+        self.queue.dispatch()
+
+    async def nack(self, multiple: bool = False, requeue: bool = True) -> None:
+        await self.reject(requeue=requeue)
+
+
+@dataclass
+class MemoryConsumer:
+    tag: str
+    channel: "MemoryChannel"
+    callback: Callable[[MemoryIncomingMessage], Awaitable[Any]]
+    no_ack: bool
+
+
+class MemoryQueue:
+    def __init__(self, broker: "MemoryBroker", name: str, arguments: dict[str, Any] | None) -> None:
+        self.broker = broker
+        self.name = name
+        self.arguments = dict(arguments or {})
+        self.consumers: list[MemoryConsumer] = []
+        self._pending: deque[MemoryEnvelope] = deque()
+        self._timers: dict[int, asyncio.TimerHandle] = {}
+        self._next_consumer = 0
+
+    @property
+    def message_count(self) -> int:
+        return len(self._pending)
+
+    def _ttl(self, envelope: MemoryEnvelope) -> float | None:
+        ttls: list[float] = [] if envelope.expiration is None else [envelope.expiration]
+        if "x-message-ttl" in self.arguments:
+            ttls.append(self.arguments["x-message-ttl"] / 1000)
+        return min(ttls) if ttls else None
+
+    def put(self, envelope: MemoryEnvelope) -> None:
+        self._pending.append(envelope)
+        ttl = self._ttl(envelope)
+        if ttl is not None:
+            self._timers[id(envelope)] = asyncio.get_running_loop().call_later(ttl, self._expire, envelope)
+        self.dispatch()
+
+    def requeue(self, envelope: MemoryEnvelope) -> None:
+        self._pending.appendleft(replace(envelope, redelivered=True))
+
+    def _expire(self, envelope: MemoryEnvelope) -> None:
+        self._timers.pop(id(envelope), None)
+        try:
+            self._pending.remove(envelope)
+        except ValueError:
+            return
+        self.dead_letter(envelope, reason="expired")
+
+    def dead_letter(self, envelope: MemoryEnvelope, reason: str) -> None:
+        exchange = self.arguments.get("x-dead-letter-exchange")
+        if exchange is None:
+            return
+        routing_key = self.arguments.get("x-dead-letter-routing-key", envelope.routing_key)
+        deaths = list(envelope.headers.get("x-death", []))
+        deaths.insert(0, {"queue": self.name, "reason": reason, "exchange": envelope.exchange, "count": 1})
+        self.broker.route(
+            exchange,
+            replace(
+                envelope,
+                headers={**envelope.headers, "x-death": deaths},
+                exchange=exchange,
+                routing_key=routing_key,
+                expiration=None,
+                redelivered=False,
+            ),
+        )
+
+    def dispatch(self) -> None:
+        while self._pending and self.consumers:
+            consumer = self._pick_consumer()
+            if consumer is None:
+                return
+            envelope = self._pending.popleft()
+            timer = self._timers.pop(id(envelope), None)
+            if timer is not None:
+                timer.cancel()
+            consumer.channel.deliver(consumer, self, envelope)
+
+    def _pick_consumer(self) -> MemoryConsumer | None:
+        for _ in range(len(self.consumers)):
+            consumer = self.consumers[self._next_consumer % len(self.consumers)]
+            self._next_consumer += 1
+            if consumer.no_ack or consumer.channel.has_capacity():
+                return consumer
+        return None
+
+
+class MemoryBroker:
+    _instances: ClassVar[dict[str, "MemoryBroker"]] = {}
+
+    def __init__(self) -> None:
+        self.exchanges: dict[str, ExchangeType] = {"": ExchangeType.DIRECT}
+        self.bindings: dict[str, list[tuple[str, str]]] = {"": []}
+        self.queues: dict[str, MemoryQueue] = {}
+
+    @classmethod
+    def get(cls, url: str) -> "MemoryBroker":
+        parsed = urlparse(url)
+        key = f"{parsed.netloc}{parsed.path}"
+        if key not in cls._instances:
+            cls._instances[key] = MemoryBroker()
+        return cls._instances[key]
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._instances.clear()
+
+    def declare_exchange(self, name: str, exchange_type: ExchangeType) -> None:
+        declared = self.exchanges.get(name)
+        if declared is not None and declared != exchange_type:
+            raise MemoryBrokerError(f"PRECONDITION_FAILED - exchange '{name}' declared as {declared.value}")
+        self.exchanges[name] = exchange_type
+        self.bindings.setdefault(name, [])
+
+    def declare_queue(self, name: str, arguments: dict[str, Any] | None) -> MemoryQueue:
+        queue = self.queues.get(name)
+        if queue is not None:
+            if queue.arguments != dict(arguments or {}):
+                raise MemoryBrokerError(f"PRECONDITION_FAILED - queue '{name}' declared with other arguments")
+            return queue
+        queue = MemoryQueue(broker=self, name=name, arguments=arguments)
+        self.queues[name] = queue
+        return queue
+
+    def delete_queue(self, name: str) -> None:
+        self.queues.pop(name, None)
+        for bindings in self.bindings.values():
+            bindings[:] = [(queue, key) for queue, key in bindings if queue != name]
+
+    def bind(self, queue: str, exchange: str, routing_key: str) -> None:
+        if exchange not in self.exchanges:
+            raise MemoryBrokerError(f"NOT_FOUND - no exchange '{exchange}'")
+        if (queue, routing_key) not in self.bindings[exchange]:
+            self.bindings[exchange].append((queue, routing_key))
+
+    def unbind(self, queue: str, exchange: str, routing_key: str) -> None:
+        if (queue, routing_key) in self.bindings.get(exchange, []):
+            self.bindings[exchange].remove((queue, routing_key))
+
+    def route(self, exchange: str, envelope: MemoryEnvelope) -> int:
+        if exchange == "":
+            targets = [envelope.routing_key] if envelope.routing_key in self.queues else []
+        else:
+            exchange_type = self.exchanges.get(exchange)
+            if exchange_type is None:
+                raise MemoryBrokerError(f"NOT_FOUND - no exchange '{exchange}'")
+            targets = [
+                queue
+                for queue, key in self.bindings[exchange]
+                if MemoryBroker._matches(exchange_type, key, envelope.routing_key)
+            ]
+
+        for name in dict.fromkeys(targets):
+            queue = self.queues.get(name)
+            if queue is not None:
+                queue.put(replace(envelope, headers=dict(envelope.headers)))
+        return len(targets)
+
+    @staticmethod
+    def _matches(exchange_type: ExchangeType, binding_key: str, routing_key: str) -> bool:
+        if exchange_type == ExchangeType.FANOUT:
+            return True
+        if exchange_type == ExchangeType.TOPIC:
+            return MemoryBroker._topic_matches(binding_key.split("."), routing_key.split("."))
+        return binding_key == routing_key
+
+    @staticmethod
+    def _topic_matches(pattern: list[str], words: list[str]) -> bool:
+        if not pattern:
+            return not words
+        head, rest = pattern[0], pattern[1:]
+        if head == "#":
+            return any(MemoryBroker._topic_matches(rest, words[i:]) for i in range(len(words) + 1))
+        if not words:
+            return False
+        return head in ("*", words[0]) and MemoryBroker._topic_matches(rest, words[1:])
+
+
+class MemoryExchange:
+    def __init__(self, channel: "MemoryChannel", name: str) -> None:
+        self.channel = channel
+        self.broker = channel.broker
+        self.name = name
+
+    async def publish(self, message: AbstractMessage, routing_key: str, mandatory: bool = True, **kwargs: Any) -> None:
+        envelope = MemoryEnvelope.from_message(message, exchange=self.name, routing_key=routing_key)
+        # like aio-pika, a returned message only raises on channels opened with on_return_raises
+        if not self.broker.route(self.name, envelope) and mandatory and self.channel.on_return_raises:
+            raise MemoryBrokerError(f"NO_ROUTE - message to '{self.name}' with key '{routing_key}' returned")
+
+
+class MemoryQueueHandle:
+    def __init__(self, channel: "MemoryChannel", queue: MemoryQueue) -> None:
+        self.channel = channel
+        self.queue = queue
+        self.name = queue.name
+
+    async def bind(self, exchange: MemoryExchange | str, routing_key: str | None = None, **kwargs: Any) -> None:
+        name = exchange if isinstance(exchange, str) else exchange.name
+        self.channel.broker.bind(self.name, name, routing_key or self.name)
+
+    async def unbind(self, exchange: MemoryExchange | str, routing_key: str | None = None, **kwargs: Any) -> None:
+        name = exchange if isinstance(exchange, str) else exchange.name
+        self.channel.broker.unbind(self.name, name, routing_key or self.name)
+
+    async def consume(
+        self, callback: Callable[[MemoryIncomingMessage], Awaitable[Any]], no_ack: bool = False, **kwargs: Any
+    ) -> str:
+        consumer = MemoryConsumer(
+            tag=f"ctag.{uuid.uuid4().hex}", channel=self.channel, callback=callback, no_ack=no_ack
+        )
+        self.queue.consumers.append(consumer)
+        self.channel.consumers.append((self.queue, consumer))
+        self.queue.dispatch()
+        return consumer.tag
+
+    async def cancel(self, consumer_tag: str, **kwargs: Any) -> None:
+        self.queue.consumers = [consumer for consumer in self.queue.consumers if consumer.tag != consumer_tag]
+
+    async def delete(self, **kwargs: Any) -> None:
+        self.channel.broker.delete_queue(self.name)
+
+
+class MemoryChannel:
+    def __init__(self, connection: "MemoryConnection", on_return_raises: bool = False) -> None:
+        self.connection = connection
+        self.broker = connection.broker
+        self.on_return_raises = on_return_raises
+        self.prefetch_count = 0
+        self.consumers: list[tuple[MemoryQueue, MemoryConsumer]] = []
+        self._unacked: dict[int, MemoryIncomingMessage] = {}
+        self._delivery_tags = itertools.count(1)
+        self._tasks: set[asyncio.Task] = set()
+        self.is_closed = False
+
+    async def set_qos(self, prefetch_count: int = 0, **kwargs: Any) -> None:
+        self.prefetch_count = prefetch_count
+
+    async def declare_exchange(
+        self, name: str, type: ExchangeType | str = ExchangeType.DIRECT, **kwargs: Any
+    ) -> MemoryExchange:
+        self.broker.declare_exchange(name, ExchangeType(type))
+        return MemoryExchange(self, name)
+
+    async def get_exchange(self, name: str, ensure: bool = True, **kwargs: Any) -> MemoryExchange:
+        if ensure and name not in self.broker.exchanges:
+            raise MemoryBrokerError(f"NOT_FOUND - no exchange '{name}'")
+        return MemoryExchange(self, name)
+
+    @property
+    def default_exchange(self) -> MemoryExchange:
+        return MemoryExchange(self, "")
+
+    async def declare_queue(
+        self, name: str | None = None, *, arguments: dict[str, Any] | None = None, **kwargs: Any
+    ) -> MemoryQueueHandle:
+        queue = self.broker.declare_queue(name or f"amq.gen-{uuid.uuid4().hex}", arguments)
+        return MemoryQueueHandle(self, queue)
+
+    def has_capacity(self) -> bool:
+        return not self.is_closed and (self.prefetch_count == 0 or len(self._unacked) < self.prefetch_count)
+
+    def deliver(self, consumer: MemoryConsumer, queue: MemoryQueue, envelope: MemoryEnvelope) -> None:
+        message = MemoryIncomingMessage(envelope, queue=queue, channel=self, delivery_tag=next(self._delivery_tags))
+        if consumer.no_ack:
+            message.processed = True
+        else:
+            self._unacked[message.delivery_tag] = message
+        task = asyncio.get_running_loop().create_task(consumer.callback(message))  # type: ignore
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def settle(self, message: MemoryIncomingMessage) -> None:
+        self._unacked.pop(message.delivery_tag, None)
+        for queue, _ in self.consumers:
+            if queue is not message.queue:
+                queue.dispatch()
+
+    async def close(self) -> None:
+        if self.is_closed:
+            return
+        self.is_closed = True
+        for queue, consumer in self.consumers:
+            queue.consumers = [other for other in queue.consumers if other is not consumer]
+        self.consumers.clear()
+        # like the broker, unacknowledged deliveries go back to their queues
+        for message in list(self._unacked.values()):
+            message.processed = True
+            message.queue.requeue(message.envelope)
+            message.queue.dispatch()
+        self._unacked.clear()
+
+
+class MemoryConnection:
+    def __init__(self, broker: MemoryBroker) -> None:
+        self.broker = broker
+        self._channels: list[MemoryChannel] = []
+        self.is_closed = False
+
+    async def channel(self, on_return_raises: bool = False, **kwargs: Any) -> MemoryChannel:
+        if self.is_closed:
+            raise MemoryBrokerError("Connection is closed")
+        channel = MemoryChannel(self, on_return_raises=on_return_raises)
+        self._channels.append(channel)
+        return channel
+
+    async def close(self, exc: BaseException | None = None) -> None:
+        if self.is_closed:
+            return
+        self.is_closed = True
+        for channel in self._channels:
+            await channel.close()
+        self._channels.clear()
+
+    async def __aenter__(self) -> "MemoryConnection":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
+from src.core.rabbit_mq.config import RetryPolicy
 from src.core.rabbit_mq.data import MessageContext, ProcessingResult
 
 if TYPE_CHECKING:
@@ -10,6 +11,11 @@ if TYPE_CHECKING:
 
 
 class MessageHandler(ABC):
+    # actions routed to this handler, indexed by the consumer at registration
+    actions: ClassVar[tuple[str, ...]] = ()
+    # overrides the queue retry policy for messages of this handler
+    retry_policy: RetryPolicy | None = None
+
     def __init__(
         self,
         container: Container,
@@ -21,6 +27,5 @@ class MessageHandler(ABC):
     async def handle(self, context: MessageContext) -> ProcessingResult:
         pass
 
-    @abstractmethod
     def can_handle(self, action: str) -> bool:
-        pass
+        return action in self.actions
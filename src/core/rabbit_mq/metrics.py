@@ -0,0 +1,53 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any
+
+LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# AMQP timestamps have one second resolution
+WAIT_BUCKETS: tuple[float, ...] = (1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+
+
+@dataclass
+class ActionMetrics:
+    processed: int = 0
+    failed: int = 0
+    retried: int = 0
+    # RETRY results that had no attempts left
+    dead_lettered: int = 0
+    deferred: int = 0
+    latency_sum: float = 0.0
+    # one counter per LATENCY_BUCKETS upper bound plus a trailing +Inf bucket
+    latency_buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    # time between publish and the start of processing, retry delays included
+    wait_count: int = 0
+    wait_sum: float = 0.0
+    wait_buckets: list[int] = field(default_factory=lambda: [0] * (len(WAIT_BUCKETS) + 1))
+
+    def observe(self, seconds: float) -> None:
+        self.latency_sum += seconds
+        self.latency_buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def observe_wait(self, seconds: float) -> None:
+        self.wait_count += 1
+        self.wait_sum += seconds
+        self.wait_buckets[bisect_left(WAIT_BUCKETS, seconds)] += 1
+
+    @property
+    def count(self) -> int:
+        return self.processed + self.failed + self.retried + self.dead_lettered + self.deferred
+
+    def to_dict(self) -> dict[str, Any]:
+        bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+        wait_bounds = [str(bound) for bound in WAIT_BUCKETS] + ["+Inf"]
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "deferred": self.deferred,
+            "latency_sum": round(self.latency_sum, 6),
+            "latency_avg": round(self.latency_sum / self.count, 6) if self.count else 0.0,
+            "latency_buckets": dict(zip(bounds, self.latency_buckets, strict=True)),
+            "wait_avg": round(self.wait_sum / self.wait_count, 3) if self.wait_count else 0.0,
+            "wait_buckets": dict(zip(wait_bounds, self.wait_buckets, strict=True)),
+        }
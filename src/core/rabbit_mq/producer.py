@@ -1,25 +1,28 @@
 import asyncio
-import json
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Any
 
-import aio_pika
-from aio_pika import DeliveryMode, ExchangeType, Message
-from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractQueue
+from aio_pika import DeliveryMode, Message
+from aio_pika.abc import AbstractChannel, AbstractConnection
 
 from src.core.log.log import Log
-from src.core.rabbit_mq.config import RabbitMQConfig
+from src.core.rabbit_mq.codec import JSON_CONTENT_TYPE, CodecRegistry
+from src.core.rabbit_mq.config import ExchangeConfig, QueueConfig, RabbitMQConfig
+from src.core.rabbit_mq.connection import connect
+from src.core.rabbit_mq.topology import declare_work_queue
 
 
 class AsyncRabbitMQProducer:
     def __init__(
         self,
         config: RabbitMQConfig,
+        codecs: CodecRegistry,
         log: Log,
     ) -> None:
         self.config = config
+        self.codecs = codecs
         self.logger = log
         self._conn: AbstractConnection | None = None
         self._is_initialized = False
@@ -29,11 +32,7 @@ class AsyncRabbitMQProducer:
             return
 
         try:
-            self._conn = await aio_pika.connect_robust(
-                url=self.config.url,
-                heartbeat=self.config.heartbeat,
-                connection_timeout=self.config.connection_timeout,
-            )
+            self._conn = await connect(self.config)
             self._is_initialized = True
             self.logger.info("🚀 RabbitMQ producer initialized successfully")
         except Exception as e:
@@ -51,68 +50,104 @@ class AsyncRabbitMQProducer:
         return bool(self._is_initialized and self._conn and not self._conn.is_closed)
 
     @asynccontextmanager
-    async def get_channel(self) -> AsyncGenerator[AbstractChannel]:
+    async def get_channel(self, on_return_raises: bool = False) -> AsyncGenerator[AbstractChannel]:
         if not self.is_connected:
             raise RuntimeError("🛑 Producer not initialized or connection lost")
 
-        channel = await self._conn.channel()  # type: ignore
+        channel = await self._conn.channel(on_return_raises=on_return_raises)  # type: ignore
         try:
             yield channel
         finally:
             await channel.close()
 
+    def build_message(
+        self,
+        message: dict[str, Any] | str | bytes,
+        action: str | None = None,
+        durable: bool = True,
+        priority: int = 0,
+        expiration: int | None = None,
+        headers: dict[str, Any] | None = None,
+        content_type: str | None = None,
+    ) -> Message:
+        content_encoding = None
+        if isinstance(message, dict):
+            if action is not None:
+                message["action"] = action
+            content_type = content_type or self.config.content_type
+            body, content_encoding = self.codecs.encode(
+                message,
+                content_type=content_type,
+                compression=self.config.compression,
+                threshold=self.config.compression_threshold,
+            )
+        elif isinstance(message, str):
+            body = message.encode("utf-8")
+        else:
+            body = message
+
+        return Message(
+            body,
+            delivery_mode=DeliveryMode.PERSISTENT if durable else DeliveryMode.NOT_PERSISTENT,
+            priority=priority,
+            content_type=content_type or JSON_CONTENT_TYPE,
+            content_encoding=content_encoding,
+            headers=headers or {},
+            expiration=expiration,
+            timestamp=datetime.now(UTC),
+        )
+
+    async def declare(self, queue: QueueConfig, exchange: ExchangeConfig) -> None:
+        async with self.get_channel() as channel:
+            await declare_work_queue(channel, queue, exchange)
+
+    async def publish_batch(self, messages: list[tuple[str, str, Message]]) -> list[bool]:
+        # (exchange, routing key, message); every publish waits for its broker confirm and an unroutable
+        # message is returned (mandatory) and raised (on_return_raises), so True means a queue accepted it
+        async with self.get_channel(on_return_raises=True) as channel:
+            exchanges = {name: await channel.get_exchange(name, ensure=False) for name, _, _ in messages}
+            results = await asyncio.gather(
+                *[
+                    exchanges[exchange].publish(msg, routing_key=routing_key, mandatory=True)
+                    for exchange, routing_key, msg in messages
+                ],
+                return_exceptions=True,
+            )
+
+        for result in results:
+            if isinstance(result, BaseException):
+                self.logger.error(f"🛑 Failed to publish batch message: {result}")
+        self.logger.info(f"✉️ Published batch of {len(messages)} messages")
+        return [not isinstance(result, BaseException) for result in results]
+
     async def send_message(
         self,
-        queue_name: str,
+        queue: QueueConfig,
         message: dict[str, Any] | str | bytes,
-        exchange_name: str,
+        exchange: ExchangeConfig,
         action: str | None = None,
         routing_key: str | None = None,
         priority: int = 0,
         expiration: int | None = None,
         headers: dict[str, Any] | None = None,
-        durable: bool = True,
-        content_type: str = "application/json",
+        content_type: str | None = None,
     ) -> bool:
+        queue_name = queue.name
         try:
             async with self.get_channel() as channel:
-                exchange = await channel.declare_exchange(
-                    name=exchange_name,
-                    type=ExchangeType.DIRECT,
-                    durable=durable,
-                    auto_delete=False,
-                    internal=False,
-                )
-
-                queue = await channel.declare_queue(
-                    name=queue_name,
-                    durable=True,
-                    exclusive=False,
-                    auto_delete=False,
-                )
-
-                await queue.bind(exchange, routing_key=routing_key or queue_name)
-
-                if isinstance(message, dict):
-                    if action is not None:
-                        message["action"] = action
-                    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
-                elif isinstance(message, str):
-                    body = message.encode("utf-8")
-                else:
-                    body = message
+                work_exchange, _ = await declare_work_queue(channel, queue, exchange)
 
-                msg = Message(
-                    body,
-                    delivery_mode=DeliveryMode.PERSISTENT if durable else DeliveryMode.NOT_PERSISTENT,
+                msg = self.build_message(
+                    message,
+                    action=action,
+                    durable=queue.durable,
                     priority=priority,
-                    content_type=content_type,
-                    headers=headers or {},
                     expiration=expiration,
-                    timestamp=datetime.now(),
+                    headers=headers,
+                    content_type=content_type,
                 )
 
-                await exchange.publish(msg, routing_key=routing_key or queue_name)
+                await work_exchange.publish(msg, routing_key=routing_key or queue.binding_key)
 
                 self.logger.info(f"✉️ Message sent to queue '{queue_name}'")
                 return True
@@ -122,11 +157,11 @@ class AsyncRabbitMQProducer:
             return False
 
     async def send_batch_messages(
-        self, queue_name: str, messages: list[dict[str, Any] | str], **kwargs: Any
+        self, queue: QueueConfig, messages: list[dict[str, Any] | str], **kwargs: Any
     ) -> dict[str, int]:
         results = {"success": 0, "failed": 0}
 
-        tasks = [self.send_message(queue_name, message, **kwargs) for message in messages]
+        tasks = [self.send_message(queue, message, **kwargs) for message in messages]
 
         results_list = await asyncio.gather(*tasks, return_exceptions=True)
 
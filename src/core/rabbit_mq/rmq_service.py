@@ -1,6 +1,7 @@
 from src.cmd.worker.email.email_action import EmailAction
+from src.cmd.worker.email.email_queue import EMAIL_EXCHANGE, EMAIL_QUEUE
 from src.core.rabbit_mq.producer import AsyncRabbitMQProducer
-from src.core.service.email.email import EMessage
+from src.core.service.email.email import EBatchMessage, EMessage
 
 
 class RMQService:
@@ -9,8 +10,16 @@ class RMQService:
 
     async def send_email(self, message: EMessage) -> bool:
         return await self.producer.send_message(
-            queue_name="p_email",
+            queue=EMAIL_QUEUE,
             action=EmailAction.send_email.value,
             message=message.to_dict(),
-            exchange_name="p_email_exchange",
+            exchange=EMAIL_EXCHANGE,
+        )
+
+    async def send_batch_email(self, message: EBatchMessage) -> bool:
+        return await self.producer.send_message(
+            queue=EMAIL_QUEUE,
+            action=EmailAction.send_batch.value,
+            message=message.to_dict(),
+            exchange=EMAIL_EXCHANGE,
         )
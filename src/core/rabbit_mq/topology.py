@@ -0,0 +1,51 @@
+from aio_pika.abc import AbstractChannel, AbstractExchange, AbstractQueue
+
+from src.core.rabbit_mq.config import ExchangeConfig, QueueConfig
+
+
+async def declare_exchange(channel: AbstractChannel, config: ExchangeConfig) -> AbstractExchange:
+    return await channel.declare_exchange(
+        name=config.name,
+        type=config.type,
+        durable=config.durable,
+        auto_delete=config.auto_delete,
+        internal=config.internal,
+        arguments=config.arguments,
+    )
+
+
+async def declare_queue(channel: AbstractChannel, config: QueueConfig, exchange: ExchangeConfig) -> AbstractQueue:
+    return await channel.declare_queue(
+        name=config.name,
+        durable=config.durable,
+        exclusive=config.exclusive,
+        auto_delete=config.auto_delete,
+        arguments=config.declare_arguments(exchange),
+    )
+
+
+async def declare_work_queue(
+    channel: AbstractChannel, queue: QueueConfig, exchange: ExchangeConfig
+) -> tuple[AbstractExchange, AbstractQueue]:
+    work_exchange = await declare_exchange(channel, exchange)
+    work_queue = await declare_queue(channel, queue, exchange)
+    await work_queue.bind(work_exchange, routing_key=queue.binding_key)
+    return work_exchange, work_queue
+
+
+async def declare_dead_letter(channel: AbstractChannel, queue: QueueConfig, exchange: ExchangeConfig) -> None:
+    dlx_config = exchange.dead_letter_exchange()
+    dlx = await declare_exchange(channel, dlx_config)
+    dlq = await declare_queue(channel, queue.dead_letter_queue(), dlx_config)
+    await dlq.bind(dlx, routing_key=queue.binding_key)
+
+
+async def declare_retry_queues(
+    channel: AbstractChannel, queue: QueueConfig, exchange: ExchangeConfig, delays_ms: list[int]
+) -> AbstractExchange:
+    retry_config = exchange.retry_exchange()
+    retry_exchange = await declare_exchange(channel, retry_config)
+    for delay_ms in delays_ms:
+        retry_queue = await declare_queue(channel, queue.retry_queue(exchange, delay_ms), retry_config)
+        await retry_queue.bind(retry_exchange, routing_key=queue.retry_queue_name(delay_ms))
+    return retry_exchange
@@ -1,12 +1,13 @@
 import asyncio
 
 from src.core.log.log import Log
+from src.core.rabbit_mq.config import ExchangeConfig, QueueConfig
 from src.core.rabbit_mq.consumer import AsyncRabbitMQConsumer
 from src.core.rabbit_mq.message_handler import MessageHandler
 
 
 class RMWorker:
-    def __init__(self, consumer: AsyncRabbitMQConsumer, queue: str, exchange: str, log: Log) -> None:
+    def __init__(self, consumer: AsyncRabbitMQConsumer, queue: QueueConfig, exchange: ExchangeConfig, log: Log) -> None:
         self.consumer = consumer
         self.queue = queue
         self.exchange = exchange
@@ -20,14 +21,13 @@ class RMWorker:
 
     async def start(self) -> None:
         try:
-            await self.consumer.consume(
-                queue_name=self.queue, exchange_name=self.exchange, durable=True, exclusive=False, auto_delete=False
-            )
+            await self.consumer.consume(queue=self.queue, exchange=self.exchange)
         except Exception as e:
             self.logger.error(f"🛑 Failed to start RabbitMQ worker: {e}")
             await self.stop()
             raise
 
     async def stop(self) -> None:
+        self.logger.info("📊 RabbitMQ worker action metrics", metrics=self.consumer.metrics())
         await self.consumer.close()
         self.logger.info("🚦 RabbitMQ worker stopped successfully")
@@ -0,0 +1,119 @@
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.mime.base import MIMEBase
+from pathlib import Path
+
+# base64 turns every 57 input bytes into one 76 character line, so chunks stay line aligned
+CHUNK_SIZE = 57 * 1024
+
+CONTENT_TYPES: dict[str, tuple[str, str]] = {
+    ".jpg": ("image", "jpeg"),
+    ".jpeg": ("image", "jpeg"),
+    ".png": ("image", "png"),
+    ".gif": ("image", "gif"),
+    ".bmp": ("image", "bmp"),
+    ".pdf": ("application", "pdf"),
+    ".doc": ("application", "msword"),
+    ".docx": ("application", "msword"),
+    ".xls": ("application", "vnd.ms-excel"),
+    ".xlsx": ("application", "vnd.ms-excel"),
+}
+
+
+@dataclass(frozen=True)
+class EncodedAttachment:
+    digest: str
+    maintype: str
+    subtype: str
+    payload: str
+
+    def to_mime(self, filename: str) -> MIMEBase:
+        # a fresh part per message around the shared, already encoded payload
+        part = MIMEBase(self.maintype, self.subtype)
+        part.set_payload(self.payload)
+        part["Content-Transfer-Encoding"] = "base64"
+        part.add_header("Content-Disposition", f"attachment; filename= {filename}")
+        return part
+
+
+class AttachmentCache:
+    # the SMTP message is built in memory, so an attachment is held encoded (4/3 of the file) for every send;
+    # files that encode to more than max_bytes are not cached and are read and encoded again on each send
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._size = 0
+        self._index: dict[tuple[str, int, int], str] = {}
+        # reverse of _index, so an eviction only drops the keys of the evicted part
+        self._keys: dict[str, set[tuple[str, int, int]]] = {}
+        self._parts: OrderedDict[str, EncodedAttachment] = OrderedDict()
+        # encoding runs in worker threads
+        self._lock = threading.Lock()
+
+    def get(self, file: Path) -> EncodedAttachment:
+        stat = file.stat()
+        key = (str(file.resolve()), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            digest = self._index.get(key)
+            if digest is not None and digest in self._parts:
+                self._parts.move_to_end(digest)
+                return self._parts[digest]
+
+        if AttachmentCache._encoded_size(stat.st_size) > self.max_bytes:
+            return self._encode(file, digest=False)
+        attachment = self._encode(file)
+        with self._lock:
+            return self._store(key, attachment)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index.clear()
+            self._keys.clear()
+            self._parts.clear()
+            self._size = 0
+
+    def _store(self, key: tuple[str, int, int], attachment: EncodedAttachment) -> EncodedAttachment:
+        size = len(attachment.payload)
+        if size > self.max_bytes:
+            return attachment
+        self._index[key] = attachment.digest
+        self._keys.setdefault(attachment.digest, set()).add(key)
+        if attachment.digest in self._parts:
+            # same content under another path or mtime, keep and share the existing part
+            self._parts.move_to_end(attachment.digest)
+            return self._parts[attachment.digest]
+
+        self._parts[attachment.digest] = attachment
+        self._size += size
+        while self._size > self.max_bytes:
+            digest, evicted = self._parts.popitem(last=False)
+            self._size -= len(evicted.payload)
+            for evicted_key in self._keys.pop(digest, ()):
+                self._index.pop(evicted_key, None)
+        return attachment
+
+    @staticmethod
+    def _encoded_size(size: int) -> int:
+        # 4 characters per 3 input bytes plus a newline per started 57 byte line
+        return -(-size // 3) * 4 + -(-size // 57)
+
+    @staticmethod
+    def _encode(file: Path, digest: bool = True) -> EncodedAttachment:
+        maintype, subtype = CONTENT_TYPES.get(file.suffix.lower(), ("application", "octet-stream"))
+        # only cached parts are looked up by content
+        sha = hashlib.sha256() if digest else None
+        lines: list[bytes] = []
+        with open(file, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                if sha is not None:
+                    sha.update(chunk)
+                lines.append(base64.encodebytes(chunk))
+
+        return EncodedAttachment(
+            digest=sha.hexdigest() if sha is not None else "",
+            maintype=maintype,
+            subtype=subtype,
+            payload=b"".join(lines).decode("ascii"),
+        )
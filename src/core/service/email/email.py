@@ -6,14 +6,17 @@ from typing import Any
 class EMessage:
     to: str | list[str]
     subject: str
-    body: str
+    body: str = ""
     cc: list[str] = field(default_factory=list)
     bcc: list[str] = field(default_factory=list)
     attachments: list[str] = field(default_factory=list)
     body_type: str = "html"
+    # template mode: the email worker renders the body from these instead of shipping the html
+    template: str | None = None
+    context: dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
-        return {
+        data: dict[str, Any] = {
             "to": self.to,
             "subject": self.subject,
             "body": self.body,
@@ -22,3 +25,73 @@ class EMessage:
             "attachments": self.attachments,
             "body_type": self.body_type,
         }
+        if self.template is not None:
+            data["template"] = self.template
+            data["context"] = self.context
+        return data
+
+
+@dataclass
+class EBatchRecipient:
+    to: str
+    context: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "to": self.to,
+            "context": self.context,
+        }
+
+
+@dataclass
+class EBatchMessage:
+    template: str
+    subject: str
+    recipients: list[EBatchRecipient]
+    context: dict[str, Any] = field(default_factory=dict)
+    attachments: list[str] = field(default_factory=list)
+    body_type: str = "html"
+    batch_id: str | None = None
+    reply_to: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "template": self.template,
+            "subject": self.subject,
+            "recipients": [recipient.to_dict() for recipient in self.recipients],
+            "context": self.context,
+            "attachments": self.attachments,
+            "body_type": self.body_type,
+            "batch_id": self.batch_id,
+            "reply_to": self.reply_to,
+        }
+
+
+@dataclass
+class EBatchResult:
+    to: str
+    sent: bool
+    code: int | None = None
+    error: str | None = None
+    # failed before reaching the server for a reason a retry cannot fix, e.g. the template did not render
+    permanent: bool = False
+    # held back by the send scheduler, nothing was attempted
+    throttled: bool = False
+
+    @property
+    def transient(self) -> bool:
+        # no reply code means the connection failed before the server answered
+        return (
+            not self.sent
+            and not self.permanent
+            and not self.throttled
+            and (self.code is None or 400 <= self.code < 500)
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "to": self.to,
+            "sent": self.sent,
+            "code": self.code,
+            "error": self.error,
+        }
@@ -1,15 +1,15 @@
-import smtplib
-from email import encoders
-from email.mime.application import MIMEApplication
-from email.mime.base import MIMEBase
-from email.mime.image import MIMEImage
+import asyncio
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from pathlib import Path
 
 from src.core.exception.error_no import ErrorNo
 from src.core.exception.exceptions import NotFoundException
+from src.core.service.email.attachment_cache import AttachmentCache
 from src.core.service.email.email import EMessage
+from src.core.service.email.send_scheduler import SendScheduler
+from src.core.service.email.smtp_pool import SMTPConfig, SMTPPool
+from src.core.service.rate_limit import RateLimit
 
 
 class EmailService:
@@ -19,13 +19,42 @@ class EmailService:
         smtp_port: int,
         app_password: str,
         from_email: str,
+        pool_size: int = 4,
+        max_messages_per_connection: int = 100,
+        attachment_cache_bytes: int = 64 * 1024 * 1024,
+        account_rate: float = 10.0,
+        account_burst: int = 20,
+        domain_rate: float = 2.0,
+        domain_burst: int = 10,
+        domain_limits: dict[str, tuple[float, int]] | None = None,
+        max_throttle_wait: float = 30.0,
     ) -> None:
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
         self.from_email = from_email
         self.app_password = app_password
-
-    def send_email(self, message: EMessage) -> None:
+        self.attachment_cache = AttachmentCache(max_bytes=attachment_cache_bytes)
+        self.scheduler = SendScheduler(
+            account_limit=RateLimit(rate=account_rate, burst=account_burst),
+            domain_limit=RateLimit(rate=domain_rate, burst=domain_burst),
+            domain_limits={
+                domain.lower(): RateLimit(rate=float(rate), burst=int(burst))
+                for domain, (rate, burst) in (domain_limits or {}).items()
+            },
+            max_wait=max_throttle_wait,
+        )
+        self.pool = SMTPPool(
+            SMTPConfig(
+                host=smtp_server,
+                port=smtp_port,
+                username=from_email,
+                password=app_password,
+                pool_size=pool_size,
+                max_messages_per_connection=max_messages_per_connection,
+            )
+        )
+
+    async def send_email(self, message: EMessage) -> None:
         msg = MIMEMultipart()
         msg["From"] = self.from_email
         msg["To"] = message.to if isinstance(message.to, str) else ", ".join(message.to)
@@ -33,58 +62,33 @@ class EmailService:
         if message.cc:
             msg["Cc"] = ", ".join(message.cc)
 
-        if message.bcc:
-            msg["Bcc"] = ", ".join(message.bcc)
-
         msg.attach(MIMEText(message.body, message.body_type))
 
         if message.attachments:
-            for file_path in message.attachments:
-                file = Path(file_path)
-                if not file.exists():
-                    raise NotFoundException(
-                        error_no=ErrorNo.EMAIL_ATTACHMENT_NOT_FOUND, message=f"File not found: {file_path}"
-                    )
-                msg.attach(EmailService._attach_file(file))
-
-        self._send_message(msg, message.to)
-
-    @staticmethod
-    def _attach_file(file_path: Path) -> MIMEBase:
-        filename = file_path.name
-        ext = file_path.suffix.lower()
-        if ext in [".jpg", ".jpeg", ".png", ".gif", ".bmp"]:
-            with open(file_path, "rb") as f:
-                attachment = MIMEImage(f.read())
-                attachment.add_header("Content-Disposition", f"attachment; filename= {filename}")
-
-        elif ext == ".pdf":
-            with open(file_path, "rb") as f:
-                attachment = MIMEApplication(f.read(), _subtype="pdf")
-                attachment.add_header("Content-Disposition", f"attachment; filename= {filename}")
-
-        elif ext in [".doc", ".docx"]:
-            with open(file_path, "rb") as f:
-                attachment = MIMEApplication(f.read(), _subtype="msword")
-                attachment.add_header("Content-Disposition", f"attachment; filename= {filename}")
-
-        elif ext in [".xls", ".xlsx"]:
-            with open(file_path, "rb") as f:
-                attachment = MIMEApplication(f.read(), _subtype="vnd.ms-excel")
-                attachment.add_header("Content-Disposition", f"attachment; filename= {filename}")
-
-        else:
-            with open(file_path, "rb") as f:
-                attachment = MIMEBase("application", "octet-stream")
-                attachment.set_payload(f.read())
-                encoders.encode_base64(attachment)
-                attachment.add_header("Content-Disposition", f"attachment; filename= {filename}")
-
-        return attachment
-
-    def _send_message(self, msg: MIMEMultipart, to_email: str | list[str]) -> None:
-        recipients = [to_email] if isinstance(to_email, str) else to_email
-
-        with smtplib.SMTP_SSL(self.smtp_server, self.smtp_port) as server:
-            server.login(self.from_email, self.app_password)
-            server.sendmail(self.from_email, recipients, msg.as_string())
+            # reading and encoding uncached files is blocking work
+            await asyncio.to_thread(self._attach_files, msg, message.attachments)
+
+        await self._send_message(msg, message)
+
+    def _attach_files(self, msg: MIMEMultipart, attachments: list[str]) -> None:
+        for file_path in attachments:
+            file = Path(file_path)
+            try:
+                attachment = self.attachment_cache.get(file)
+            except FileNotFoundError:
+                raise NotFoundException(
+                    error_no=ErrorNo.EMAIL_ATTACHMENT_NOT_FOUND, message=f"File not found: {file_path}"
+                ) from None
+            msg.attach(attachment.to_mime(file.name))
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+    async def _send_message(self, msg: MIMEMultipart, message: EMessage) -> None:
+        # bcc recipients only appear in the envelope, never in the headers
+        recipients = [message.to] if isinstance(message.to, str) else list(message.to)
+        recipients += message.cc + message.bcc
+
+        # waits for the provider budget of the account and every recipient domain, acked only after the send
+        await self.scheduler.acquire(self.from_email, recipients)
+        await self.pool.send(msg, sender=self.from_email, recipients=recipients)
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.core.service.rate_limit import RateLimit, TokenBucket
+
+OTHER_DOMAINS_KEY = "domain:*"
+
+
+class SendThrottledError(Exception):
+    def __init__(self, key: str, wait: float) -> None:
+        super().__init__(f"🛑 Email send to {key} throttled for {wait:.1f}s")
+        self.key = key
+        self.wait = wait
+
+
+@dataclass
+class ThrottleMetrics:
+    sends: int = 0
+    delayed: int = 0
+    throttled: int = 0
+    wait_sum: float = 0.0
+    wait_max: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "sends": self.sends,
+            "delayed": self.delayed,
+            "throttled": self.throttled,
+            "wait_sum": round(self.wait_sum, 3),
+            "wait_max": round(self.wait_max, 3),
+        }
+
+
+@dataclass
+class SendScheduler:
+    account_limit: RateLimit
+    domain_limit: RateLimit
+    domain_limits: dict[str, RateLimit] = field(default_factory=dict)
+    # longer waits are refused, so a throttled domain cannot pin every prefetched message in memory
+    max_wait: float = 30.0
+    max_buckets: int = 1024
+
+    def __post_init__(self) -> None:
+        self._buckets: dict[str, TokenBucket] = {}
+        self._metrics: dict[str, ThrottleMetrics] = {}
+
+    async def acquire(self, account: str, recipients: list[str]) -> float:
+        now = time.monotonic()
+        keys = [f"account:{account}"] + sorted({f"domain:{self._domain(email)}" for email in recipients})
+        buckets = [self._bucket(key, now) for key in keys]
+        waits = [bucket.reserve(now) for bucket in buckets]
+        wait = max(waits)
+
+        if wait > self.max_wait:
+            for bucket in buckets:
+                bucket.cancel()
+            key = keys[waits.index(wait)]
+            self._metric(key).throttled += 1
+            raise SendThrottledError(key, wait)
+
+        for key, key_wait in zip(keys, waits, strict=True):
+            metrics = self._metric(key)
+            metrics.sends += 1
+            if key_wait > 0:
+                metrics.delayed += 1
+                metrics.wait_sum += key_wait
+                metrics.wait_max = max(metrics.wait_max, key_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        return {key: metrics.to_dict() for key, metrics in self._metrics.items()}
+
+    def _bucket(self, key: str, now: float) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                # full buckets carry no state, dropping them is the same as starting fresh
+                self._buckets = {k: b for k, b in self._buckets.items() if not b.is_idle(now)}
+            bucket = self._buckets[key] = TokenBucket(self._limit(key), now)
+        return bucket
+
+    def _limit(self, key: str) -> RateLimit:
+        kind, name = key.split(":", 1)
+        if kind == "account":
+            return self.account_limit
+        return self.domain_limits.get(name, self.domain_limit)
+
+    def _metric(self, key: str) -> ThrottleMetrics:
+        # recipient domains are unbounded, only accounts and configured domains get their own counters
+        kind, name = key.split(":", 1)
+        if kind == "domain" and name not in self.domain_limits:
+            key = OTHER_DOMAINS_KEY
+        metrics = self._metrics.get(key)
+        if metrics is None:
+            metrics = self._metrics[key] = ThrottleMetrics()
+        return metrics
+
+    @staticmethod
+    def _domain(email: str) -> str:
+        return email.rsplit("@", 1)[-1].strip().strip(">").lower()
@@ -0,0 +1,115 @@
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from email.message import Message
+
+import aiosmtplib
+
+
+@dataclass
+class SMTPConfig:
+    host: str
+    port: int
+    username: str
+    password: str
+    pool_size: int = 4
+    max_messages_per_connection: int = 100
+    idle_timeout: float = 60.0
+    timeout: float = 30.0
+
+    @property
+    def use_tls(self) -> bool:
+        # 465 is implicit TLS, other ports upgrade with STARTTLS when the server offers it
+        return self.port == 465
+
+
+class PooledSMTPConnection:
+    def __init__(self, client: aiosmtplib.SMTP) -> None:
+        self.client = client
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+    async def reconnect(self, connect: Callable[[], Awaitable[aiosmtplib.SMTP]]) -> None:
+        self.client.close()
+        self.client = await connect()
+        self.sent = 0
+
+
+class SMTPPool:
+    def __init__(self, config: SMTPConfig) -> None:
+        self.config = config
+        self._idle: asyncio.LifoQueue[PooledSMTPConnection] = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(config.pool_size)
+
+    async def send(self, message: Message, sender: str, recipients: list[str]) -> None:
+        async with self.connection() as connection:
+            reused = connection.sent > 0
+            try:
+                await connection.client.send_message(message, sender=sender, recipients=recipients)
+            except aiosmtplib.SMTPServerDisconnected:
+                if not reused:
+                    raise
+                # the server dropped the pooled session while it was idle, reconnect once
+                await connection.reconnect(self._connect)
+                await connection.client.send_message(message, sender=sender, recipients=recipients)
+            connection.sent += 1
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncGenerator[PooledSMTPConnection]:
+        async with self._slots:
+            connection = await self._acquire()
+            try:
+                yield connection
+            except aiosmtplib.SMTPResponseException as e:
+                # the server rejected this message, the session itself is still usable
+                if e.code == 421:
+                    await self._discard(connection)
+                else:
+                    await self._release(connection)
+                raise
+            except BaseException:
+                await self._discard(connection)
+                raise
+            else:
+                await self._release(connection)
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            await self._discard(self._idle.get_nowait())
+
+    async def _acquire(self) -> PooledSMTPConnection:
+        while not self._idle.empty():
+            connection = self._idle.get_nowait()
+            if time.monotonic() - connection.last_used < self.config.idle_timeout and connection.client.is_connected:
+                return connection
+            await self._discard(connection)
+        return PooledSMTPConnection(await self._connect())
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.config.host,
+            port=self.config.port,
+            use_tls=self.config.use_tls,
+            timeout=self.config.timeout,
+        )
+        await client.connect()
+        if self.config.password:
+            await client.login(self.config.username, self.config.password)
+        return client
+
+    async def _release(self, connection: PooledSMTPConnection) -> None:
+        if connection.sent >= self.config.max_messages_per_connection or not connection.client.is_connected:
+            await self._discard(connection)
+            return
+        connection.last_used = time.monotonic()
+        self._idle.put_nowait(connection)
+
+    @staticmethod
+    async def _discard(connection: PooledSMTPConnection) -> None:
+        try:
+            if connection.client.is_connected:
+                await connection.client.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            connection.client.close()
@@ -1,19 +1,32 @@
+import asyncio
 import os
 import json
+import shutil
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 from urllib.parse import urljoin, urlencode
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape, Template
+from jinja2 import ChoiceLoader, Environment, FileSystemLoader, ModuleLoader, select_autoescape, Template
 
 from src.core.exception.error_no import ErrorNo
 from src.core.exception.exceptions import NotFoundException
-from functools import partial
+from functools import lru_cache, partial
 
 
 class ViewService:
-    def __init__(self, template_dirs: str | list[str], app_url: str) -> None:
+    def __init__(
+        self,
+        template_dirs: str | list[str],
+        app_url: str,
+        compiled_dir: str | None = None,
+        cache_size: int = 256,
+        render_workers: int = 0,
+    ) -> None:
         self.app_url = app_url
+        self.compiled_dir = compiled_dir or None
         if isinstance(template_dirs, str):
             template_dirs = [template_dirs]
 
@@ -27,12 +40,15 @@ class ViewService:
 
             existing_dirs.append(template_dir)
 
+        self._file_loader = FileSystemLoader(existing_dirs)
         self.env = Environment(
-            loader=FileSystemLoader(existing_dirs),
+            loader=self._file_loader,
             autoescape=select_autoescape(["html", "xml"]),
             trim_blocks=True,
             lstrip_blocks=True,
             enable_async=True,
+            cache_size=-1,
+            auto_reload=False,
         )
 
         self.env.filters.update(
@@ -46,44 +62,89 @@ class ViewService:
 
         self.env.globals.update(
             {
-                "year": datetime.now().year,
-                "date": datetime.now().strftime("%d.%m.%Y"),
                 "app_url": app_url,
                 "url": partial(ViewService._format_url, base_url=app_url),
             }
         )
 
         self.template_dirs = existing_dirs
-        self._cache: dict[str, Template] = {}
-
-    async def render_template(self, template_name: str, context: dict[str, Any] | None = None) -> str:
-        if context is None:
-            context = {}
-
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, Template] = OrderedDict()
+        self._from_string = lru_cache(maxsize=cache_size)(self.env.from_string)
+        self._executor = ThreadPoolExecutor(render_workers, thread_name_prefix="render") if render_workers else None
+
+    def compile(self) -> str:
+        # deploy step, run once: modules are written to a fresh directory and the compiled_dir symlink is
+        # swapped to it atomically, so a worker never imports a half-written module
+        if not self.compiled_dir:
+            raise ValueError("🛑 Template compiled directory is not configured")
+        link = os.path.abspath(self.compiled_dir)
+        parent = os.path.dirname(link)
+        os.makedirs(parent, exist_ok=True)
+        target = tempfile.mkdtemp(prefix=f"{os.path.basename(link)}.", dir=parent)
+        os.chmod(target, 0o755)
+        self.env.compile_templates(target, zip=None)
+
+        previous = os.path.realpath(link) if os.path.islink(link) else None
+        if os.path.isdir(link) and previous is None:
+            # a plain directory left by an older release cannot be swapped, it is replaced once
+            shutil.rmtree(link)
+        staging = f"{target}.link"
+        os.symlink(target, staging)
+        os.replace(staging, link)
+        if previous is not None and previous != target:
+            shutil.rmtree(previous, ignore_errors=True)
+        return target
+
+    def precompile(self) -> None:
+        # only loads what compile() built, compiling here would race every other worker on the directory
+        if self.compiled_dir and os.path.isdir(self.compiled_dir):
+            self.env.loader = ChoiceLoader([ModuleLoader(self.compiled_dir), self._file_loader])
+        for name in self._file_loader.list_templates():
+            self.env.get_template(name)
+
+    async def render_template(
+        self, template_name: str, context: dict[str, Any] | None = None, offload: bool = False
+    ) -> str:
         template = self.env.get_template(template_name)
-        rendered = await template.render_async(**context)
-        return rendered
-
-    async def render_string(self, template_string: str, context: dict[str, Any] | None = None) -> str:
-        if context is None:
-            context = {}
+        return await self._render(template, context, offload)
 
-        template = self.env.from_string(template_string)
-        rendered = await template.render_async(**context)
-        return rendered
+    async def render_string(
+        self, template_string: str, context: dict[str, Any] | None = None, offload: bool = False
+    ) -> str:
+        template = self._from_string(template_string)
+        return await self._render(template, context, offload)
 
     async def render_with_cache(self, template_name: str, context: dict[str, Any], cache_key: str | None = None) -> str:
         if cache_key and cache_key in self._cache:
             template = self._cache[cache_key]
+            self._cache.move_to_end(cache_key)
         else:
             template = self.env.get_template(template_name)
             if cache_key:
                 self._cache[cache_key] = template
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
 
-        return await template.render_async(**context)
+        return await self._render(template, context)
 
     def clear_cache(self) -> None:
         self._cache.clear()
+        self._from_string.cache_clear()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    async def _render(self, template: Template, context: dict[str, Any] | None, offload: bool = False) -> str:
+        now = datetime.now()
+        variables = {"year": now.year, "date": now.strftime("%d.%m.%Y"), **(context or {})}
+        if offload and self._executor is not None:
+            # the sync render of an async environment runs its own event loop in the pool thread
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, partial(template.render, **variables)
+            )
+        return await template.render_async(**variables)
 
     @staticmethod
     def _format_date(date_input: str | datetime, format_str: str = "%d.%m.%Y") -> str:
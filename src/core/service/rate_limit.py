@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class RateLimit:
+    rate: float
+    burst: int
+
+
+class TokenBucket:
+    def __init__(self, limit: RateLimit, now: float) -> None:
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.updated_at = now
+
+    def reserve(self, now: float) -> float:
+        # tokens may go negative, the debt is the wait before this send is allowed
+        self.tokens = min(self.limit.burst, self.tokens + (now - self.updated_at) * self.limit.rate)
+        self.updated_at = now
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.limit.rate)
+
+    def cancel(self) -> None:
+        self.tokens += 1
+
+    def is_idle(self, now: float) -> bool:
+        return self.tokens + (now - self.updated_at) * self.limit.rate >= self.limit.burst
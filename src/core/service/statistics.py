@@ -65,5 +65,6 @@ def format_time(s: int | float) -> str:
 def render_statistics(start_time: int | float) -> str:
     duration = format_time(time.time() - start_time)
     memory = format_memory_size(memory_usage())
-    cpu = psutil.cpu_percent(interval=1)
+    # non-blocking: utilisation since the previous call instead of sampling for a second
+    cpu = psutil.cpu_percent(interval=None)
     return f"CPU: {cpu}%, memory: {memory}, duration: {duration})"
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class WSEncoding(Enum):
+    JSON = "json"
+    MSGPACK = "msgpack"
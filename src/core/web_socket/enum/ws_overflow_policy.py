@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class WSOverflowPolicy(Enum):
+    DROP_OLDEST = "drop_oldest"
+    DISCONNECT = "disconnect"
@@ -3,6 +3,11 @@ from enum import Enum
 
 class WSType(Enum):
     PING = "ping"
+    PONG = "pong"
     USER_NOTIFICATION = "user_notification"
+    USER_NOTIFICATION_SYNC = "user_notification_sync"
     MESSAGE_READ = "message_read"
+    MESSAGE_READ_UP_TO = "message_read_up_to"
+    SUBSCRIBE = "subscribe"
+    UNSUBSCRIBE = "unsubscribe"
     UNKNOWN = "unknown"
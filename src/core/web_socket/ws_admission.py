@@ -0,0 +1,67 @@
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import status
+
+from src.core.service.rate_limit import RateLimit, TokenBucket
+
+
+@dataclass(frozen=True)
+class WSRejection:
+    reason: str
+    code: int
+
+
+RATE_LIMITED = WSRejection("rate_limited", status.WS_1013_TRY_AGAIN_LATER)
+WORKER_FULL = WSRejection("worker_full", status.WS_1013_TRY_AGAIN_LATER)
+USER_LIMIT = WSRejection("user_limit", status.WS_1008_POLICY_VIOLATION)
+
+
+class WSAdmission:
+    def __init__(
+        self,
+        max_per_user: int = 10,
+        max_connections: int = 10000,
+        ip_rate: float = 5.0,
+        ip_burst: int = 20,
+        max_buckets: int = 10000,
+    ) -> None:
+        # 0 disables a limit
+        self.max_per_user = max_per_user
+        self.max_connections = max_connections
+        self.ip_limit = RateLimit(rate=ip_rate, burst=ip_burst) if ip_rate > 0 else None
+        self.max_buckets = max_buckets
+        self.admitted = 0
+        self.rejected: dict[str, int] = {}
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def check_ip(self, ip: str | None) -> WSRejection | None:
+        # runs before the token is verified, so a reconnect storm from one address stays cheap
+        if self.ip_limit is None or not ip:
+            return None
+        now = time.monotonic()
+        bucket = self._buckets.get(ip)
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                self._buckets = {k: b for k, b in self._buckets.items() if not b.is_idle(now)}
+            bucket = self._buckets[ip] = TokenBucket(self.ip_limit, now)
+        if bucket.reserve(now) > 0:
+            bucket.cancel()
+            return self._reject(RATE_LIMITED)
+        return None
+
+    def check_capacity(self, user_connections: int, connections: int) -> WSRejection | None:
+        if self.max_connections and connections >= self.max_connections:
+            return self._reject(WORKER_FULL)
+        if self.max_per_user and user_connections >= self.max_per_user:
+            return self._reject(USER_LIMIT)
+        self.admitted += 1
+        return None
+
+    def metrics(self) -> dict[str, Any]:
+        return {"admitted": self.admitted, "rejected": dict(self.rejected)}
+
+    def _reject(self, rejection: WSRejection) -> WSRejection:
+        self.rejected[rejection.reason] = self.rejected.get(rejection.reason, 0) + 1
+        return rejection
@@ -0,0 +1,134 @@
+import os
+import socket
+import uuid
+from typing import Any
+
+from aio_pika import DeliveryMode, ExchangeType, Message
+from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractExchange, AbstractIncomingMessage, AbstractQueue
+
+from src.core.log.log import Log
+from src.core.rabbit_mq.config import ExchangeConfig, QueueConfig, RabbitMQConfig
+from src.core.rabbit_mq.connection import connect
+from src.core.rabbit_mq.topology import declare_exchange, declare_queue
+from src.core.web_socket.ws_frame import WSFrame, encode_frame
+from src.core.web_socket.ws_manager import BROADCAST_KEY, WSManager, topic_key, user_key
+
+WS_EXCHANGE = ExchangeConfig(name="ws_backplane", type=ExchangeType.TOPIC, durable=False, auto_delete=False)
+ORIGIN_HEADER = "x-ws-origin"
+EXCLUDE_HEADER = "x-ws-exclude"
+BINARY_CONTENT_TYPE = "application/octet-stream"
+TEXT_CONTENT_TYPE = "text/plain"
+
+
+class WSBackplane:
+    def __init__(
+        self,
+        config: RabbitMQConfig,
+        ws_manager: WSManager,
+        log: Log,
+        exchange: ExchangeConfig = WS_EXCHANGE,
+    ) -> None:
+        self.config = config
+        self.ws_manager = ws_manager
+        self.log = log
+        self.exchange_config = exchange
+        self.node_id = f"{socket.gethostname()}.{os.getpid()}.{uuid.uuid4().hex[:8]}"
+        self._conn: AbstractConnection | None = None
+        self._channel: AbstractChannel | None = None
+        self._exchange: AbstractExchange | None = None
+        self._queue: AbstractQueue | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._exchange is not None
+
+    async def start(self, consume: bool = True) -> None:
+        self._conn = await connect(self.config)
+        # frames are transient, a lost one is no worse than a socket that was not connected
+        self._channel = await self._conn.channel(publisher_confirms=False)  # type: ignore
+        self._exchange = await declare_exchange(self._channel, self.exchange_config)
+        if consume:
+            # one queue per process, bound only to the users connected to it
+            self._queue = await declare_queue(
+                self._channel,
+                QueueConfig(name=f"ws.{self.node_id}", durable=False, exclusive=True, auto_delete=True),
+                self.exchange_config,
+            )
+            await self._queue.bind(self._exchange, routing_key=BROADCAST_KEY)
+            for user_id in self.ws_manager.user_ids():
+                await self.subscribe(user_id)
+            for topic in self.ws_manager.topics():
+                await self.subscribe_topic(topic)
+            await self._queue.consume(self._on_message, no_ack=True)
+            self.ws_manager.backplane = self
+        self.log.info(f"🚀 WebSocket backplane started: {self.node_id}")
+
+    async def stop(self) -> None:
+        if self.ws_manager.backplane is self:
+            self.ws_manager.backplane = None
+        try:
+            if self._queue is not None:
+                await self._queue.delete(if_unused=False, if_empty=False)
+            if self._conn is not None:
+                await self._conn.close()
+        except Exception as e:
+            self.log.warning(f"🫜 WebSocket backplane failed to close: {e}")
+        self._conn = self._channel = self._exchange = self._queue = None
+        self.log.info("🚦 WebSocket backplane stopped")
+
+    async def subscribe(self, user_id: str) -> None:
+        if self._queue is not None and self._exchange is not None:
+            await self._queue.bind(self._exchange, routing_key=user_key(user_id))
+
+    async def unsubscribe(self, user_id: str) -> None:
+        if self._queue is not None and self._exchange is not None:
+            await self._queue.unbind(self._exchange, routing_key=user_key(user_id))
+
+    async def subscribe_topic(self, topic: str) -> None:
+        if self._queue is not None and self._exchange is not None:
+            await self._queue.bind(self._exchange, routing_key=topic_key(topic))
+
+    async def unsubscribe_topic(self, topic: str) -> None:
+        if self._queue is not None and self._exchange is not None:
+            await self._queue.unbind(self._exchange, routing_key=topic_key(topic))
+
+    async def send_to_user(self, user_id: str, data: dict[str, Any]) -> None:
+        await self.publish(user_key(user_id), encode_frame(data))
+
+    async def broadcast(self, data: dict[str, Any], exclude_user_id: list[str] | None = None) -> None:
+        await self.publish(BROADCAST_KEY, encode_frame(data), exclude_user_id=exclude_user_id)
+
+    async def publish(self, routing_key: str, frame: WSFrame, exclude_user_id: list[str] | None = None) -> None:
+        if self._exchange is None:
+            raise RuntimeError("🛑 WebSocket backplane is not started")
+        headers: dict[str, Any] = {ORIGIN_HEADER: self.node_id}
+        if exclude_user_id:
+            headers[EXCLUDE_HEADER] = ",".join(exclude_user_id)
+        await self._exchange.publish(
+            Message(
+                frame if isinstance(frame, bytes) else frame.encode("utf-8"),
+                content_type=BINARY_CONTENT_TYPE if isinstance(frame, bytes) else TEXT_CONTENT_TYPE,
+                delivery_mode=DeliveryMode.NOT_PERSISTENT,
+                headers=headers,
+            ),
+            routing_key=routing_key,
+            mandatory=False,
+        )
+
+    async def _on_message(self, message: AbstractIncomingMessage) -> None:
+        try:
+            headers = message.headers or {}
+            if headers.get(ORIGIN_HEADER) == self.node_id:
+                # already delivered to the local sockets by the publishing manager
+                return
+            frame: WSFrame = message.body if message.content_type == BINARY_CONTENT_TYPE else message.body.decode()
+            routing_key = message.routing_key or ""
+            if routing_key == BROADCAST_KEY:
+                exclude = str(headers.get(EXCLUDE_HEADER) or "")
+                await self.ws_manager.broadcast_local(frame, exclude_user_id=exclude.split(",") if exclude else None)
+            elif routing_key.startswith("user."):
+                await self.ws_manager.send_local(routing_key.removeprefix("user."), frame)
+            elif routing_key.startswith("topic."):
+                await self.ws_manager.publish_local(routing_key.removeprefix("topic."), frame)
+        except Exception as e:
+            self.log.error(f"🛑 WebSocket backplane failed to deliver message: {e}")
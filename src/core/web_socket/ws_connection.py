@@ -0,0 +1,83 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from fastapi import WebSocket
+
+from src.core.web_socket.enum.ws_encoding import WSEncoding
+from src.core.web_socket.enum.ws_overflow_policy import WSOverflowPolicy
+from src.core.web_socket.ws_frame import WSFrame
+
+
+class WSConnection:
+    def __init__(
+        self,
+        user_id: str,
+        websocket: WebSocket,
+        max_queue: int,
+        overflow_policy: WSOverflowPolicy,
+        on_error: Callable[["WSConnection", Exception], Awaitable[None]],
+        encoding: WSEncoding = WSEncoding.JSON,
+    ) -> None:
+        self.user_id = user_id
+        self.websocket = websocket
+        self.encoding = encoding
+        self.overflow_policy = overflow_policy
+        self.sent = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.closing = False
+        self.topics: set[str] = set()
+        # monotonic time of the last frame received from the client
+        self.last_seen = time.monotonic()
+        self.heartbeat_slot = 0
+        self._queue: asyncio.Queue[WSFrame] = asyncio.Queue(maxsize=max_queue)
+        self._on_error = on_error
+        self._writer: asyncio.Task[None] | None = None
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        self._writer = asyncio.create_task(self._write(), name=f"ws-writer-{self.user_id}")
+
+    def enqueue(self, frame: WSFrame) -> bool:
+        if self.closing:
+            return False
+        if self._queue.full():
+            if self.overflow_policy == WSOverflowPolicy.DISCONNECT:
+                self.closing = True
+                return False
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(frame)
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    async def stop(self) -> None:
+        self.closing = True
+        writer = self._writer
+        if writer is None or writer.done() or writer is asyncio.current_task():
+            return
+        writer.cancel()
+        try:
+            await writer
+        except asyncio.CancelledError:
+            pass
+
+    async def _write(self) -> None:
+        # the only task writing to this socket, so a slow client only delays its own queue
+        try:
+            while True:
+                frame = await self._queue.get()
+                if isinstance(frame, bytes):
+                    await self.websocket.send_bytes(frame)
+                else:
+                    await self.websocket.send_text(frame)
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self.closing = True
+            await self._on_error(self, exc)
@@ -0,0 +1,57 @@
+import json
+from typing import Any
+
+from src.core.web_socket.enum.ws_encoding import WSEncoding
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+WSFrame = str | bytes
+
+
+def encode_frame(data: dict[str, Any]) -> str:
+    # same compact text frame as WebSocket.send_json, encoded once for every recipient
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def decode_frame(frame: WSFrame) -> Any:
+    # text frames are JSON, binary frames msgpack
+    if isinstance(frame, bytes):
+        if msgpack is None:
+            raise ValueError("binary frames require the 'msgpack' package")
+        return msgpack.unpackb(frame, raw=False)
+    if orjson is not None:
+        return orjson.loads(frame)
+    return json.loads(frame)
+
+
+def supported_encoding(encoding: str | None) -> WSEncoding:
+    if encoding == WSEncoding.MSGPACK.value and msgpack is not None:
+        return WSEncoding.MSGPACK
+    return WSEncoding.JSON
+
+
+class WSFrames:
+    # the frame of one send in each client encoding, converted on first use and shared by every recipient
+    __slots__ = ("_frames",)
+
+    def __init__(self, frame: WSFrame) -> None:
+        self._frames: dict[WSEncoding, WSFrame] = {WSEncoding.JSON: frame}
+
+    def get(self, encoding: WSEncoding) -> WSFrame:
+        frame = self._frames.get(encoding)
+        if frame is None:
+            text = self._frames[WSEncoding.JSON]
+            # binary frames from the backplane are opaque, they go out unchanged
+            frame = text if isinstance(text, bytes) else msgpack.packb(decode_frame(text), use_bin_type=True)
+            self._frames[encoding] = frame
+        return frame
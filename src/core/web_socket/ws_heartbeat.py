@@ -0,0 +1,75 @@
+import asyncio
+import time
+from collections.abc import Callable
+
+from src.core.log.log import Log
+from src.core.web_socket.ws_connection import WSConnection
+
+
+class WSHeartbeat:
+    def __init__(
+        self,
+        log: Log,
+        on_ping: Callable[[WSConnection], None],
+        on_dead: Callable[[WSConnection], None],
+        interval: float = 30.0,
+        timeout: float = 75.0,
+        tick: float = 1.0,
+    ) -> None:
+        self.log = log
+        self.interval = interval
+        self.timeout = timeout
+        self.tick = tick
+        self.pings = 0
+        self.reaped = 0
+        self._on_ping = on_ping
+        self._on_dead = on_dead
+        # one slot per tick, a connection is visited once per revolution, i.e. once per interval
+        self._slots: list[set[WSConnection]] = [set() for _ in range(max(1, round(interval / tick)))]
+        self._cursor = 0
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="ws-heartbeat")
+            self.log.info(f"💓 WebSocket heartbeat started: every {self.interval}s, timeout {self.timeout}s")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def add(self, connection: WSConnection) -> None:
+        connection.heartbeat_slot = self._cursor
+        self._slots[self._cursor].add(connection)
+
+    def remove(self, connection: WSConnection) -> None:
+        self._slots[connection.heartbeat_slot].discard(connection)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick)
+            try:
+                self.advance(time.monotonic())
+            except Exception as e:
+                self.log.error(f"🛑 WebSocket heartbeat failed: {e}")
+
+    def advance(self, now: float) -> None:
+        self._cursor = (self._cursor + 1) % len(self._slots)
+        slot = self._slots[self._cursor]
+        dead = [connection for connection in slot if now - connection.last_seen >= self.timeout]
+        for connection in dead:
+            slot.discard(connection)
+            self._on_dead(connection)
+        for connection in slot:
+            if now - connection.last_seen >= self.interval / 2:
+                self._on_ping(connection)
+                self.pings += 1
+        if dead:
+            self.reaped += len(dead)
+            self.log.info(f"💀 WebSocket heartbeat reaped {len(dead)} idle connections (total {self.reaped})")
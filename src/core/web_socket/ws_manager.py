@@ -1,89 +1,318 @@
+from __future__ import annotations
+
 import asyncio
-from typing import Any
+import re
+import time
+from typing import TYPE_CHECKING, Any
 
 from fastapi import WebSocket
 
 from src.core.log.log import Log
+from src.core.web_socket.enum.ws_overflow_policy import WSOverflowPolicy
+from src.core.web_socket.enum.ws_type import WSType
+from src.core.web_socket.ws_admission import WSAdmission, WSRejection
+from src.core.web_socket.ws_connection import WSConnection
+from src.core.web_socket.ws_frame import WSFrame, WSFrames, encode_frame, supported_encoding
+from src.core.web_socket.ws_heartbeat import WSHeartbeat
+from src.core.web_socket.ws_registry import WSRegistry
+
+if TYPE_CHECKING:
+    from src.core.web_socket.ws_backplane import WSBackplane
+
+BROADCAST_KEY = "broadcast"
+# no AMQP wildcards, topic names are used as routing keys on the backplane
+TOPIC_PATTERN = re.compile(r"^[\w\-:.]{1,128}$")
+
+
+def user_key(user_id: str) -> str:
+    return f"user.{user_id}"
+
+
+def topic_key(topic: str) -> str:
+    return f"topic.{topic}"
 
 
 class WSManager:
     def __init__(
         self,
         log: Log,
+        max_queue: int = 256,
+        overflow_policy: str = WSOverflowPolicy.DROP_OLDEST.value,
+        shards: int = 16,
+        max_topics: int = 64,
+        heartbeat_interval: float = 30.0,
+        heartbeat_timeout: float = 75.0,
+        admission: WSAdmission | None = None,
     ) -> None:
-        self._connections: dict[str, set[WebSocket]] = {}
-        self._lock = asyncio.Lock()
+        self._registry = WSRegistry(shards=shards)
         self.log = log
+        self.max_queue = max_queue
+        self.overflow_policy = WSOverflowPolicy(overflow_policy)
+        self.max_topics = max_topics
+        self._slow_disconnects = 0
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.heartbeat = WSHeartbeat(
+            log=log,
+            on_ping=self._ping,
+            on_dead=self._reap,
+            interval=heartbeat_interval,
+            timeout=heartbeat_timeout,
+        )
+        self.admission = admission or WSAdmission()
+        self._ping_frames = WSFrames(encode_frame({"type": WSType.PING.value}))
+        # set by WSBackplane.start(), relays user sends and broadcasts to the other workers
+        self.backplane: WSBackplane | None = None
+
+    def start(self) -> None:
+        # application level pings, clients answer {"type": "ping"} with any frame or are reaped and counted;
+        # protocol level pings (WS_PING_INTERVAL) still close peers that are gone before the timeout
+        if self.heartbeat.interval > 0:
+            self.heartbeat.start()
+
+    async def connect(self, user_id: str, websocket: WebSocket, encoding: str | None = None) -> WSRejection | None:
+        connection = WSConnection(
+            user_id=user_id,
+            websocket=websocket,
+            max_queue=self.max_queue,
+            overflow_policy=self.overflow_policy,
+            on_error=self._on_send_error,
+            # falls back to JSON text frames when msgpack is not installed
+            encoding=supported_encoding(encoding),
+        )
+        async with self._registry.lock(user_id):
+            # counted before accept, so concurrent upgrades of one user cannot all pass the limit
+            rejection = self.admission.check_capacity(
+                user_connections=len(self._registry.get(user_id)),
+                connections=self._registry.connection_count,
+            )
+            # the bind stays under the shard lock, so it cannot overtake the unbind of a concurrent last disconnect
+            if rejection is None and self._registry.add(connection) and self.backplane is not None:
+                await self.backplane.subscribe(user_id)
+        if rejection is not None:
+            await self.reject(user_id, websocket, rejection)
+            return rejection
+        try:
+            await websocket.accept()
+        except Exception:
+            await self.disconnect(user_id, websocket)
+            raise
+        if connection.closing:
+            # dropped while the accept was in flight
+            return None
+        # frames queued before the accept are written now
+        connection.start()
+        self.heartbeat.add(connection)
+        self.log.info(f"🍏 WebSocket connected: {user_id} (total {len(self._registry.get(user_id))})")
+        return None
 
-    async def connect(self, user_id: str, websocket: WebSocket) -> None:
-        await websocket.accept()
-        async with self._lock:
-            conns = self._connections.setdefault(user_id, set())
-            conns.add(websocket)
-        self.log.info(f"🍏 WebSocket connected: {user_id} (total {len(self._connections.get(user_id, []))})")
+    async def reject(self, user_id: str, websocket: WebSocket, rejection: WSRejection) -> None:
+        # accepted only to close with a code and reason the client can act on
+        self.log.warning(f"🚧 WebSocket rejected: {user_id}, {rejection.reason}")
+        try:
+            await websocket.accept()
+            await websocket.close(code=rejection.code, reason=rejection.reason)
+        except Exception as e:
+            self.log.warning(f"🫜 WebSocket failed to close to {user_id}: {e}")
 
     async def disconnect(self, user_id: str, websocket: WebSocket) -> None:
-        async with self._lock:
-            conns = self._connections.get(user_id)
-            if not conns:
+        async with self._registry.lock(user_id):
+            connection, last = self._registry.remove(user_id, websocket)
+            if connection is None:
                 return
-            conns.discard(websocket)
-            if not conns:
-                self._connections.pop(user_id, None)
+            if last and self.backplane is not None:
+                await self.backplane.unsubscribe(user_id)
+        self.heartbeat.remove(connection)
+        await connection.stop()
+        for topic in list(connection.topics):
+            await self._unsubscribe(connection, topic)
         self.log.info(f"🍎 WebSocket disconnected: {user_id}")
 
+    def touch(self, user_id: str, websocket: WebSocket) -> None:
+        connection = self._registry.get(user_id).get(websocket)
+        if connection is not None:
+            connection.last_seen = time.monotonic()
+
     async def send_to_user(self, user_id: str, data: dict[str, Any], websocket: WebSocket | None = None) -> int:
-        conns = list(self._connections.get(user_id, []))
+        if websocket is None and self.backplane is None and not self._registry.get(user_id):
+            self.log.debug(f"🍊 WebSocket No active ws for user {user_id}")
+            return 0
+        return await self.send_raw(user_id, encode_frame(data), websocket=websocket)
+
+    async def send_raw(self, user_id: str, frame: WSFrame, websocket: WebSocket | None = None) -> int:
+        # returns the local connections only, the user may have more on other workers
+        if websocket is None and self.backplane is not None:
+            await self._publish(user_key(user_id), frame)
+        return await self.send_local(user_id, frame, websocket=websocket)
+
+    async def send_local(self, user_id: str, frame: WSFrame, websocket: WebSocket | None = None) -> int:
+        conns = self._registry.get(user_id)
         if not conns:
             self.log.debug(f"🍊 WebSocket No active ws for user {user_id}")
             return 0
         if websocket is not None:
-            success = int(await self._safe_send(websocket, data, user_id))
+            connection = conns.get(websocket)
+            targets = [connection] if connection is not None else []
         else:
-            coros = [self._safe_send(ws, data, user_id) for ws in conns]
-            results = await asyncio.gather(*coros, return_exceptions=True)
-            success = sum(1 for r in results if r is True)
-        self.log.info(f"🍐 WebSocket sent message to {success}/{len(conns)} connections for user {user_id}")
+            targets = list(conns.values())
+        frames = WSFrames(frame)
+        success = sum(1 for connection in targets if self._enqueue(connection, frames))
+        self.log.info(f"🍐 WebSocket queued message to {success}/{len(conns)} connections for user {user_id}")
         return success
 
     async def broadcast(self, data: dict[str, Any], exclude_user_id: list[str] | None = None) -> int:
-        if exclude_user_id is None:
-            exclude_user_id = []
+        return await self.broadcast_raw(encode_frame(data), exclude_user_id=exclude_user_id)
+
+    async def broadcast_raw(self, frame: WSFrame, exclude_user_id: list[str] | None = None) -> int:
+        if self.backplane is not None:
+            await self._publish(BROADCAST_KEY, frame, exclude_user_id=exclude_user_id)
+        return await self.broadcast_local(frame, exclude_user_id=exclude_user_id)
+
+    async def broadcast_local(self, frame: WSFrame, exclude_user_id: list[str] | None = None) -> int:
+        # only enqueues the shared frame, the per-connection writers do the network writes concurrently
+        excluded = set(exclude_user_id or [])
+        frames = WSFrames(frame)
         success = 0
-        user_ids = []
-        for user_id in self._connections.keys():
-            if user_id in exclude_user_id:
+        users = 0
+        for user_id, conns in self._registry.items():
+            if user_id in excluded:
                 continue
-            success += await self.send_to_user(user_id, data)
-            user_ids.append(user_id)
-        self.log.info(f"🍐 WebSocket sent messages to {success} connections for users {user_ids}")
+            users += 1
+            success += sum(1 for connection in conns.values() if self._enqueue(connection, frames))
+        self.log.info(f"🍐 WebSocket queued messages to {success} connections for {users} users")
         return success
 
-    async def _safe_send(self, ws: WebSocket, data: dict[str, Any], user_id: str) -> bool:
-        try:
-            await ws.send_json(data)
+    async def subscribe(self, user_id: str, websocket: WebSocket, topic: str) -> bool:
+        connection = self._registry.get(user_id).get(websocket)
+        if connection is None or not TOPIC_PATTERN.match(topic):
+            return False
+        if topic in connection.topics:
             return True
-        except Exception as exc:
-            self.log.warning(f"🌶️ WebSocket failed to send to {user_id}: {exc}")
-            # best-effort cleanup
-            await self.disconnect(user_id, ws)
-            try:
-                await ws.close()
-            except Exception as e:
-                self.log.warning(f"🫜 WebSocket failed to close to {user_id}: {e}")
+        if len(connection.topics) >= self.max_topics:
+            self.log.warning(f"🍋 WebSocket topic limit reached for {user_id}, not subscribed to {topic}")
+            return False
+        async with self._registry.lock(topic_key(topic)):
+            if connection.closing:
+                # disconnected while waiting for the lock, its topics were already cleaned up
+                return False
+            if self._registry.subscribe(connection, topic) and self.backplane is not None:
+                await self.backplane.subscribe_topic(topic)
+        return True
+
+    async def unsubscribe(self, user_id: str, websocket: WebSocket, topic: str) -> bool:
+        connection = self._registry.get(user_id).get(websocket)
+        if connection is None or topic not in connection.topics:
             return False
+        await self._unsubscribe(connection, topic)
+        return True
+
+    async def publish(self, topic: str, data: dict[str, Any]) -> int:
+        if self.backplane is None and not self._registry.subscribers(topic):
+            return 0
+        return await self.publish_raw(topic, encode_frame(data))
+
+    async def publish_raw(self, topic: str, frame: WSFrame) -> int:
+        if self.backplane is not None:
+            await self._publish(topic_key(topic), frame)
+        return await self.publish_local(topic, frame)
+
+    async def publish_local(self, topic: str, frame: WSFrame) -> int:
+        # only the subscribers of the topic are visited, not every connected user
+        subscribers = self._registry.subscribers(topic)
+        frames = WSFrames(frame)
+        success = sum(1 for connection in subscribers if self._enqueue(connection, frames))
+        self.log.debug(f"🍐 WebSocket queued topic {topic} message to {success}/{len(subscribers)} connections")
+        return success
+
+    def topics(self) -> list[str]:
+        return self._registry.topics()
+
+    def user_ids(self) -> list[str]:
+        return self._registry.user_ids()
+
+    @property
+    def connection_count(self) -> int:
+        return self._registry.connection_count
+
+    @property
+    def user_count(self) -> int:
+        return self._registry.user_count
+
+    def metrics(self) -> dict[str, Any]:
+        connections = [connection for _, conns in self._registry.items() for connection in conns.values()]
+        depths = [connection.depth for connection in connections]
+        return {
+            "users": self._registry.user_count,
+            "connections": self._registry.connection_count,
+            "topics": self._registry.topic_count,
+            "queued": sum(depths),
+            "max_depth": max(depths, default=0),
+            "max_depth_seen": max((connection.max_depth for connection in connections), default=0),
+            "dropped": sum(connection.dropped for connection in connections),
+            "slow_disconnects": self._slow_disconnects,
+            "heartbeat_pings": self.heartbeat.pings,
+            "heartbeat_reaped": self.heartbeat.reaped,
+            "admission": self.admission.metrics(),
+        }
+
+    async def _publish(self, routing_key: str, frame: WSFrame, exclude_user_id: list[str] | None = None) -> None:
+        # local sockets are still served when the backplane is unavailable
+        try:
+            await self.backplane.publish(routing_key, frame, exclude_user_id=exclude_user_id)  # type: ignore
+        except Exception as e:
+            self.log.warning(f"🌶️ WebSocket backplane failed to publish {routing_key}: {e}")
+
+    async def _unsubscribe(self, connection: WSConnection, topic: str) -> None:
+        async with self._registry.lock(topic_key(topic)):
+            if self._registry.unsubscribe(connection, topic) and self.backplane is not None:
+                await self.backplane.unsubscribe_topic(topic)
+
+    def _enqueue(self, connection: WSConnection, frames: WSFrames) -> bool:
+        if connection.closing:
+            return False
+        if connection.enqueue(frames.get(connection.encoding)):
+            return True
+        if self.overflow_policy == WSOverflowPolicy.DISCONNECT:
+            self._slow_disconnects += 1
+            self.log.warning(f"🐌 WebSocket send queue full for {connection.user_id}, disconnecting slow consumer")
+            self._spawn(self._drop(connection))
+        return False
+
+    def _ping(self, connection: WSConnection) -> None:
+        self._enqueue(connection, self._ping_frames)
+
+    def _reap(self, connection: WSConnection) -> None:
+        self.log.debug(f"💀 WebSocket idle connection reaped: {connection.user_id}")
+        self._spawn(self._drop(connection))
+
+    async def _on_send_error(self, connection: WSConnection, exc: Exception) -> None:
+        self.log.warning(f"🌶️ WebSocket failed to send to {connection.user_id}: {exc}")
+        # best-effort cleanup
+        await self._drop(connection)
+
+    async def _drop(self, connection: WSConnection) -> None:
+        if self._registry.get(connection.user_id).get(connection.websocket) is not connection:
+            return
+        await self.disconnect(connection.user_id, connection.websocket)
+        try:
+            await connection.websocket.close()
+        except Exception as e:
+            self.log.warning(f"🫜 WebSocket failed to close to {connection.user_id}: {e}")
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
 
     async def close_all(self) -> None:
-        async with self._lock:
-            conns = [(uid, list(s)) for uid, s in self._connections.items()]
-            self._connections.clear()
+        await self.heartbeat.stop()
+        self.log.info("📊 WebSocket send queue metrics", metrics=self.metrics())
         coros = []
-        for uid, socks in conns:
-            for ws in socks:
-                try:
-                    coros.append(ws.close())
-                except Exception as e:
-                    self.log.warning(f"🫜 WebSocket failed to close to {uid}: {e}")
+        for connection in await self._registry.clear():
+            await connection.stop()
+            try:
+                coros.append(connection.websocket.close())
+            except Exception as e:
+                self.log.warning(f"🫜 WebSocket failed to close to {connection.user_id}: {e}")
         if coros:
             await asyncio.gather(*coros, return_exceptions=True)
         self.log.info("🥝 WebSocket Closed all websockets")
@@ -0,0 +1,107 @@
+import asyncio
+import zlib
+from collections.abc import Iterator
+
+from fastapi import WebSocket
+
+from src.core.web_socket.ws_connection import WSConnection
+
+
+class WSShard:
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        # per-user dicts are replaced, never mutated, so readers can hold one without a lock
+        self.connections: dict[str, dict[WebSocket, WSConnection]] = {}
+
+
+class WSRegistry:
+    def __init__(self, shards: int = 16) -> None:
+        self._shards = [WSShard() for _ in range(max(1, shards))]
+        # topic -> subscribed connections, mutated in place, readers iterate without awaiting
+        self._topics: dict[str, set[WSConnection]] = {}
+        self.connection_count = 0
+        self.user_count = 0
+
+    def lock(self, key: str) -> asyncio.Lock:
+        # connect/disconnect only contend with users (or topics) hashed to the same shard
+        return self._shard(key).lock
+
+    def get(self, user_id: str) -> dict[WebSocket, WSConnection]:
+        return self._shard(user_id).connections.get(user_id) or {}
+
+    def add(self, connection: WSConnection) -> bool:
+        # returns True for the first connection of the user, call with the shard lock held
+        shard = self._shard(connection.user_id)
+        conns = shard.connections.get(connection.user_id) or {}
+        shard.connections[connection.user_id] = {**conns, connection.websocket: connection}
+        self.connection_count += 1
+        if not conns:
+            self.user_count += 1
+        return not conns
+
+    def remove(self, user_id: str, websocket: WebSocket) -> tuple[WSConnection | None, bool]:
+        # returns the removed connection and whether it was the last one of the user, call with the shard lock held
+        shard = self._shard(user_id)
+        conns = shard.connections.get(user_id)
+        if not conns or websocket not in conns:
+            return None, False
+        rest = {ws: connection for ws, connection in conns.items() if ws is not websocket}
+        self.connection_count -= 1
+        if rest:
+            shard.connections[user_id] = rest
+            return conns[websocket], False
+        del shard.connections[user_id]
+        self.user_count -= 1
+        return conns[websocket], True
+
+    def subscribe(self, connection: WSConnection, topic: str) -> bool:
+        # returns True for the first local subscriber of the topic, call with the topic lock held
+        subscribers = self._topics.setdefault(topic, set())
+        first = not subscribers
+        subscribers.add(connection)
+        connection.topics.add(topic)
+        return first
+
+    def unsubscribe(self, connection: WSConnection, topic: str) -> bool:
+        # returns True when the last local subscriber left the topic, call with the topic lock held
+        connection.topics.discard(topic)
+        subscribers = self._topics.get(topic)
+        if subscribers is None or connection not in subscribers:
+            return False
+        subscribers.discard(connection)
+        if subscribers:
+            return False
+        del self._topics[topic]
+        return True
+
+    def subscribers(self, topic: str) -> set[WSConnection]:
+        return self._topics.get(topic) or set()
+
+    def topics(self) -> list[str]:
+        return list(self._topics)
+
+    @property
+    def topic_count(self) -> int:
+        return len(self._topics)
+
+    def items(self) -> Iterator[tuple[str, dict[WebSocket, WSConnection]]]:
+        for shard in self._shards:
+            yield from list(shard.connections.items())
+
+    def user_ids(self) -> list[str]:
+        return [user_id for shard in self._shards for user_id in shard.connections]
+
+    async def clear(self) -> list[WSConnection]:
+        connections: list[WSConnection] = []
+        for shard in self._shards:
+            async with shard.lock:
+                connections.extend(c for conns in shard.connections.values() for c in conns.values())
+                shard.connections = {}
+        self._topics = {}
+        self.connection_count = 0
+        self.user_count = 0
+        return connections
+
+    def _shard(self, key: str) -> WSShard:
+        # crc32 instead of hash(), so the shard of a user does not change with PYTHONHASHSEED
+        return self._shards[zlib.crc32(key.encode()) % len(self._shards)]
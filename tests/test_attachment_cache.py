@@ -0,0 +1,39 @@
+import base64
+from pathlib import Path
+
+from src.core.service.email.attachment_cache import AttachmentCache
+
+
+def _file(tmp_path: Path, name: str, content: bytes) -> Path:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+def test_eviction_drops_only_the_keys_of_the_evicted_part(tmp_path: Path) -> None:
+    first = _file(tmp_path, "first.pdf", b"a" * 570)
+    copy = _file(tmp_path, "copy.pdf", b"a" * 570)
+    second = _file(tmp_path, "second.pdf", b"b" * 570)
+    cache = AttachmentCache(max_bytes=1000)
+
+    shared = cache.get(first)
+    assert cache.get(copy) is shared
+    assert shared.payload == base64.encodebytes(b"a" * 570).decode("ascii")
+
+    # the second part does not fit next to the first, which is evicted with both of its paths
+    kept = cache.get(second)
+    assert list(cache._parts) == [kept.digest]
+    assert set(cache._index.values()) == {kept.digest}
+    assert set(cache._keys) == {kept.digest}
+    assert cache.get(second) is kept
+
+
+def test_attachment_larger_than_the_cache_is_encoded_per_send(tmp_path: Path) -> None:
+    large = _file(tmp_path, "large.bin", b"c" * 2000)
+    cache = AttachmentCache(max_bytes=1000)
+
+    attachment = cache.get(large)
+
+    assert attachment.payload == base64.encodebytes(b"c" * 2000).decode("ascii")
+    assert (attachment.maintype, attachment.subtype) == ("application", "octet-stream")
+    assert not cache._parts and not cache._index
@@ -0,0 +1,193 @@
+import asyncio
+from collections.abc import AsyncGenerator, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+
+from src.cmd.worker.email.email_action import EmailAction
+from src.cmd.worker.email.send_email import SendEmailHandler
+from src.core.di.container import Container
+from src.core.rabbit_mq.codec import CodecRegistry
+from src.core.rabbit_mq.config import ExchangeConfig, QueueConfig, RabbitMQConfig, RetryPolicy
+from src.core.rabbit_mq.consumer import AsyncRabbitMQConsumer
+from src.core.rabbit_mq.data import ATTEMPT_HEADER, MessageContext, ProcessingResult
+from src.core.rabbit_mq.memory import MemoryBroker
+from src.core.rabbit_mq.message_handler import MessageHandler
+from src.core.rabbit_mq.producer import AsyncRabbitMQProducer
+from src.core.service.email.email import EMessage
+from src.core.service.email.send_scheduler import SendThrottledError
+
+
+class ThrottledEmailService:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def send_email(self, message: EMessage) -> None:
+        self.calls += 1
+        raise SendThrottledError("domain:example.com", 0.001)
+
+
+class RecordingHandler(MessageHandler):
+    actions = ("work",)
+
+    def __init__(self, container: Container, results: list[ProcessingResult]) -> None:
+        super().__init__(container=container)
+        self.results = results
+        self.contexts: list[MessageContext] = []
+
+    async def handle(self, context: MessageContext) -> ProcessingResult:
+        self.contexts.append(context)
+        result = self.results[min(len(self.contexts), len(self.results)) - 1]
+        if result == ProcessingResult.RETRY and "items" in context.payload:
+            # retries only the items after the first, like a batch that partly succeeded
+            context.retry_payload = {**context.payload, "items": context.payload["items"][1:]}
+        return result
+
+
+class OutcomeHandler(MessageHandler):
+    actions = ("outcome",)
+
+    async def handle(self, context: MessageContext) -> ProcessingResult:
+        return ProcessingResult(context.payload["result"])
+
+
+async def _until(predicate: Callable[[], bool], timeout: float = 5.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+
+@asynccontextmanager
+async def _consuming(
+    url: str, queue: QueueConfig, exchange: ExchangeConfig, handlers: list[MessageHandler]
+) -> AsyncGenerator[tuple[AsyncRabbitMQConsumer, AsyncRabbitMQProducer]]:
+    log = Container().log()
+    config = RabbitMQConfig(url=url)
+    consumer = AsyncRabbitMQConsumer(config=config, codecs=CodecRegistry(), log=log)
+    producer = AsyncRabbitMQProducer(config=config, codecs=CodecRegistry(), log=log)
+    await consumer.initialize(loop=asyncio.get_running_loop())
+    await producer.initialize()
+    for handler in handlers:
+        consumer.register_handler(handler)
+    task = asyncio.create_task(consumer.consume(queue=queue, exchange=exchange))
+    # the retry and dead-letter queues are declared by consume()
+    await _until(lambda: consumer._running)
+    try:
+        yield consumer, producer
+    finally:
+        await producer.close()
+        await consumer.close()
+        await task
+
+
+async def test_repeated_throttling_never_reaches_the_dead_letter_queue() -> None:
+    url = "memory://consumer-throttled"
+    policy = RetryPolicy(max_attempts=2, initial_delay_ms=10)
+    queue = QueueConfig(name="throttled", retry=policy, dead_letter=True)
+    exchange = ExchangeConfig(name="throttled_exchange")
+    container = Container()
+    email_service = ThrottledEmailService()
+    container.email_service.override(email_service)
+
+    async with _consuming(url, queue, exchange, [SendEmailHandler(container=container)]) as (consumer, producer):
+        await producer.send_message(
+            queue,
+            {"to": "user@example.com", "subject": "Hello", "body": "Hi"},
+            exchange,
+            action=EmailAction.send_email.value,
+        )
+        # twice as many deliveries as the retry policy allows attempts
+        await _until(lambda: email_service.calls >= 2 * policy.max_attempts)
+        metrics = consumer.metrics()[EmailAction.send_email.value]
+
+    assert MemoryBroker.get(url).queues["throttled.dlq"].message_count == 0
+    assert metrics["deferred"] >= 2 * policy.max_attempts
+    assert metrics["retried"] == metrics["failed"] == 0
+
+
+def _dead_letter_queue(url: str, queue: QueueConfig) -> Any:
+    return MemoryBroker.get(url).queues[queue.dead_letter_queue().name]
+
+
+async def test_retry_delays_route_through_the_ttl_queues_until_the_dead_letter_queue() -> None:
+    url = "memory://consumer-retry"
+    queue = QueueConfig(
+        name="retry", retry=RetryPolicy(max_attempts=3, initial_delay_ms=10, multiplier=2.0), dead_letter=True
+    )
+    exchange = ExchangeConfig(name="retry_exchange")
+    handler = RecordingHandler(Container(), [ProcessingResult.RETRY])
+
+    async with _consuming(url, queue, exchange, [handler]) as (_, producer):
+        await producer.send_message(queue, {"id": 1}, exchange, action="work")
+        await _until(lambda: _dead_letter_queue(url, queue).message_count == 1)
+
+    assert [context.attempt for context in handler.contexts] == [0, 1, 2]
+    # every redelivery was dead-lettered back to the work exchange by the TTL queue of its attempt
+    assert [context.headers.get("x-death", [{}])[0].get("queue") for context in handler.contexts] == [
+        None,
+        "retry.retry.10",
+        "retry.retry.20",
+    ]
+    (dead,) = _dead_letter_queue(url, queue)._pending
+    assert dead.headers[ATTEMPT_HEADER] == 2
+    assert dead.headers["x-death"][0]["reason"] == "rejected"
+    assert MemoryBroker.get(url).queues["retry"].message_count == 0
+
+
+async def test_narrowed_retry_payload_is_acked_and_republished() -> None:
+    url = "memory://consumer-requeue"
+    # no retry policy, the retry goes straight back to the work queue
+    queue = QueueConfig(name="requeue")
+    exchange = ExchangeConfig(name="requeue_exchange")
+    handler = RecordingHandler(Container(), [ProcessingResult.RETRY, ProcessingResult.SUCCESS])
+
+    async with _consuming(url, queue, exchange, [handler]) as (consumer, producer):
+        await producer.send_message(queue, {"items": [1, 2, 3]}, exchange, action="work")
+        await _until(lambda: len(handler.contexts) == 2)
+        channel = consumer._channel["requeue"]
+        await _until(lambda: not channel._unacked)
+
+    first, second = handler.contexts
+    assert first.payload["items"] == [1, 2, 3]
+    assert second.payload["items"] == [2, 3]
+    assert second.attempt == 0
+    # a republished message is new, not a redelivery of the acked one
+    assert not second.redelivered
+    assert MemoryBroker.get(url).queues["requeue"].message_count == 0
+
+
+async def test_action_metrics_count_each_outcome() -> None:
+    url = "memory://consumer-metrics"
+    queue = QueueConfig(name="metrics", retry=RetryPolicy(max_attempts=2, initial_delay_ms=10), dead_letter=True)
+    exchange = ExchangeConfig(name="metrics_exchange")
+
+    async with _consuming(url, queue, exchange, [OutcomeHandler(Container())]) as (consumer, producer):
+        for result in (ProcessingResult.SUCCESS, ProcessingResult.REJECT, ProcessingResult.RETRY):
+            await producer.send_message(queue, {"result": result.value}, exchange, action="outcome")
+        # the rejected message and the retried one that ran out of attempts
+        await _until(lambda: _dead_letter_queue(url, queue).message_count == 2)
+        metrics = consumer.metrics()["outcome"]
+
+    assert metrics["processed"] == 1
+    assert metrics["failed"] == 1
+    assert metrics["retried"] == 1
+    assert metrics["dead_lettered"] == 1
+    assert metrics["deferred"] == 0
+    assert sum(metrics["latency_buckets"].values()) == 4
+
+
+def test_duplicate_action_is_rejected_at_registration() -> None:
+    container = Container()
+    consumer = AsyncRabbitMQConsumer(
+        config=RabbitMQConfig(url="memory://consumer-duplicate"), codecs=CodecRegistry(), log=container.log()
+    )
+    consumer.register_handler(RecordingHandler(container, [ProcessingResult.SUCCESS]))
+
+    class OtherHandler(RecordingHandler):
+        pass
+
+    with pytest.raises(ValueError, match="already handled by RecordingHandler"):
+        consumer.register_handler(OtherHandler(container, [ProcessingResult.SUCCESS]))
+    assert type(consumer.get_handler("work")) is RecordingHandler
+    assert list(consumer.metrics()) == ["work"]
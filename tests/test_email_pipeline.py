@@ -0,0 +1,152 @@
+import asyncio
+import base64
+import socket
+import threading
+from collections.abc import AsyncGenerator, Sequence
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any
+
+import pytest
+from aiosmtpd.controller import Controller
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from src.app.outbox.data.outbox_status import OutboxStatus
+from src.app.outbox.model.outbox import Outbox
+from src.app.user.model.user import User
+from src.cmd.worker.email.email_queue import EMAIL_EXCHANGE, EMAIL_QUEUE
+from src.cmd.worker.email.send_email import SendEmailHandler
+from src.core.di.container import Container
+from src.core.rabbit_mq.worker import RMWorker
+from src.core.settings.setting import Settings
+
+
+# MyDatabaseConfig is MySQL only, the database side is replaced by in-memory stand-ins
+class FakeDatabaseConfig:
+    @asynccontextmanager
+    async def transaction(self) -> AsyncGenerator[None]:
+        yield None
+
+
+class FakeUserService:
+    def __init__(self) -> None:
+        self.users: list[User] = []
+
+    async def one(self, filters: list[Any]) -> User | None:
+        return None
+
+    async def create(self, data: User) -> User:
+        data.id = len(self.users) + 1
+        self.users.append(data)
+        return data
+
+
+class FakeOutboxRepository:
+    def __init__(self) -> None:
+        self.rows: list[Outbox] = []
+
+    async def create(self, data: Outbox) -> Outbox:
+        data.id = len(self.rows) + 1
+        self.rows.append(data)
+        return data
+
+    async def claim_pending(self, limit: int) -> Sequence[Outbox]:
+        return [row for row in self.rows if row.status == OutboxStatus.NEW][:limit]
+
+    async def mark_published(self, ids: list[int], published_at: datetime) -> int:
+        for row in self.rows:
+            if row.id in ids:
+                row.status = OutboxStatus.PUBLISHED
+                row.published_at = published_at
+        return len(ids)
+
+    async def mark_failed(self, ids: list[int], max_attempts: int) -> int:
+        return 0
+
+
+# aiosmtpd serves from its own thread and loop, so the test waits on a thread-safe event
+class CollectingHandler:
+    def __init__(self) -> None:
+        self.envelopes: list[Any] = []
+        self.received = threading.Event()
+
+    async def handle_DATA(self, server: Any, session: Any, envelope: Any) -> str:
+        self.envelopes.append(envelope)
+        self.received.set()
+        return "250 Message accepted for delivery"
+
+
+def _jwt_keys() -> tuple[str, str]:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public = key.public_key().public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+    return base64.b64encode(private).decode(), base64.b64encode(public).decode()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp() -> Any:
+    handler = CollectingHandler()
+    port = _free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield handler, port
+    controller.stop()
+
+
+async def test_signup_confirm_email_reaches_smtp_over_memory_broker(smtp: Any) -> None:
+    handler, smtp_port = smtp
+    private_key, public_key = _jwt_keys()
+    settings = Settings().model_copy(
+        update={
+            "rabbitmq_url": "memory://signup-pipeline",
+            "smtp_server": "127.0.0.1",
+            "smtp_port": smtp_port,
+            "from_email": "noreply@example.com",
+            "app_password": "",
+            "app_url": "https://app.example.com",
+            "jwt_private_key": private_key,
+            "jwt_public_key": public_key,
+        }
+    )
+    container = Container()
+    container.app_config.override(settings)
+    container.db_config.override(FakeDatabaseConfig())
+    container.user_service.override(FakeUserService())
+    container.outbox_repository.override(FakeOutboxRepository())
+
+    user = await container.auth_service().signup(
+        first_name="Ada", second_name="Lovelace", email="ada@example.com", password="secret"
+    )
+
+    relay = container.outbox_relay()
+    await relay.initialize()
+    assert await relay.relay_batch() == 1
+
+    worker = RMWorker(
+        consumer=container.rmq_consumer(), queue=EMAIL_QUEUE, exchange=EMAIL_EXCHANGE, log=container.log()
+    )
+    await worker.initialize(loop=asyncio.get_running_loop(), handlers=[SendEmailHandler(container=container)])
+    task = asyncio.create_task(worker.start())
+    try:
+        assert await asyncio.to_thread(handler.received.wait, 10)
+    finally:
+        await worker.stop()
+        await task
+        await container.email_service().close()
+        await container.rmq_producer().close()
+
+    envelope = handler.envelopes[0]
+    assert envelope.mail_from == "noreply@example.com"
+    assert envelope.rcpt_tos == [user.email]
+    content = envelope.content.decode()
+    assert "Welcome to the platform" in content
+    assert "Ada" in content
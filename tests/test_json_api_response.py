@@ -0,0 +1,99 @@
+import json
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from src.app.user.data.role import Role
+from src.app.user.data.user_status import UserStatus
+from src.app.user.model.user import User
+from src.app.user_notification.data.user_notification_status import UserNotificationStatus
+from src.app.user_notification.model.user_notification import UserNotification
+from src.core.db.repository import Paginator
+from src.core.di.container import Container
+from src.core.http.response.api_response_service import ApiResponseService
+from src.core.http.response.response import JsonApiResponse, ResponseBaseModel
+
+USERS = [
+    User(
+        id=index,
+        first_name=f"First {index}",
+        second_name="Second",
+        email=f"user{index}@example.com",
+        status=UserStatus.ACTIVE,
+        roles=[Role.USER],
+        created_at=datetime(2025, 1, 2, 3, 4, 5, 123456),
+        updated_at=datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC),
+    )
+    for index in range(1, 6)
+]
+NOTIFICATIONS = [
+    UserNotification(
+        id=100 + index,
+        user_id=1 + index % 4,
+        data={"message": f"Message {index}", "nested": {"count": index}},
+        status=UserNotificationStatus.NEW,
+        created_at=datetime(2025, 3, 1, tzinfo=UTC),
+        updated_at=datetime(2025, 3, 1, tzinfo=UTC),
+    )
+    for index in range(10)
+]
+
+
+class FakeUserNotificationService:
+    async def new_by_user_id(self, uid: int | list[int]) -> Sequence[UserNotification]:
+        ids = uid if isinstance(uid, list) else [uid]
+        return [notification for notification in NOTIFICATIONS if notification.user_id in ids]
+
+
+@pytest.fixture
+def service() -> ApiResponseService:
+    container = Container()
+    container.user_notification_service.override(FakeUserNotificationService())
+    return ApiResponseService(container)
+
+
+DOCUMENTS: dict[str, dict[str, Any]] = {
+    "page": {"data": Paginator(items=USERS, total=25, page=1, per_page=5), "include": "UserNotification"},
+    "list": {"data": USERS},
+    "list_with_include": {"data": USERS, "include": "UserNotification"},
+    "item": {"data": USERS[0], "include": "UserNotification"},
+    "meta": {"meta": {"message": "ok"}},
+    "errors": {"errors": [{"status": 400, "title": "Bad Request", "detail": ["email: is required"]}]},
+    "without_model_handler": {
+        "data": SimpleNamespace(id=7, model_dump=lambda by_alias: {"accessToken": "token", "expiresIn": 3600}),
+        "resource_type": "Bearer",
+    },
+}
+
+
+@pytest.mark.parametrize("name", list(DOCUMENTS))
+async def test_bytes_response_matches_json_api_response_model(service: ApiResponseService, name: str) -> None:
+    # the document served as bytes must equal what response_model=JsonApiResponse used to serialise
+    response = await service.response(**DOCUMENTS[name])
+    document = await service.document(**DOCUMENTS[name])
+
+    expected = JsonApiResponse.model_validate(document).model_dump(mode="json", by_alias=True)
+    assert json.loads(response.body) == expected
+    assert response.media_type == "application/json"
+
+
+async def test_resources_match_data_to_resource(service: ApiResponseService) -> None:
+    response = await service.response(data=USERS)
+
+    expected = [ResponseBaseModel.data_to_resource(user).model_dump(mode="json") for user in USERS]
+    assert json.loads(response.body)["data"] == expected
+
+
+async def test_relationships_link_included_resources(service: ApiResponseService) -> None:
+    document = json.loads((await service.response(data=USERS, include="UserNotification")).body)
+
+    for resource in document["data"]:
+        user_id = int(resource["id"])
+        expected = [str(n.id) for n in NOTIFICATIONS if n.user_id == user_id]
+        linked = resource["relationships"]["UserNotification"]["data"]
+        assert [link["id"] for link in linked] == expected
+        assert all(link["type"] == "UserNotification" for link in linked)
+    assert [resource["id"] for resource in document["included"]] == [str(n.id) for n in NOTIFICATIONS]
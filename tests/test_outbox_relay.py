@@ -0,0 +1,67 @@
+from collections.abc import AsyncGenerator, Sequence
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from src.app.outbox.data.outbox_status import OutboxStatus
+from src.app.outbox.model.outbox import Outbox
+from src.cmd.worker.email.email_queue import EMAIL_EXCHANGE, EMAIL_QUEUE
+from src.core.di.container import Container
+from src.core.settings.setting import Settings
+
+
+class FakeDatabaseConfig:
+    @asynccontextmanager
+    async def transaction(self) -> AsyncGenerator[None]:
+        yield None
+
+
+class FakeOutboxRepository:
+    def __init__(self, rows: list[Outbox]) -> None:
+        self.rows = rows
+
+    async def claim_pending(self, limit: int) -> Sequence[Outbox]:
+        return [row for row in self.rows if row.status == OutboxStatus.NEW][:limit]
+
+    async def mark_published(self, ids: list[int], published_at: datetime) -> int:
+        for row in self.rows:
+            if row.id in ids:
+                row.status = OutboxStatus.PUBLISHED
+        return len(ids)
+
+    async def mark_failed(self, ids: list[int], max_attempts: int) -> int:
+        for row in self.rows:
+            if row.id in ids:
+                row.attempts += 1
+        return 0
+
+
+def _row(id: int, routing_key: str) -> Outbox:
+    return Outbox(
+        id=id,
+        exchange=EMAIL_EXCHANGE.name,
+        routing_key=routing_key,
+        payload={"action": "send"},
+        headers=None,
+        status=OutboxStatus.NEW,
+        attempts=0,
+    )
+
+
+async def test_unroutable_message_stays_pending() -> None:
+    rows = [_row(1, EMAIL_QUEUE.binding_key), _row(2, "nowhere")]
+    container = Container()
+    container.app_config.override(Settings().model_copy(update={"rabbitmq_url": "memory://outbox-relay"}))
+    container.db_config.override(FakeDatabaseConfig())
+    container.outbox_repository.override(FakeOutboxRepository(rows))
+
+    relay = container.outbox_relay()
+    await relay.initialize()
+    try:
+        assert await relay.relay_batch() == 1
+    finally:
+        await container.rmq_producer().close()
+
+    routed, unroutable = rows
+    assert routed.status == OutboxStatus.PUBLISHED
+    assert unroutable.status == OutboxStatus.NEW
+    assert unroutable.attempts == 1
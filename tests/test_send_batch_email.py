@@ -0,0 +1,125 @@
+from types import SimpleNamespace
+from typing import Any
+
+import aiosmtplib
+
+from src.cmd.worker.email.email_action import EmailAction
+from src.cmd.worker.email.email_queue import EMAIL_QUEUE
+from src.cmd.worker.email.send_batch_email import SendBatchEmailHandler
+from src.core.di.container import Container
+from src.core.exception.error_no import ErrorNo
+from src.core.exception.exceptions import NotFoundException
+from src.core.rabbit_mq.data import MessageContext, ProcessingResult
+from src.core.service.email.email import EMessage
+from src.core.service.email.send_scheduler import SendScheduler, SendThrottledError
+from src.core.service.rate_limit import RateLimit
+
+
+class FakeEmailService:
+    def __init__(
+        self, missing: set[str] | None = None, throttled: set[str] | None = None, disconnected: set[str] | None = None
+    ) -> None:
+        self.missing = missing or set()
+        self.throttled = throttled or set()
+        self.disconnected = disconnected or set()
+        self.sent: list[EMessage] = []
+        self.pool = SimpleNamespace(config=SimpleNamespace(pool_size=2))
+
+    async def send_email(self, message: EMessage) -> None:
+        if message.to in self.missing:
+            raise NotFoundException(error_no=ErrorNo.EMAIL_ATTACHMENT_NOT_FOUND, message="File not found")
+        if message.to in self.throttled:
+            raise SendThrottledError(f"domain:{message.to}", 60.0)
+        if message.to in self.disconnected:
+            raise aiosmtplib.SMTPServerDisconnected("Connection lost")
+        self.sent.append(message)
+
+
+def _recipients(*names: str) -> list[dict[str, Any]]:
+    return [{"to": f"{name}@example.com", "context": {"user": {"first_name": name}}} for name in names]
+
+
+def _context(payload: dict[str, Any], attempt: int = 0) -> MessageContext:
+    return MessageContext(
+        action=EmailAction.send_batch.value,
+        payload={"action": EmailAction.send_batch.value, **payload},
+        headers={},
+        routing_key="email",
+        queue_name="email",
+        delivery_tag=1,
+        redelivered=False,
+        attempt=attempt,
+    )
+
+
+async def test_batch_failure_of_one_recipient_does_not_reject_the_batch() -> None:
+    container = Container()
+    email_service = FakeEmailService(missing={"b@example.com"})
+    container.email_service.override(email_service)
+
+    result = await SendBatchEmailHandler(container=container).handle(
+        _context(
+            {
+                "template": "email/confirm_email.html",
+                "subject": "Hello",
+                "recipients": _recipients("a", "b", "c"),
+                "context": {"token": "t"},
+            }
+        )
+    )
+
+    assert result == ProcessingResult.SUCCESS
+    assert sorted(message.to for message in email_service.sent) == ["a@example.com", "c@example.com"]
+
+
+async def test_batch_retries_only_throttled_recipients() -> None:
+    container = Container()
+    email_service = FakeEmailService(throttled={"b@example.com"})
+    container.email_service.override(email_service)
+    payload = {"template": "email/confirm_email.html", "subject": "Hello", "recipients": _recipients("a", "b", "c")}
+
+    context = _context(payload)
+    result = await SendBatchEmailHandler(container=container).handle(context)
+
+    assert result == ProcessingResult.DEFER
+    assert context.retry_payload is not None
+    assert [recipient["to"] for recipient in context.retry_payload["recipients"]] == ["b@example.com"]
+    assert context.retry_delay_ms == 60_000
+    assert sorted(message.to for message in email_service.sent) == ["a@example.com", "c@example.com"]
+
+    # throttling spends no attempt, so even the last attempt defers the throttled recipient
+    last = _context(payload, attempt=EMAIL_QUEUE.retry.max_attempts - 1)
+    assert await SendBatchEmailHandler(container=container).handle(last) == ProcessingResult.DEFER
+    assert last.retry_payload is not None
+
+
+async def test_batch_failed_recipients_spend_an_attempt() -> None:
+    container = Container()
+    email_service = FakeEmailService(disconnected={"b@example.com"}, throttled={"c@example.com"})
+    container.email_service.override(email_service)
+    payload = {"template": "email/confirm_email.html", "subject": "Hello", "recipients": _recipients("a", "b", "c")}
+
+    context = _context(payload)
+    assert await SendBatchEmailHandler(container=container).handle(context) == ProcessingResult.RETRY
+    assert context.retry_payload is not None
+    assert [recipient["to"] for recipient in context.retry_payload["recipients"]] == ["b@example.com", "c@example.com"]
+
+    # on the last attempt the failed recipient is reported, the throttled one is still deferred
+    last = _context(payload, attempt=EMAIL_QUEUE.retry.max_attempts - 1)
+    assert await SendBatchEmailHandler(container=container).handle(last) == ProcessingResult.DEFER
+    assert last.retry_payload is not None
+    assert [recipient["to"] for recipient in last.retry_payload["recipients"]] == ["c@example.com"]
+
+
+async def test_scheduler_metrics_keep_unconfigured_domains_together() -> None:
+    scheduler = SendScheduler(
+        account_limit=RateLimit(rate=1000, burst=1000),
+        domain_limit=RateLimit(rate=1000, burst=1000),
+        domain_limits={"gmail.com": RateLimit(rate=1000, burst=1000)},
+    )
+    for index in range(100):
+        await scheduler.acquire("noreply@example.com", [f"user@domain{index}.com", "user@gmail.com"])
+
+    metrics = scheduler.metrics()
+    assert set(metrics) == {"account:noreply@example.com", "domain:gmail.com", "domain:*"}
+    assert metrics["domain:*"]["sends"] == 100
@@ -0,0 +1,61 @@
+import re
+from typing import Any
+
+from sqlalchemy.dialects import mysql
+from starlette.requests import Request
+
+from src.app.user.repository.user_repository import UserRepository
+from src.core.db.repository import BaseRepository
+from src.core.di.container import Container
+from src.core.dto.dto import get_sparse_fields
+from src.core.http.controller import BaseController
+from src.core.http.response.api_response_service import ApiResponseService
+from tests.test_json_api_response import NOTIFICATIONS, USERS, FakeUserNotificationService
+
+
+def _request(query_string: bytes) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": query_string})
+
+
+def _selected_columns(repository: BaseRepository[Any], fields: set[str] | None) -> set[str]:
+    sql = str(repository._select(fields).compile(dialect=mysql.dialect()))
+    columns = re.split(r"\s+FROM\s+", sql)[0].removeprefix("SELECT ")
+    return {re.sub(r"^\w+\.", "", column.strip()) for column in columns.split(",")}
+
+
+def test_fieldsets_are_parsed_from_the_bracketed_query_keys() -> None:
+    request = _request(b"fields[User]=email,firstName&fields[UserNotification]=data,&include=UserNotification")
+
+    assert get_sparse_fields(request) == {"User": {"email", "firstName"}, "UserNotification": {"data"}}
+    assert get_sparse_fields(_request(b"include=UserNotification")) is None
+
+
+def test_select_loads_the_fieldset_with_the_primary_and_relationship_keys() -> None:
+    container = Container()
+    controller = BaseController(container=container)
+    fields = {"User": {"email", "firstName"}}
+    # the repository only builds the query here, the database is never reached
+    users = UserRepository(container.db_config())
+
+    # id is both the primary key and the local key the UserNotification relationship is linked by
+    assert controller.select_fields("User", fields) == {"email", "firstName", "id"}
+    assert _selected_columns(users, controller.select_fields("User", fields)) == {"id", "email", "first_name"}
+    assert _selected_columns(users, {"email"}) == {"id", "email"}
+    assert "second_name" in _selected_columns(users, controller.select_fields("User", None))
+
+
+async def test_included_resources_are_trimmed_after_linking() -> None:
+    container = Container()
+    container.user_notification_service.override(FakeUserNotificationService())
+    service = ApiResponseService(container)
+    fields = {"User": {"email"}, "UserNotification": {"data"}}
+
+    document = await service.document(data=USERS, include="UserNotification", fields=fields)
+
+    for resource, user in zip(document["data"], USERS, strict=True):
+        assert set(resource["attributes"]) == {"email"}
+        # linked by user_id although it is not in the UserNotification fieldset
+        linked = {item["id"] for item in resource["relationships"]["UserNotification"]["data"]}
+        assert linked == {str(item.id) for item in NOTIFICATIONS if item.user_id == user.id}
+    assert document["included"]
+    assert all(set(resource["attributes"]) == {"data"} for resource in document["included"])
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from jinja2 import ChoiceLoader
+
+from src.core.service.email.view_service import ViewService
+
+TEMPLATE_DIR = "src/core/service/email/templates"
+
+
+async def test_compile_swaps_the_directory_and_workers_only_load(tmp_path: Path) -> None:
+    compiled_dir = tmp_path / "compiled"
+    first = ViewService(TEMPLATE_DIR, app_url="https://app.example.com", compiled_dir=str(compiled_dir)).compile()
+    second = ViewService(TEMPLATE_DIR, app_url="https://app.example.com", compiled_dir=str(compiled_dir)).compile()
+
+    assert compiled_dir.is_symlink()
+    assert compiled_dir.resolve() == Path(second)
+    assert not Path(first).exists()
+    modules = sorted(path.name for path in compiled_dir.iterdir())
+
+    worker = ViewService(TEMPLATE_DIR, app_url="https://app.example.com", compiled_dir=str(compiled_dir))
+    worker.precompile()
+
+    assert isinstance(worker.env.loader, ChoiceLoader)
+    assert sorted(path.name for path in compiled_dir.iterdir()) == modules
+    body = await worker.render_template("email/confirm_email.html", {"user": {"first_name": "Ada"}, "token": "t"})
+    assert "Ada" in body
+
+
+def test_precompile_without_a_build_stays_in_memory(tmp_path: Path) -> None:
+    compiled_dir = tmp_path / "compiled"
+    worker = ViewService(TEMPLATE_DIR, app_url="https://app.example.com", compiled_dir=str(compiled_dir))
+    worker.precompile()
+
+    assert not compiled_dir.exists()
+    assert not isinstance(worker.env.loader, ChoiceLoader)
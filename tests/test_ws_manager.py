@@ -0,0 +1,149 @@
+import asyncio
+import json
+from typing import Any
+
+from src.core.di.container import Container
+from src.core.rabbit_mq.config import RabbitMQConfig
+from src.core.web_socket.ws_backplane import WSBackplane
+from src.core.web_socket.ws_manager import WSManager
+
+
+class FakeWebSocket:
+    def __init__(self, blocked: bool = False) -> None:
+        self.frames: list[str | bytes] = []
+        self.accepted = False
+        self.closed = False
+        self.close_code: int | None = None
+        # a blocked socket holds its writer in the first send, like a client that stopped reading
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def accept(self) -> None:
+        self.accepted = True
+
+    async def send_text(self, data: str) -> None:
+        await self.unblocked.wait()
+        self.frames.append(data)
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self.unblocked.wait()
+        self.frames.append(data)
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        self.closed = True
+        self.close_code = code
+
+    def messages(self) -> list[dict[str, Any]]:
+        return [json.loads(frame) for frame in self.frames]
+
+
+async def _settle(manager: WSManager) -> None:
+    # lets the writer tasks and the spawned drops run
+    for _ in range(5):
+        await asyncio.sleep(0)
+    if manager._tasks:
+        await asyncio.gather(*manager._tasks)
+
+
+async def test_connection_that_never_answers_is_reaped() -> None:
+    manager = WSManager(log=Container().log(), heartbeat_interval=2.0, heartbeat_timeout=5.0)
+    quiet, answering = FakeWebSocket(), FakeWebSocket()
+    await manager.connect("1", quiet)
+    await manager.connect("2", answering)
+    start = manager._registry.get("1")[quiet].last_seen
+
+    for second in range(1, 7):
+        # the answering client sends a frame after every ping, the quiet one never does
+        manager._registry.get("2")[answering].last_seen = start + second
+        manager.heartbeat.advance(start + second)
+        await _settle(manager)
+
+    assert {"type": "ping"} in quiet.messages()
+    assert quiet.closed
+    assert manager.user_ids() == ["2"]
+    assert not answering.closed
+    assert manager.metrics()["heartbeat_reaped"] == 1
+    await manager.close_all()
+
+
+def test_heartbeat_is_on_by_default() -> None:
+    assert Container().ws_manager().heartbeat.interval > 0
+
+
+async def test_full_queue_drops_the_oldest_frames() -> None:
+    manager = WSManager(log=Container().log(), max_queue=2, heartbeat_interval=0)
+    websocket = FakeWebSocket(blocked=True)
+    await manager.connect("1", websocket)
+
+    for index in range(5):
+        await manager.send_to_user("1", {"n": index})
+        await _settle(manager)
+    assert manager.metrics()["dropped"] == 2
+
+    # the writer was holding the first frame, the two newest were kept behind it
+    websocket.unblocked.set()
+    await _settle(manager)
+    assert [message["n"] for message in websocket.messages()] == [0, 3, 4]
+    await manager.close_all()
+
+
+async def test_full_queue_disconnects_a_slow_consumer() -> None:
+    manager = WSManager(log=Container().log(), max_queue=2, overflow_policy="disconnect", heartbeat_interval=0)
+    slow, other = FakeWebSocket(blocked=True), FakeWebSocket()
+    await manager.connect("1", slow)
+    await manager.connect("2", other)
+
+    for index in range(4):
+        await manager.broadcast({"n": index})
+        await _settle(manager)
+
+    assert slow.closed
+    assert manager.user_ids() == ["2"]
+    assert manager.metrics()["slow_disconnects"] == 1
+    assert [message["n"] for message in other.messages()] == [0, 1, 2, 3]
+    await manager.close_all()
+
+
+async def test_topic_reaches_only_its_subscribers() -> None:
+    manager = WSManager(log=Container().log(), heartbeat_interval=0)
+    first, second, other = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    await manager.connect("1", first)
+    await manager.connect("2", second)
+    await manager.connect("3", other)
+    assert await manager.subscribe("1", first, "news")
+    assert await manager.subscribe("2", second, "news")
+    assert await manager.subscribe("3", other, "sport")
+    assert not await manager.subscribe("3", other, "news.#")
+
+    assert await manager.publish("news", {"title": "a"}) == 2
+    assert await manager.unsubscribe("2", second, "news")
+    assert await manager.publish("news", {"title": "b"}) == 1
+    await _settle(manager)
+
+    assert [message["title"] for message in first.messages()] == ["a", "b"]
+    assert [message["title"] for message in second.messages()] == ["a"]
+    assert other.messages() == []
+    assert manager.topics() == ["news", "sport"]
+    await manager.close_all()
+
+
+async def test_backplane_does_not_echo_to_the_publishing_worker() -> None:
+    config = RabbitMQConfig(url="memory://ws-backplane")
+    log = Container().log()
+    workers = [WSManager(log=log, heartbeat_interval=0) for _ in range(2)]
+    backplanes = [WSBackplane(config=config, ws_manager=manager, log=log) for manager in workers]
+    sockets = [FakeWebSocket() for _ in workers]
+    for manager, backplane, websocket in zip(workers, backplanes, sockets, strict=True):
+        await backplane.start()
+        await manager.connect("1", websocket)
+
+    # queued for the local socket and relayed to the other worker, which is the only one delivering it
+    assert await workers[0].send_to_user("1", {"type": "hello"}) == 1
+    for manager in workers:
+        await _settle(manager)
+
+    assert [websocket.messages() for websocket in sockets] == [[{"type": "hello"}], [{"type": "hello"}]]
+    for manager, backplane in zip(workers, backplanes, strict=True):
+        await backplane.stop()
+        await manager.close_all()